@@ -0,0 +1,204 @@
+"""
+Batch Date and Time Processor - Thread-safe bulk variants of the processor functions
+
+The batch functions mirror convert_string_to_datetime, calculate_date_difference
+and convert_timezone from skeleton.py but operate on whole sequences at once.
+Intermediate values are kept as epoch seconds in preallocated array('q')
+buffers, and no module-level state is mutated, so every function here can be
+called concurrently from a ThreadPoolExecutor (or a free-threaded CPython build).
+"""
+
+import datetime
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from calendar_arithmetic import calendar_breakdown
+from datetime_kernels import (
+    SECONDS_PER_HOUR,
+    difference_from_seconds,
+    epoch_to_datetime,
+    parse_to_epoch,
+    to_epoch,
+    validate_offset,
+)
+from timestamps import TimestampArray
+
+
+def parse_epochs_into(date_strings, out):
+    """
+    Parse date strings into a preallocated epoch-seconds buffer.
+
+    Parameters:
+    date_strings (sequence of str): Strings in 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS' format
+    out (array): Preallocated array('q') with at least len(date_strings) slots
+
+    Returns:
+    array: The out buffer, for chaining
+
+    Raises:
+    ValueError: If out is too small or a string is malformed
+    TypeError: If an element is not a string
+    """
+    if len(out) < len(date_strings):
+        raise ValueError("Output buffer is smaller than the input")
+    for index, value in enumerate(date_strings):
+        out[index] = parse_to_epoch(value)
+    return out
+
+
+def parse_epochs(date_strings):
+    """
+    Parse date strings to an array of epoch seconds.
+
+    Example:
+    >>> list(parse_epochs(["1970-01-02", "1970-01-01 00:01:00"]))
+    [86400, 60]
+    """
+    return parse_epochs_into(date_strings, array("q", bytes(8 * len(date_strings))))
+
+
+def to_epochs(values):
+    """Convert a sequence of datetimes and/or date strings to an array of the epoch seconds they fall in."""
+    if isinstance(values, TimestampArray):
+        return array("q", values.epochs)
+    out = array("q", bytes(8 * len(values)))
+    for index, value in enumerate(values):
+        out[index] = to_epoch(value)
+    return out
+
+
+def _microseconds(values):
+    """Return the microseconds of each value, or None when every value is a whole second."""
+    if isinstance(values, TimestampArray):
+        return None
+    micros = [value.microsecond if isinstance(value, datetime.datetime) else 0 for value in values]
+    return micros if any(micros) else None
+
+
+def convert_strings_to_datetimes(date_strings):
+    """
+    Convert a sequence of date strings to datetime objects.
+
+    Parameters:
+    date_strings (sequence of str): Strings in 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS' format
+
+    Returns:
+    list: Datetime objects in input order
+
+    Example:
+    >>> convert_strings_to_datetimes(["2025-03-19", "2025-03-19 14:30:00"])
+    [datetime.datetime(2025, 3, 19, 0, 0), datetime.datetime(2025, 3, 19, 14, 30)]
+    """
+    return [epoch_to_datetime(seconds) for seconds in parse_epochs(date_strings)]
+
+
+def calculate_date_differences(start_dates, end_dates, calendar=False):
+    """
+    Calculate pairwise differences between two equally long sequences of dates.
+
+    Parameters:
+    start_dates (sequence of datetime or str): Start dates
+    end_dates (sequence of datetime or str): End dates
+    calendar (bool): Also include whole calendar years and months
+
+    Returns:
+    list: One dict per pair with days, hours, minutes and total_seconds,
+    plus years and months when calendar is True
+
+    Raises:
+    ValueError: If the sequences differ in length
+    """
+    if len(start_dates) != len(end_dates):
+        raise ValueError("start_dates and end_dates must have the same length")
+    starts = to_epochs(start_dates)
+    ends = to_epochs(end_dates)
+    start_micros = _microseconds(start_dates)
+    end_micros = _microseconds(end_dates)
+    if start_micros is None and end_micros is None:
+        results = [difference_from_seconds(end - start) for start, end in zip(starts, ends)]
+        if calendar:
+            for result, start, end in zip(results, starts, ends):
+                result.update(calendar_breakdown(start, end))
+        return results
+    start_micros = start_micros or [0] * len(starts)
+    end_micros = end_micros or [0] * len(ends)
+    results = [difference_from_seconds(end - start, end_micro - start_micro)
+               for start, end, start_micro, end_micro in zip(starts, ends, start_micros, end_micros)]
+    if calendar:
+        for result, *row in zip(results, starts, ends, start_micros, end_micros):
+            result.update(calendar_breakdown(*row))
+    return results
+
+
+def shift_epochs_into(epochs, source_offset, target_offset, out):
+    """
+    Shift epoch seconds from one timezone offset to another into a preallocated buffer.
+
+    Parameters:
+    epochs (array): Epoch seconds to shift
+    source_offset (int): Source timezone offset in hours (-12 to +14)
+    target_offset (int): Target timezone offset in hours (-12 to +14)
+    out (array): Preallocated array('q'), may be the same object as epochs
+
+    Returns:
+    array: The out buffer
+    """
+    validate_offset(source_offset, "source_offset")
+    validate_offset(target_offset, "target_offset")
+    if len(out) < len(epochs):
+        raise ValueError("Output buffer is smaller than the input")
+    shift = (target_offset - source_offset) * SECONDS_PER_HOUR
+    for index, seconds in enumerate(epochs):
+        out[index] = seconds + shift
+    return out
+
+
+def convert_timezones(values, source_offset, target_offset):
+    """
+    Convert a sequence of datetimes from one timezone offset to another.
+
+    Parameters:
+    values (sequence of datetime or str): Datetimes to convert
+    source_offset (int): Source timezone offset in hours (-12 to +14)
+    target_offset (int): Target timezone offset in hours (-12 to +14)
+
+    Returns:
+    list: Datetimes adjusted to the target timezone
+
+    Example:
+    >>> convert_timezones(["2025-03-19 14:30:00"], -5, -8)
+    [datetime.datetime(2025, 3, 19, 11, 30)]
+    """
+    # Offsets first, so a bad offset wins over a bad row as it does in convert_timezone
+    validate_offset(source_offset, "source_offset")
+    validate_offset(target_offset, "target_offset")
+    epochs = to_epochs(values)
+    shift_epochs_into(epochs, source_offset, target_offset, epochs)
+    micros = _microseconds(values)
+    if micros is None:
+        return [epoch_to_datetime(seconds) for seconds in epochs]
+    return [epoch_to_datetime(seconds, micro) for seconds, micro in zip(epochs, micros)]
+
+
+def run_chunked(func, items, workers=4, chunk_size=10000):
+    """
+    Apply a batch function to items in chunks spread over a thread pool.
+
+    Parameters:
+    func (callable): Batch function taking a sequence and returning a list
+    items (sequence): Input values
+    workers (int): Number of threads
+    chunk_size (int): Number of items per task
+
+    Returns:
+    list: Concatenated results in input order
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for part in executor.map(func, chunks):
+            results.extend(part)
+    return results
+
@@ -0,0 +1,444 @@
+"""
+Benchmarks - Timing suites for the Date and Time Processor fast paths
+
+Run a single suite with `python benchmarks.py <suite>` or all of them with
+`python benchmarks.py all`. Sizes are kept small enough to finish in seconds
+on a laptop; pass --scale to multiply them.
+"""
+
+import argparse
+import datetime
+import random
+import sys
+import time
+
+from datetime_kernels import SECONDS_PER_DAY, civil_from_days, epoch_to_datetime
+
+_BASE_DAY = 20000  # 2024-10-04
+
+
+def timed(func, *args, **kwargs):
+    """Run func once and return (elapsed_seconds, result)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def sample_date_strings(count, seed=0):
+    """Generate count reproducible 'YYYY-MM-DD HH:MM:SS' strings around 2025."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(count):
+        year, month, day = civil_from_days(_BASE_DAY + rng.randrange(730))
+        seconds = rng.randrange(SECONDS_PER_DAY)
+        out.append(f"{year:04d}-{month:02d}-{day:02d} "
+                   f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}")
+    return out
+
+
+def bench_threads(scale=1):
+    """Thread scaling of the batch kernels from 1 to 16 threads."""
+    from batch_processor import (
+        calculate_date_differences,
+        convert_strings_to_datetimes,
+        convert_timezones,
+        run_chunked,
+    )
+
+    count = 100000 * scale
+    strings = sample_date_strings(count)
+    gil_check = getattr(sys, "_is_gil_enabled", None)
+    gil = "enabled" if gil_check is None or gil_check() else "disabled"
+    print(f"threads: {count} rows, GIL {gil}")
+    kernels = {
+        "parse": convert_strings_to_datetimes,
+        "difference": lambda chunk: calculate_date_differences(chunk, chunk[::-1]),
+        "timezone": lambda chunk: convert_timezones(chunk, -5, 3),
+    }
+    for name, kernel in kernels.items():
+        baseline = None
+        for workers in (1, 2, 4, 8, 16):
+            elapsed, _ = timed(run_chunked, kernel, strings, workers=workers, chunk_size=count // 64)
+            baseline = baseline or elapsed
+            print(f"  {name:<10} {workers:>2} threads {elapsed:8.3f}s "
+                  f"{count / elapsed:12,.0f} rows/s  x{baseline / elapsed:.2f}")
+
+
+def bench_roster(scale=1):
+    """Scaling of the single-sweep roster checker over a year of shifts."""
+    from roster import find_violations, generate_roster
+
+    print("roster: one year of shifts per worker")
+    for workers in (500 * scale, 2000 * scale, 8000 * scale):
+        shifts = generate_roster(workers, days=365)
+        elapsed, violations = timed(find_violations, shifts)
+        print(f"  {workers:>7} workers {len(shifts):>10,} shifts {elapsed:8.3f}s "
+              f"{len(shifts) / elapsed:12,.0f} shifts/s {len(violations):>9,} violations")
+
+
+def bench_parse_cache(scale=1):
+    """Cold versus warm runs of the persistent parse cache against plain parsing."""
+    import os
+    import tempfile
+
+    from batch_processor import parse_epochs
+    from parse_cache import PersistentParseCache
+
+    count = 100000 * scale
+    strings = sample_date_strings(count)
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "parse_cache.sqlite")
+    print(f"parse_cache: {count} rows")
+    elapsed, _ = timed(lambda: [datetime.datetime.strptime(value, "%Y-%m-%d %H:%M:%S") for value in strings])
+    print(f"  {'strptime':<10} {elapsed:8.3f}s {count / elapsed:12,.0f} rows/s")
+    elapsed, _ = timed(parse_epochs, strings)
+    print(f"  {'kernel':<10} {elapsed:8.3f}s {count / elapsed:12,.0f} rows/s")
+    for run in ("cold", "warm"):
+        with PersistentParseCache(path) as cache:
+            elapsed, _ = timed(cache.lookup_many, strings)
+        print(f"  {run:<10} {elapsed:8.3f}s {count / elapsed:12,.0f} rows/s")
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+
+def bench_slots(scale=1):
+    """Query latency of the slot engine over many clinicians with busy calendars."""
+    from slot_engine import SlotEngine
+
+    rng = random.Random(0)
+    clinicians = 10000 * scale
+    first = _BASE_DAY * SECONDS_PER_DAY
+    engine = SlotEngine()
+    for clinician in range(clinicians):
+        engine.add_clinician(clinician, offset=rng.randrange(-8, 3))
+        for _ in range(60):
+            start = first + rng.randrange(30 * 96) * 900
+            engine.add_busy(clinician, epoch_to_datetime(start),
+                            epoch_to_datetime(start + 900 * rng.randrange(1, 9)))
+    queries = [(rng.randrange(clinicians), epoch_to_datetime(first + rng.randrange(20 * SECONDS_PER_DAY)))
+               for _ in range(20000)]
+    print(f"slots: {clinicians} clinicians, 60 bookings each, {len(queries)} queries")
+    for count in (1, 5, 20):
+        elapsed, _ = timed(lambda: [engine.find_slots(c, after, 30, count=count) for c, after in queries])
+        print(f"  first {count:>2} slots {elapsed / len(queries) * 1e6:8.1f} us/query")
+
+
+def bench_tolerant(scale=1):
+    """Error-collecting batch parsing versus per-row try/except at several bad-row rates."""
+    import tolerant_batch
+    from datetime_kernels import parse_to_epoch
+
+    def per_row(values):
+        results, errors = [], []
+        for row, value in enumerate(values):
+            try:
+                results.append(epoch_to_datetime(parse_to_epoch(value)))
+            except (TypeError, ValueError) as error:
+                results.append(None)
+                errors.append((row, str(error)))
+        return results, errors
+
+    count = 100000 * scale
+    rng = random.Random(0)
+    good = sample_date_strings(count)
+    print(f"tolerant: {count} rows")
+    for percent in (1, 10, 50):
+        feed = [rng.choice(("2025-02-30", "19/03/2025", None)) if rng.randrange(100) < percent else value
+                for value in good]
+        scalar, _ = timed(per_row, feed)
+        batch, _ = timed(tolerant_batch.convert_string_to_datetime, feed)
+        print(f"  {percent:>2}% bad  try/except {count / scalar:12,.0f} rows/s  "
+              f"tolerant {count / batch:12,.0f} rows/s  x{scalar / batch:.2f}")
+
+
+def bench_durations(scale=1):
+    """Precompiled durations applied in one pass versus per-row timedelta construction."""
+    from batch_processor import convert_strings_to_datetimes, to_epochs
+    from durations import apply_duration, compile_duration
+
+    count = 100000 * scale
+    bases = convert_strings_to_datetimes(sample_date_strings(count))
+    epochs = to_epochs(bases)
+    rules = ["2d5h30m", "P1W", "PT45M"] * (count // 3)
+    print(f"durations: {count} rows")
+    elapsed, _ = timed(lambda: [base + datetime.timedelta(days=2, hours=5, minutes=30) for base in bases])
+    print(f"  {'timedelta per row':<26} {count / elapsed:12,.0f} rows/s")
+    elapsed, _ = timed(lambda: [compile_duration(rule) for rule in rules])
+    print(f"  {'compile (interned)':<26} {len(rules) / elapsed:12,.0f} rules/s")
+    duration = compile_duration("2d5h30m")
+    elapsed, _ = timed(apply_duration, bases, duration)
+    print(f"  {'apply to datetimes':<26} {count / elapsed:12,.0f} rows/s")
+    elapsed, _ = timed(apply_duration, epochs, duration)
+    print(f"  {'apply to epoch array':<26} {count / elapsed:12,.0f} rows/s")
+
+
+def bench_months(scale=1):
+    """Calendar month arithmetic, scalar and batched, against the 30-day approximation."""
+    from batch_processor import convert_strings_to_datetimes, to_epochs
+    from calendar_arithmetic import add_months, add_months_batch
+
+    count = 100000 * scale
+    bases = convert_strings_to_datetimes(sample_date_strings(count))
+    epochs = to_epochs(bases)
+    print(f"months: {count} rows, +3 months")
+    for name, func in (
+            ("30-day timedelta", lambda: [base + datetime.timedelta(days=90) for base in bases]),
+            ("add_months per row", lambda: [add_months(base, 3) for base in bases]),
+            ("add_months_batch", lambda: add_months_batch(bases, 3)),
+            ("add_months_batch (epochs)", lambda: add_months_batch(epochs, 3))):
+        elapsed, _ = timed(func)
+        print(f"  {name:<26} {count / elapsed:12,.0f} rows/s")
+
+
+def bench_distributed(scale=1):
+    """Throughput of the sharded coordinator against the number of local workers."""
+    from distributed import run_distributed, start_local_workers
+    from tolerant_batch import convert_timezone
+
+    count = 200000 * scale
+    rows = sample_date_strings(count)
+    arguments = {"source_offset": -5, "target_offset": 3}
+    print(f"distributed: {count} rows, convert_timezone")
+    elapsed, _ = timed(convert_timezone, rows, -5, 3)
+    print(f"  {'in-process':<12} {elapsed:8.3f}s {count / elapsed:12,.0f} rows/s")
+    for workers in (1, 2, 4, 8):
+        processes = start_local_workers(workers)
+        try:
+            elapsed, _ = timed(run_distributed, rows, "convert_timezone",
+                               [address for _, address in processes], arguments)
+        finally:
+            for process, _ in processes:
+                process.terminate()
+                process.wait()
+        print(f"  {workers:>2} workers   {elapsed:8.3f}s {count / elapsed:12,.0f} rows/s")
+
+
+def bench_bulk_format(scale=1):
+    """Bytes/s and peak traced memory of BulkWriter versus per-row formatting and writes."""
+    import os
+    import tempfile
+    import tracemalloc
+
+    from batch_processor import convert_strings_to_datetimes, to_epochs
+    from bulk_format import BulkWriter
+
+    count = 200000 * scale
+    dts = convert_strings_to_datetimes(sample_date_strings(count))
+    epochs = to_epochs(dts)
+    handle, path = tempfile.mkstemp()
+    os.close(handle)
+
+    def per_row():
+        with open(path, "w") as out:
+            for dt in dts:
+                out.write(dt.strftime("%Y-%m-%d %H:%M:%S") + "\n")
+
+    def bulk(values, datetimes):
+        with open(path, "wb") as out, BulkWriter(out) as writer:
+            if datetimes:
+                writer.write_datetimes(values)
+            else:
+                writer.write_epochs(values)
+
+    print(f"bulk_format: {count} rows")
+    bulk(epochs[:1], False)  # build the lookup tables outside the measurements
+    for name, func in (("strftime + write", per_row),
+                       ("BulkWriter datetimes", lambda: bulk(dts, True)),
+                       ("BulkWriter epochs", lambda: bulk(epochs, False))):
+        elapsed, _ = timed(func)
+        size = os.path.getsize(path)
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  {name:<22} {size / elapsed / 1e6:8.1f} MB/s  peak traced {peak / 1e6:8.2f} MB")
+    os.remove(path)
+
+
+def bench_query_server(scale=1):
+    """Throughput and p99 latency of the query server at 1, 10 and 100 concurrent clients."""
+    import asyncio
+
+    from query_server import run_load, start_local_server
+
+    total = 20000 * scale
+    print(f"query_server: {total} single-row requests per run")
+    for max_batch in (1, 1024):
+        process, (host, port) = start_local_server(max_batch)
+        try:
+            label = "no coalescing" if max_batch == 1 else "coalescing"
+            for clients in (1, 10, 100):
+                for pipeline in (1, 16):
+                    report = asyncio.run(run_load(host, port, clients, total // clients, pipeline))
+                    print(f"  {label:<14} {clients:>3} clients pipeline {pipeline:>2} "
+                          f"{report['throughput']:10,.0f} req/s  p99 {report['p99_us'] / 1000:8.2f} ms")
+        finally:
+            process.terminate()
+            process.wait()
+
+
+def bench_date_dimension(scale=1):
+    """Date dimension build/open cost, and gathers versus per-row weekday/ISO week/quarter derivation."""
+    import os
+    import tempfile
+
+    from batch_processor import convert_strings_to_datetimes, to_epochs
+    from date_dimension import build_dimension, open_dimension
+
+    count = 200000 * scale
+    dts = convert_strings_to_datetimes(sample_date_strings(count))
+    epochs = to_epochs(dts)
+    elapsed, dimension = timed(build_dimension, 1900, 2100)
+    print(f"date_dimension: 1900-2100 ({len(dimension)} days), {count} lookups")
+    print(f"  {'build':<20} {elapsed:8.3f}s")
+    handle, path = tempfile.mkstemp()
+    os.close(handle)
+    try:
+        dimension.save(path)
+        elapsed, opened = timed(open_dimension, path)
+        print(f"  {'open (mmap)':<20} {elapsed * 1000:8.3f}ms  {os.path.getsize(path):,} bytes")
+
+        def per_row():
+            return [(dt.strftime("%A"), dt.isocalendar()[1], (dt.month - 1) // 3 + 1) for dt in dts]
+
+        def gathered():
+            return [opened.gather(column, epochs) for column in ("weekday", "iso_week", "quarter")]
+
+        for name, func in (("per-row", per_row), ("gather", gathered)):
+            elapsed, _ = timed(func)
+            print(f"  {name:<20} {elapsed:8.3f}s {count / elapsed:12,.0f} rows/s")
+        opened.close()
+    finally:
+        os.remove(path)
+
+
+def bench_timestamps(scale=1):
+    """Peak traced memory of a TimestampArray versus a list of datetimes (--scale 10 gives 10^7 rows)."""
+    import gc
+    import tracemalloc
+
+    from timestamps import TimestampArray
+
+    count = 1000000 * scale
+    rng = random.Random(0)
+    base = _BASE_DAY * SECONDS_PER_DAY
+    epochs = [base + rng.randrange(0, 365 * SECONDS_PER_DAY) for _ in range(count)]
+    print(f"timestamps: {count} values")
+
+    def build_list():
+        return [epoch_to_datetime(seconds) for seconds in epochs]
+
+    def build_packed():
+        return TimestampArray.from_epochs(epochs)
+
+    for name, build in (("list[datetime]", build_list), ("TimestampArray", build_packed)):
+        elapsed, values = timed(build)
+        del values
+        gc.collect()
+        tracemalloc.start()
+        values = build()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        shuffled = values[:]
+        start = time.perf_counter()
+        values.sort()
+        sort_time = time.perf_counter() - start
+        tracemalloc.start()
+        shuffled.sort()
+        sort_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  {name:<16} {current / count:6.1f} bytes/row held  {peak / 2 ** 20:9.1f} MiB peak  "
+              f"build {elapsed:6.3f}s  sort {sort_time:6.3f}s  {sort_peak / 2 ** 20:7.1f} MiB sort peak")
+        del values, shuffled
+
+
+def bench_tz_normalize(scale=1):
+    """Grouped bulk normalization of a mixed-site feed versus one convert_timezone call per row."""
+    from batch_processor import convert_strings_to_datetimes
+    from tolerant_batch import convert_timezone
+    from tz_normalize import infer_offsets, normalize_epochs, normalize_timezones, shift_grouped, split_offset
+
+    count = 200000 * scale
+    rng = random.Random(0)
+    site_offsets = {f"site{number}": rng.randrange(-12, 15) for number in range(12)}
+    names = sorted(site_offsets)
+    sites = [rng.choice(names) for _ in range(count)]
+    values = [value + "+09:00" if rng.random() < 0.1 else value for value in sample_date_strings(count)]
+    print(f"tz_normalize: {count} rows, {len(site_offsets)} sites, 10% with suffixes")
+
+    def per_row():
+        out = []
+        for value, site in zip(values, sites):
+            value, offset = split_offset(value)
+            out.append(convert_timezone([value], site_offsets[site] if offset is None else offset, 0)[0][0])
+        return out
+
+    for name, func in (("per-row", per_row),
+                       ("normalize (datetimes)", lambda: normalize_timezones(values, 0, sites, site_offsets)),
+                       ("normalize (epochs)", lambda: normalize_epochs(values, 0, sites, site_offsets))):
+        elapsed, _ = timed(func)
+        print(f"  {name:<22} {elapsed:8.3f}s {count / elapsed:12,.0f} rows/s")
+
+    # The shift stage alone, on values that are already parsed
+    epochs, sources = infer_offsets(values, sites, site_offsets)
+    dts = convert_strings_to_datetimes([split_offset(value)[0] for value in values])
+    targets = [0] * count
+    for name, func in (("shift per-row", lambda: [convert_timezone([dt], source, 0)[0][0]
+                                                  for dt, source in zip(dts, sources)]),
+                       ("shift grouped", lambda: shift_grouped(epochs, sources, targets))):
+        elapsed, _ = timed(func)
+        print(f"  {name:<22} {elapsed:8.3f}s {count / elapsed:12,.0f} rows/s")
+
+
+def bench_planner(scale=1):
+    """The planner's chosen path versus each forced path at several input sizes."""
+    import planner
+
+    thresholds = planner.load_thresholds()
+    print(f"planner: get_day_of_week, thresholds {thresholds['get_day_of_week']}")
+    for size in (1, 10, 1000, 100000 * scale):
+        values = sample_date_strings(size)
+        repeat = max(1, 100000 // size)
+        timings = {}
+        for path in planner.PATHS:
+            runs = max(1, repeat // 10) if path == "parallel" else repeat
+            elapsed, _ = timed(lambda: [planner._run("get_day_of_week", [values], (), path) for _ in range(runs)])
+            timings[path] = elapsed / runs
+        chosen = planner.choose_path("get_day_of_week", size)
+        cells = "  ".join(f"{path} {timings[path] * 1e6:12,.1f}us" for path in planner.PATHS)
+        print(f"  {size:>7} rows  {cells}  -> {chosen}")
+    planner.shutdown()
+
+
+SUITES = {
+    "planner": bench_planner,
+    "tz_normalize": bench_tz_normalize,
+    "timestamps": bench_timestamps,
+    "date_dimension": bench_date_dimension,
+    "query_server": bench_query_server,
+    "bulk_format": bench_bulk_format,
+    "distributed": bench_distributed,
+    "months": bench_months,
+    "durations": bench_durations,
+    "tolerant": bench_tolerant,
+    "slots": bench_slots,
+    "parse_cache": bench_parse_cache,
+    "roster": bench_roster,
+    "threads": bench_threads,
+}
+
+
+def main(argv=None):
+    """Parse arguments and run the requested benchmark suites."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("suite", choices=sorted(SUITES) + ["all"])
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args(argv)
+    names = sorted(SUITES) if args.suite == "all" else [args.suite]
+    for name in names:
+        SUITES[name](args.scale)
+
+
+if __name__ == "__main__":
+    main()
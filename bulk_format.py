@@ -0,0 +1,162 @@
+"""
+Bulk Formatting - Rendering timestamps straight into a preallocated byte buffer
+
+Exporting millions of rows with format_datetime creates one throwaway string
+per value. BulkWriter instead renders the default "%Y-%m-%d %H:%M:%S" format
+(or the date-only "%Y-%m-%d" format) as fixed-width, newline-terminated
+records directly into one reusable bytearray, and hands the buffer to the
+file in large writes.
+
+Rendering uses two lookup tables: a lazily built table holding the eight
+"HH:MM:SS" bytes for every second of the day, and a small cache of
+"YYYY-MM-DD" prefixes per day number, so a record costs two slice copies.
+"""
+
+import datetime
+from functools import lru_cache
+
+from datetime_kernels import (
+    MAX_EPOCH,
+    MIN_EPOCH,
+    SECONDS_PER_DAY,
+    civil_from_days,
+    datetime_to_epoch,
+)
+from timestamps import TimestampArray
+
+DATETIME_RECORD = 20  # "YYYY-MM-DD HH:MM:SS\n"
+DATE_RECORD = 11      # "YYYY-MM-DD\n"
+
+
+@lru_cache(maxsize=None)
+def _time_table():
+    """Return a memoryview over "HH:MM:SS" for every second of the day, 8 bytes each."""
+    return memoryview("".join(f"{second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}"
+                              for second in range(SECONDS_PER_DAY)).encode("ascii"))
+
+
+@lru_cache(maxsize=65536)
+def _date_bytes(day):
+    year, month, day_of_month = civil_from_days(day)
+    return f"{year:04d}-{month:02d}-{day_of_month:02d}".encode("ascii")
+
+
+def format_epochs_into(epochs, buffer, position=0, date_only=False):
+    """
+    Render epoch seconds as newline-terminated records into a buffer.
+
+    Parameters:
+    epochs (iterable of int): Epoch seconds, within the datetime range
+    buffer (bytearray or writable memoryview): Destination, large enough for
+        every record (20 bytes each, or 11 with date_only)
+    position (int): Offset of the first record in buffer
+    date_only (bool): Render "YYYY-MM-DD" instead of "YYYY-MM-DD HH:MM:SS"
+
+    Returns:
+    int: Position just after the last record written
+
+    Raises:
+    OverflowError: If a value is outside the supported datetime range
+    ValueError: If buffer is too small
+
+    Example:
+    >>> buffer = bytearray(40)
+    >>> format_epochs_into([0, 1742394600], buffer)
+    40
+    >>> bytes(buffer)
+    b'1970-01-01 00:00:00\\n2025-03-19 14:30:00\\n'
+    """
+    times = _time_table()
+    view = memoryview(buffer)
+    record = DATE_RECORD if date_only else DATETIME_RECORD
+    try:
+        for seconds in epochs:
+            if not MIN_EPOCH <= seconds <= MAX_EPOCH:
+                raise OverflowError("Value is outside the supported datetime range")
+            day, time_of_day = divmod(seconds, SECONDS_PER_DAY)
+            end = position + record
+            if end > len(view):
+                raise ValueError("Buffer is too small")
+            view[position:position + 10] = _date_bytes(day)
+            if date_only:
+                view[position + 10] = 10
+            else:
+                view[position + 10] = 32
+                view[position + 11:position + 19] = times[time_of_day * 8:time_of_day * 8 + 8]
+                view[position + 19] = 10
+            position = end
+    finally:
+        view.release()
+    return position
+
+
+def format_epochs(epochs, date_only=False):
+    """
+    Render a sized collection of epoch seconds to one bytes object.
+
+    Example:
+    >>> format_epochs([1742394600], date_only=True)
+    b'2025-03-19\\n'
+    """
+    buffer = bytearray(len(epochs) * (DATE_RECORD if date_only else DATETIME_RECORD))
+    format_epochs_into(epochs, buffer, date_only=date_only)
+    return bytes(buffer)
+
+
+class BulkWriter:
+    """
+    Buffered writer of formatted timestamps to a binary file.
+
+    Records are rendered into a preallocated bytearray of buffer_rows records
+    and written out whenever it fills up, on flush(), and when the writer is
+    used as a context manager and the block exits.
+
+    Example:
+    >>> import io
+    >>> out = io.BytesIO()
+    >>> with BulkWriter(out) as writer:
+    ...     writer.write_datetimes([datetime.datetime(2025, 3, 19, 14, 30)])
+    >>> out.getvalue()
+    b'2025-03-19 14:30:00\\n'
+    """
+
+    def __init__(self, file, buffer_rows=16384, date_only=False):
+        if buffer_rows < 1:
+            raise ValueError("buffer_rows must be positive")
+        self.file = file
+        self.date_only = date_only
+        self.record = DATE_RECORD if date_only else DATETIME_RECORD
+        self.buffer = bytearray(buffer_rows * self.record)
+        self.buffer_rows = buffer_rows
+        self.position = 0
+        self.bytes_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    def write_epochs(self, epochs):
+        """Render and buffer a sequence of epoch-second values."""
+        for start in range(0, len(epochs), self.buffer_rows):
+            chunk = epochs[start:start + self.buffer_rows]
+            if self.position + len(chunk) * self.record > len(self.buffer):
+                self.flush()
+            self.position = format_epochs_into(chunk, self.buffer, self.position, self.date_only)
+
+    def write_datetimes(self, dts):
+        """Render and buffer a sequence of datetime objects; microseconds are dropped."""
+        if isinstance(dts, TimestampArray):
+            self.write_epochs(dts.epochs)
+            return
+        for start in range(0, len(dts), self.buffer_rows):
+            self.write_epochs([datetime_to_epoch(dt) for dt in dts[start:start + self.buffer_rows]])
+
+    def flush(self):
+        """Write buffered records to the file."""
+        if self.position:
+            with memoryview(self.buffer) as view:
+                self.file.write(view[:self.position])
+            self.bytes_written += self.position
+            self.position = 0
@@ -0,0 +1,196 @@
+"""
+Calendar Arithmetic - Adding months and years with end-of-month clamping
+
+timedelta has no month unit, so "in 3 months" cannot be expressed with
+add_time_duration. The functions below move a date by whole calendar months
+and keep the time of day. When the target month is shorter than the source
+day, the day is clamped to the last day of the target month:
+
+    Jan 31 + 1 month  -> Feb 28 (Feb 29 in leap years)
+    Feb 29 + 1 year   -> Feb 28
+    Mar 31 - 1 month  -> Feb 28/29
+
+All work is done on epoch seconds with the integer civil-date conversions and
+a precomputed days-in-month table, so the batch versions never build
+intermediate datetime objects.
+"""
+
+import datetime
+from array import array
+
+from datetime_kernels import (
+    DAYS_IN_MONTH,
+    MAX_EPOCH,
+    MIN_EPOCH,
+    SECONDS_PER_DAY,
+    civil_from_days,
+    days_from_civil,
+    difference_from_seconds,
+    epoch_to_datetime,
+    is_leap_year,
+    split_epoch,
+    to_epoch,
+)
+from timestamps import TimestampArray
+
+# _MONTH_LENGTHS[leap][month - 1]
+_MONTH_LENGTHS = (DAYS_IN_MONTH, DAYS_IN_MONTH[:1] + (29,) + DAYS_IN_MONTH[2:])
+
+
+def _check_months(months):
+    if not isinstance(months, int) or isinstance(months, bool):
+        raise TypeError("months and years must be integers")
+
+
+def add_months_to_epoch(seconds, months):
+    """
+    Add calendar months to epoch seconds, clamping to the end of the month.
+
+    Parameters:
+    seconds (int): Epoch seconds
+    months (int): Number of months to add (may be negative)
+
+    Returns:
+    int: Shifted epoch seconds
+
+    Raises:
+    OverflowError: If the result is outside the supported datetime range
+
+    Example:
+    >>> epoch_to_datetime(add_months_to_epoch(to_epoch("2024-01-31 09:30:00"), 1))
+    datetime.datetime(2024, 2, 29, 9, 30)
+    """
+    days, time_of_day = divmod(seconds, SECONDS_PER_DAY)
+    year, month, day = civil_from_days(days)
+    year, month_index = divmod(year * 12 + month - 1 + months, 12)
+    last_day = _MONTH_LENGTHS[is_leap_year(year)][month_index]
+    result = days_from_civil(year, month_index + 1, min(day, last_day)) * SECONDS_PER_DAY + time_of_day
+    if not MIN_EPOCH <= result <= MAX_EPOCH:
+        raise OverflowError("Result is outside the supported datetime range")
+    return result
+
+
+def _add_months_to_datetime(dt, months):
+    year, month_index = divmod(dt.year * 12 + dt.month - 1 + months, 12)
+    if not 1 <= year <= 9999:
+        raise OverflowError("Result is outside the supported datetime range")
+    last_day = _MONTH_LENGTHS[is_leap_year(year)][month_index]
+    return dt.replace(year=year, month=month_index + 1, day=min(dt.day, last_day))
+
+
+def _shift(value, months):
+    # Naive datetimes are moved with replace(); everything else goes through
+    # epoch seconds like the other kernels, keeping any microseconds.
+    if type(value) is datetime.datetime and value.tzinfo is None:
+        return _add_months_to_datetime(value, months)
+    seconds, microseconds = split_epoch(value)
+    return epoch_to_datetime(add_months_to_epoch(seconds, months), microseconds)
+
+
+def add_months(dt, months):
+    """
+    Add calendar months to a datetime.
+
+    Parameters:
+    dt (datetime or str): Original datetime
+    months (int): Number of months to add (may be negative)
+
+    Returns:
+    datetime: New datetime, with the day clamped to the end of the month
+
+    Example:
+    >>> add_months("2025-01-31 14:30:00", 1)
+    datetime.datetime(2025, 2, 28, 14, 30)
+    """
+    _check_months(months)
+    return _shift(dt, months)
+
+
+def add_years(dt, years):
+    """
+    Add calendar years to a datetime; Feb 29 becomes Feb 28 in non-leap years.
+
+    Example:
+    >>> add_years("2024-02-29", 1)
+    datetime.datetime(2025, 2, 28, 0, 0)
+    """
+    _check_months(years)
+    return add_months(dt, years * 12)
+
+
+def add_months_batch(values, months):
+    """
+    Add the same number of calendar months to a batch of datetimes.
+
+    Parameters:
+    values (array or sequence): An array('q') of epoch seconds, a
+        TimestampArray, or datetimes and/or date strings
+    months (int): Number of months to add (may be negative)
+
+    Returns:
+    array or list: A new array('q') or TimestampArray for those inputs,
+    otherwise a list of datetimes
+    """
+    _check_months(months)
+    if isinstance(values, TimestampArray):
+        return TimestampArray.from_epochs(add_months_batch(values.epochs, months))
+    if isinstance(values, array):
+        return array("q", [add_months_to_epoch(seconds, months) for seconds in values])
+    return [_shift(value, months) for value in values]
+
+
+def months_between_epochs(start, end, start_microseconds=0, end_microseconds=0):
+    """
+    Count whole calendar months from start to end, truncated toward zero.
+
+    A month is whole when adding it to start (with end-of-month clamping)
+    does not pass end. The count is negated when end is before start.
+    start_microseconds and end_microseconds refine the two instants below
+    the second.
+
+    Example:
+    >>> months_between_epochs(to_epoch("2025-01-31"), to_epoch("2025-02-28"))
+    1
+    """
+    if (end, end_microseconds) < (start, start_microseconds):
+        return -months_between_epochs(end, start, end_microseconds, start_microseconds)
+    start_year, start_month, _ = civil_from_days(start // SECONDS_PER_DAY)
+    end_year, end_month, _ = civil_from_days(end // SECONDS_PER_DAY)
+    months = (end_year - start_year) * 12 + end_month - start_month
+    if months and (add_months_to_epoch(start, months), start_microseconds) > (end, end_microseconds):
+        months -= 1
+    return months
+
+
+def calendar_breakdown(start, end, start_microseconds=0, end_microseconds=0):
+    """
+    Return whole calendar years and months between two epoch-second values.
+
+    Returns:
+    dict: {"years": int, "months": int}, both totals truncated toward zero
+    """
+    months = months_between_epochs(start, end, start_microseconds, end_microseconds)
+    return {"years": int(months / 12), "months": months}
+
+
+def calendar_difference(start_date, end_date):
+    """
+    Calculate a calendar-aware difference between two dates.
+
+    Parameters:
+    start_date (datetime or str): Start date
+    end_date (datetime or str): End date
+
+    Returns:
+    dict: years and months alongside days, hours, minutes and total_seconds
+    as returned by calculate_date_difference
+
+    Example:
+    >>> calendar_difference("2024-02-29", "2025-02-28")
+    {'days': 365, 'hours': 8760, 'minutes': 525600, 'total_seconds': 31536000, 'years': 1, 'months': 12}
+    """
+    start, start_microseconds = split_epoch(start_date)
+    end, end_microseconds = split_epoch(end_date)
+    result = difference_from_seconds(end - start, end_microseconds - start_microseconds)
+    result.update(calendar_breakdown(start, end, start_microseconds, end_microseconds))
+    return result
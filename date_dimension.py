@@ -0,0 +1,240 @@
+"""
+Date Dimension - A precomputed calendar table indexed by day
+
+Reporting joins need the weekday, ISO week, quarter, day of year and holiday
+flags of every date. Instead of calling get_day_of_week and format_datetime
+per row, build_dimension() computes them once for a range of years and keeps
+each attribute as a packed array indexed by day (days since 1970-01-01 minus
+the first day of the range). Single lookups are one index operation and
+gather() reads a column for a whole batch of dates at once.
+
+A dimension can be saved to a file and opened again with open_dimension(),
+which memory-maps it read-only: the columns are views into the mapping, so
+any number of worker processes share one copy from the page cache and none of
+them rebuilds the table.
+"""
+
+import datetime
+import mmap
+import struct
+from array import array
+from operator import itemgetter
+
+from datetime_kernels import (
+    SECONDS_PER_DAY,
+    WEEKDAY_NAMES,
+    _EPOCH_ORDINAL,
+    days_from_civil,
+    days_in_month,
+    to_epoch,
+)
+
+# Column name -> array typecode, in file order
+COLUMNS = {
+    "weekday": "B",
+    "iso_year": "H",
+    "iso_week": "B",
+    "quarter": "B",
+    "day_of_year": "H",
+    "flags": "B",
+}
+
+# Bits of the flags column
+WEEKEND = 1
+HOLIDAY = 2
+MONTH_END = 4
+
+_MAGIC = b"DATEDIM1"
+_HEADER = struct.Struct("<8sqq")  # magic, first day, day count
+
+
+class DateDimension:
+    """
+    Calendar attributes for every day of a fixed range.
+
+    Build one with build_dimension() or open a saved one with open_dimension().
+    Columns are available by name in .columns; index them with
+    day - first_day, or use row(), lookup() and gather().
+
+    Example:
+    >>> dimension = build_dimension(2025, 2025, annual_holidays=[(12, 25)])
+    >>> dimension.lookup("2025-12-25 09:00:00")["holiday"]
+    True
+    >>> list(dimension.gather("quarter", ["2025-01-01", "2025-12-31"]))
+    [1, 4]
+    """
+
+    def __init__(self, first_day, columns, mapping=None):
+        self.first_day = first_day
+        self.columns = columns
+        self._mapping = mapping
+
+    def __len__(self):
+        return len(self.columns["weekday"])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def last_day(self):
+        """Day number of the last day in the table."""
+        return self.first_day + len(self) - 1
+
+    def index(self, day):
+        """
+        Return the table index of a day number.
+
+        Raises:
+        IndexError: If day is outside the range of the table
+        """
+        index = day - self.first_day
+        if not 0 <= index < len(self):
+            raise IndexError("Date is outside the range of the date dimension")
+        return index
+
+    def row(self, day):
+        """Return every attribute of a day number as a dict."""
+        index = self.index(day)
+        flags = self.columns["flags"][index]
+        return {
+            "weekday": WEEKDAY_NAMES[self.columns["weekday"][index]],
+            "iso_year": self.columns["iso_year"][index],
+            "iso_week": self.columns["iso_week"][index],
+            "quarter": self.columns["quarter"][index],
+            "day_of_year": self.columns["day_of_year"][index],
+            "weekend": bool(flags & WEEKEND),
+            "holiday": bool(flags & HOLIDAY),
+            "month_end": bool(flags & MONTH_END),
+        }
+
+    def lookup(self, value):
+        """Return every attribute of the date of a datetime or date string as a dict."""
+        return self.row(to_epoch(value) // SECONDS_PER_DAY)
+
+    def gather(self, column, values):
+        """
+        Read one column for a batch of dates.
+
+        Parameters:
+        column (str): One of COLUMNS
+        values (array or sequence): An array('q') of epoch seconds, or
+            datetimes and/or date strings
+
+        Returns:
+        array: The column values, in input order, with the column's typecode
+
+        Raises:
+        KeyError: If column is unknown
+        IndexError: If a date is outside the range of the table
+        """
+        data = self.columns[column]
+        if not isinstance(values, array):
+            values = [to_epoch(value) for value in values]
+        first = self.first_day
+        indices = [seconds // SECONDS_PER_DAY - first for seconds in values]
+        if not indices:
+            return array(COLUMNS[column])
+        if min(indices) < 0 or max(indices) >= len(data):
+            raise IndexError("Date is outside the range of the date dimension")
+        if len(indices) == 1:
+            return array(COLUMNS[column], [data[indices[0]]])
+        return array(COLUMNS[column], itemgetter(*indices)(data))
+
+    def save(self, path):
+        """Write the table to a file that open_dimension() can memory-map."""
+        with open(path, "wb") as out:
+            out.write(_HEADER.pack(_MAGIC, self.first_day, len(self)))
+            for name, typecode in COLUMNS.items():
+                data = self.columns[name]
+                out.write(data if isinstance(data, array) else array(typecode, data))
+                out.write(bytes(-out.tell() % 8))
+
+    def close(self):
+        """Release the memory mapping of an opened table; in-memory tables are unaffected."""
+        if self._mapping is not None:
+            for view in self.columns.values():
+                view.release()
+            self._mapping.close()
+            self._mapping = None
+
+
+def build_dimension(first_year=1900, last_year=2100, holidays=(), annual_holidays=()):
+    """
+    Compute the date dimension for whole years.
+
+    Parameters:
+    first_year (int): First year in the table
+    last_year (int): Last year in the table, inclusive
+    holidays (iterable): Individual holiday dates as datetimes or date strings
+    annual_holidays (iterable): (month, day) pairs that are holidays every year
+
+    Returns:
+    DateDimension: The in-memory table
+
+    Raises:
+    ValueError: If the year range is empty or outside 1..9999
+    """
+    if not 1 <= first_year <= last_year <= 9999:
+        raise ValueError("Year range must satisfy 1 <= first_year <= last_year <= 9999")
+    first_day = days_from_civil(first_year, 1, 1)
+    count = days_from_civil(last_year, 12, 31) - first_day + 1
+    holiday_days = {to_epoch(value) // SECONDS_PER_DAY for value in holidays}
+    annual = set(annual_holidays)
+    columns = {name: array(typecode, bytes(count * array(typecode).itemsize))
+               for name, typecode in COLUMNS.items()}
+    weekday, iso_year, iso_week = columns["weekday"], columns["iso_year"], columns["iso_week"]
+    quarter, day_of_year, flags = columns["quarter"], columns["day_of_year"], columns["flags"]
+    ordinal = first_day + _EPOCH_ORDINAL
+    for index in range(count):
+        date = datetime.date.fromordinal(ordinal + index)
+        iso = date.isocalendar()
+        weekday[index] = iso[2] - 1
+        iso_year[index] = iso[0]
+        iso_week[index] = iso[1]
+        quarter[index] = (date.month + 2) // 3
+        day_of_year[index] = date.timetuple().tm_yday
+        bits = WEEKEND if iso[2] > 5 else 0
+        if (date.month, date.day) in annual or first_day + index in holiday_days:
+            bits |= HOLIDAY
+        if date.day == days_in_month(date.year, date.month):
+            bits |= MONTH_END
+        flags[index] = bits
+    return DateDimension(first_day, columns)
+
+
+def open_dimension(path):
+    """
+    Memory-map a table written by DateDimension.save().
+
+    Returns:
+    DateDimension: A read-only table backed by the file; close() it when done
+
+    Raises:
+    ValueError: If the file is not a date dimension file or is truncated
+    """
+    with open(path, "rb") as source:
+        mapping = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        magic, first_day, count = _HEADER.unpack_from(mapping)
+    except struct.error:
+        magic = None
+    if magic != _MAGIC:
+        mapping.close()
+        raise ValueError(f"Not a date dimension file: {path!r}")
+    spans = []
+    offset = _HEADER.size
+    for name, typecode in COLUMNS.items():
+        size = max(count, 0) * array(typecode).itemsize
+        spans.append((name, typecode, offset, size))
+        offset += size + -(offset + size) % 8
+    if count < 0 or len(mapping) < offset:
+        mapping.close()
+        raise ValueError(f"Date dimension file is truncated: {path!r}")
+    columns = {}
+    with memoryview(mapping) as whole:
+        for name, typecode, start, size in spans:
+            columns[name] = whole[start:start + size].cast(typecode)
+    return DateDimension(first_day, columns, mapping)
@@ -0,0 +1,295 @@
+"""
+Date and Time Kernels - Integer building blocks for the Date and Time Processor
+
+Every fast path in this project works on naive timestamps expressed as whole
+seconds since 1970-01-01 00:00:00 ("epoch seconds"). The helpers below convert
+between strings, datetime objects and epoch seconds using integer arithmetic
+only, so they keep no module state and are safe to call from any thread.
+
+Datetimes may carry microseconds. Day-level lookups (weekday, date keys)
+use the whole second a datetime falls in. Arithmetic that is defined as
+timedelta arithmetic (durations, timezone shifts, differences) keeps the
+microseconds next to the epoch seconds with split_epoch() and puts them back
+with epoch_to_datetime(seconds, microseconds).
+"""
+
+import datetime
+import re
+
+SECONDS_PER_MINUTE = 60
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+
+MIN_OFFSET = -12
+MAX_OFFSET = 14
+
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+
+# Epoch seconds of datetime.min and of the last whole second before datetime.max
+MIN_EPOCH = (datetime.datetime.min.toordinal() - _EPOCH_ORDINAL) * SECONDS_PER_DAY
+MAX_EPOCH = (datetime.datetime.max.toordinal() - _EPOCH_ORDINAL + 1) * SECONDS_PER_DAY - 1
+
+
+def is_leap_year(year):
+    """Return True if year is a leap year in the proleptic Gregorian calendar."""
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def days_in_month(year, month):
+    """Return the number of days in the given month of the given year."""
+    if month == 2 and is_leap_year(year):
+        return 29
+    return DAYS_IN_MONTH[month - 1]
+
+
+def days_from_civil(year, month, day):
+    """
+    Convert a calendar date to a day count relative to 1970-01-01.
+
+    Parameters:
+    year (int): Year
+    month (int): Month (1-12)
+    day (int): Day of month
+
+    Returns:
+    int: Days since 1970-01-01 (negative before the epoch)
+
+    Example:
+    >>> days_from_civil(2025, 3, 19)
+    20166
+    """
+    if month <= 2:
+        year -= 1
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def civil_from_days(days):
+    """
+    Convert a day count relative to 1970-01-01 back to a calendar date.
+
+    Parameters:
+    days (int): Days since 1970-01-01
+
+    Returns:
+    tuple: (year, month, day)
+
+    Example:
+    >>> civil_from_days(20166)
+    (2025, 3, 19)
+    """
+    days += 719468
+    era = days // 146097
+    doe = days - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 if mp < 10 else mp - 9
+    year = yoe + era * 400 + (1 if month <= 2 else 0)
+    return year, month, day
+
+
+def weekday_from_days(days):
+    """Return the weekday index (Monday=0) for a day count since 1970-01-01."""
+    # 1970-01-01 was a Thursday
+    return (days + 3) % 7
+
+
+def try_parse_epoch(date_string):
+    """
+    Parse a 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS' string to epoch seconds without raising.
+
+    Canonical, zero-padded strings are parsed by slicing. Any other string
+    is matched against the unpadded forms datetime.strptime accepts for the
+    same two formats ("2025-3-19", "2025-03-19 9:05:00") with a precompiled
+    pattern, so a malformed row costs one failed match and no exception.
+
+    Parameters:
+    date_string (str): Date string to parse
+
+    Returns:
+    int or None: Seconds since 1970-01-01 00:00:00, or None if date_string is
+    not a string holding a valid date in a supported format
+
+    Example:
+    >>> try_parse_epoch("2025-03-19 14:30:00")
+    1742394600
+    >>> try_parse_epoch("2025-3-19 9:05:00") == try_parse_epoch("2025-03-19 09:05:00")
+    True
+    >>> try_parse_epoch("2025-02-30") is None
+    True
+    """
+    if not isinstance(date_string, str):
+        return None
+    length = len(date_string)
+    if (length in (10, 19) and date_string[4] == "-" and date_string[7] == "-"
+            and (length == 10 or date_string[10] == " " and date_string[13] == ":" and date_string[16] == ":")):
+        digits = date_string[0:4] + date_string[5:7] + date_string[8:10]
+        if length == 19:
+            digits += date_string[11:13] + date_string[14:16] + date_string[17:19]
+        if digits.isascii() and digits.isdigit():
+            if length == 10:
+                return _civil_epoch(int(digits[0:4]), int(digits[4:6]), int(digits[6:8]), 0, 0, 0)
+            return _civil_epoch(int(digits[0:4]), int(digits[4:6]), int(digits[6:8]),
+                                int(digits[8:10]), int(digits[10:12]), int(digits[12:14]))
+    match = _LOOSE_DATE.fullmatch(date_string)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second = match.groups()
+    if hour is None:
+        return _civil_epoch(int(year), int(month), int(day), 0, 0, 0)
+    return _civil_epoch(int(year), int(month), int(day), int(hour), int(minute), int(second))
+
+
+# The shapes datetime.strptime accepts for "%Y-%m-%d %H:%M:%S" and "%Y-%m-%d"
+_LOOSE_DATE = re.compile(r"(\d\d\d\d)-(1[0-2]|0[1-9]|[1-9])-(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])"
+                         r"(?:\s+(2[0-3]|[01]\d|\d):([0-5]\d|\d):(6[01]|[0-5]\d|\d))?")
+
+
+def _civil_epoch(year, month, day, hour, minute, second):
+    if (year < 1 or not 1 <= month <= 12 or not 1 <= day <= days_in_month(year, month)
+            or not 0 <= hour < 24 or not 0 <= minute < 60 or not 0 <= second < 60):
+        return None
+    return (days_from_civil(year, month, day) * SECONDS_PER_DAY
+            + hour * SECONDS_PER_HOUR + minute * SECONDS_PER_MINUTE + second)
+
+
+def parse_to_epoch(date_string):
+    """
+    Parse a 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS' string to epoch seconds.
+
+    Parameters:
+    date_string (str): Date string to parse
+
+    Returns:
+    int: Seconds since 1970-01-01 00:00:00
+
+    Raises:
+    TypeError: If date_string is not a string
+    ValueError: If date_string is not a valid date in a supported format
+
+    Example:
+    >>> parse_to_epoch("2025-03-19 14:30:00")
+    1742394600
+    """
+    seconds = try_parse_epoch(date_string)
+    if seconds is None:
+        if not isinstance(date_string, str):
+            raise TypeError("date_string must be a string")
+        raise ValueError(f"Invalid date string: {date_string!r}")
+    return seconds
+
+
+def datetime_to_epoch(dt):
+    """
+    Return the epoch second a naive datetime falls in.
+
+    Microseconds are not part of the result; use split_epoch() where they
+    matter.
+    """
+    return ((dt.toordinal() - _EPOCH_ORDINAL) * SECONDS_PER_DAY
+            + dt.hour * SECONDS_PER_HOUR + dt.minute * SECONDS_PER_MINUTE + dt.second)
+
+
+def epoch_to_datetime(seconds, microseconds=0):
+    """Convert epoch seconds, plus optional microseconds, to a naive datetime."""
+    return _EPOCH + datetime.timedelta(seconds=seconds, microseconds=microseconds)
+
+
+def to_epoch(value):
+    """
+    Convert a datetime or date string to epoch seconds.
+
+    Parameters:
+    value (datetime or str): Value to convert
+
+    Returns:
+    int: Seconds since 1970-01-01 00:00:00
+
+    Raises:
+    TypeError: If value is neither a datetime nor a string
+    ValueError: If value is a string in an unsupported format
+    """
+    if isinstance(value, datetime.datetime):
+        return datetime_to_epoch(value)
+    return parse_to_epoch(value)
+
+
+def split_epoch(value):
+    """
+    Convert a datetime or date string to (epoch seconds, microseconds).
+
+    Example:
+    >>> split_epoch(datetime.datetime(1970, 1, 1, 0, 0, 1, 500000))
+    (1, 500000)
+    """
+    if isinstance(value, datetime.datetime):
+        return datetime_to_epoch(value), value.microsecond
+    return parse_to_epoch(value), 0
+
+
+def whole_epoch(value):
+    """
+    Convert a datetime or date string to epoch seconds, refusing to drop microseconds.
+
+    Raises:
+    TypeError: If value is neither a datetime nor a string
+    ValueError: If value is an invalid string or a datetime with microseconds
+    """
+    if isinstance(value, datetime.datetime) and value.microsecond:
+        raise ValueError(f"Expected a whole-second datetime: {value!r}")
+    return to_epoch(value)
+
+
+def validate_offset(offset, name="offset"):
+    """
+    Validate a timezone offset in hours.
+
+    Raises:
+    TypeError: If offset is not an int
+    ValueError: If offset is outside -12 to +14
+    """
+    if not isinstance(offset, int) or isinstance(offset, bool):
+        raise TypeError(f"{name} must be an integer")
+    if not MIN_OFFSET <= offset <= MAX_OFFSET:
+        raise ValueError(f"{name} must be between {MIN_OFFSET} and +{MAX_OFFSET}")
+
+
+def difference_from_seconds(total_seconds, microseconds=0):
+    """
+    Build the calculate_date_difference result dict from a signed duration.
+
+    The duration is total_seconds plus microseconds (either may be negative).
+    Days, hours and minutes are truncated toward zero so that swapping the
+    arguments only flips the signs; total_seconds is exact, as returned by
+    timedelta.total_seconds() (an int when the duration is whole seconds).
+
+    Example:
+    >>> difference_from_seconds(604800)
+    {'days': 7, 'hours': 168, 'minutes': 10080, 'total_seconds': 604800}
+    >>> difference_from_seconds(0, 500000)
+    {'days': 0, 'hours': 0, 'minutes': 0, 'total_seconds': 0.5}
+    """
+    if microseconds:
+        exact = total_seconds * 1000000 + microseconds
+        total_seconds = exact // 1000000 if exact % 1000000 == 0 else exact / 1000000
+        sign = -1 if exact < 0 else 1
+        magnitude = exact * sign // 1000000
+    else:
+        sign = -1 if total_seconds < 0 else 1
+        magnitude = total_seconds * sign
+    return {
+        "days": sign * (magnitude // SECONDS_PER_DAY),
+        "hours": sign * (magnitude // SECONDS_PER_HOUR),
+        "minutes": sign * (magnitude // SECONDS_PER_MINUTE),
+        "total_seconds": total_seconds,
+    }
@@ -0,0 +1,298 @@
+"""
+Distributed Batch Processing - Sharding backfills across local worker processes
+
+A coordinator splits the input rows into partitions (by month of the row's
+date, by site, or by any key function), sends each partition to a worker over
+a TCP socket and merges the answers back into input order. Workers run the
+error-collecting batch functions from tolerant_batch, so a partition always
+comes back as (results, errors) and bad rows never abort a run.
+
+If a worker dies or stops answering, its in-flight partition is put back on
+the queue and picked up by another worker. Because results are merged by row
+index, the output does not depend on which worker handled which partition.
+
+Start workers on this machine with start_local_workers(), or by hand:
+
+    python distributed.py worker --port 9001
+"""
+
+import argparse
+import datetime
+import json
+import queue
+import socket
+import subprocess
+import sys
+import threading
+from collections import defaultdict
+
+import tolerant_batch
+
+OPERATIONS = (
+    "convert_string_to_datetime",
+    "format_datetime",
+    "calculate_date_difference",
+    "add_time_duration",
+    "get_day_of_week",
+    "convert_timezone",
+)
+
+# Operations whose results are datetimes and travel as strings
+_DATETIME_RESULTS = ("convert_string_to_datetime", "add_time_duration", "convert_timezone")
+
+
+class WorkerError(Exception):
+    """Raised when no live worker is left to process the remaining partitions."""
+
+
+# Worker side
+
+def execute(operation, rows, arguments):
+    """
+    Run one operation on a partition, as a worker does.
+
+    Parameters:
+    operation (str): One of OPERATIONS
+    rows (list): Date strings or {"datetime": isoformat} objects, or
+        [start, end] pairs of them for calculate_date_difference
+    arguments (dict): Extra keyword arguments for the operation
+
+    Returns:
+    tuple: (results, errors) as returned by the tolerant_batch function
+
+    Raises:
+    ValueError: If operation is unknown or a difference row is not a pair
+    TypeError: If rows is not a list or arguments is not a dict
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown operation: {operation!r}")
+    if not isinstance(rows, (list, tuple)):
+        raise TypeError("rows must be a list")
+    if not isinstance(arguments, dict):
+        raise TypeError("arguments must be an object")
+    rows = [_unwire(row) for row in rows]
+    if operation == "calculate_date_difference":
+        for index, row in enumerate(rows):
+            if not isinstance(row, (list, tuple)) or len(row) != 2:
+                raise ValueError(f"row {index}: expected a [start, end] pair")
+        return tolerant_batch.calculate_date_difference(
+            [row[0] for row in rows], [row[1] for row in rows], **arguments)
+    if operation == "format_datetime":
+        dts, errors = tolerant_batch.convert_string_to_datetime(rows)
+        for row, value in enumerate(rows):
+            if isinstance(value, datetime.datetime):
+                dts[row] = value
+        errors = [error for error in errors if dts[error[0]] is None]
+        results, format_errors = tolerant_batch.format_datetime(dts, **arguments)
+        failed = {row for row, _ in errors}
+        return results, sorted(errors + [error for error in format_errors if error[0] not in failed])
+    results, errors = getattr(tolerant_batch, operation)(rows, **arguments)
+    if operation in _DATETIME_RESULTS:
+        results = [None if dt is None else dt.isoformat(sep=" ") for dt in results]
+    return results, errors
+
+
+def serve_worker(listener, max_tasks=None):
+    """
+    Answer newline-delimited JSON tasks on a listening socket until it is closed.
+
+    Each request is {"operation", "rows", "arguments"}; each response is
+    {"results", "errors"}, or {"error"} for a task that cannot be run.
+    max_tasks makes the worker exit abruptly after
+    that many tasks, which is used to simulate crashes.
+    """
+    handled = 0
+    while True:
+        try:
+            connection, _ = listener.accept()
+        except OSError:
+            return
+        with connection, connection.makefile("rwb") as stream:
+            for line in stream:
+                if max_tasks is not None and handled >= max_tasks:
+                    raise SystemExit(1)
+                try:
+                    task = json.loads(line)
+                    results, errors = execute(task["operation"], task["rows"], task.get("arguments", {}))
+                    reply = {"results": results, "errors": errors}
+                except Exception as error:
+                    # A bad task is answered, never allowed to take the worker down.
+                    reply = {"error": f"{type(error).__name__}: {error}"}
+                stream.write(json.dumps(reply).encode("utf-8") + b"\n")
+                stream.flush()
+                handled += 1
+
+
+def start_local_workers(count, max_tasks=None):
+    """
+    Launch count worker processes on 127.0.0.1 and wait until they listen.
+
+    Returns:
+    list: (process, (host, port)) pairs; terminate the processes when done
+    """
+    workers = []
+    command = [sys.executable, __file__, "worker", "--port", "0"]
+    if max_tasks is not None:
+        command += ["--max-tasks", str(max_tasks)]
+    for _ in range(count):
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+        port = int(process.stdout.readline())
+        workers.append((process, ("127.0.0.1", port)))
+    return workers
+
+
+# Coordinator side
+
+def month_key(row):
+    """Partition key grouping rows by the 'YYYY-MM' of their (first) date."""
+    value = row[0] if isinstance(row, (list, tuple)) and row else row
+    if isinstance(value, datetime.datetime):
+        return f"{value.year:04d}-{value.month:02d}"
+    return value[:7] if isinstance(value, str) else ""
+
+
+def partition(rows, key=month_key, max_rows=5000):
+    """
+    Split row indices into partitions by key, in a deterministic order.
+
+    Parameters:
+    rows (sequence): Input rows
+    key (callable): Function mapping a row to a partition key, e.g. month or site
+    max_rows (int): Largest partition; bigger groups are split
+
+    Returns:
+    list: Lists of row indices, ordered by key and then by position
+    """
+    groups = defaultdict(list)
+    for index, row in enumerate(rows):
+        groups[str(key(row))].append(index)
+    partitions = []
+    for group_key in sorted(groups):
+        indices = groups[group_key]
+        partitions.extend(indices[start:start + max_rows] for start in range(0, len(indices), max_rows))
+    return partitions
+
+
+def _wire(value):
+    # Datetimes travel tagged, so a worker can tell them from date strings
+    # and their microseconds survive the trip.
+    if isinstance(value, (list, tuple)):
+        return [_wire(item) for item in value]
+    if isinstance(value, datetime.datetime):
+        return {"datetime": value.isoformat(sep=" ")}
+    return value
+
+
+def _unwire(value):
+    if isinstance(value, list):
+        return [_unwire(item) for item in value]
+    if isinstance(value, dict) and isinstance(value.get("datetime"), str):
+        try:
+            decoded = datetime.datetime.fromisoformat(value["datetime"])
+        except ValueError:
+            return value
+        return value if decoded.tzinfo is not None else decoded
+    return value
+
+
+def _worker_loop(address, operation, arguments, rows, tasks, merged, failed, timeout):
+    try:
+        connection = socket.create_connection(address, timeout=timeout)
+    except OSError:
+        failed.append(address)
+        return
+    with connection, connection.makefile("rwb") as stream:
+        while True:
+            try:
+                indices = tasks.get_nowait()
+            except queue.Empty:
+                return
+            request = {"operation": operation, "arguments": arguments,
+                       "rows": [_wire(rows[index]) for index in indices]}
+            try:
+                stream.write(json.dumps(request).encode("utf-8") + b"\n")
+                stream.flush()
+                line = stream.readline()
+                if not line:
+                    raise OSError("worker closed the connection")
+                reply = json.loads(line)
+            except (OSError, ValueError):
+                tasks.put(indices)
+                failed.append(address)
+                return
+            merged.append((indices, reply))
+
+
+def run_distributed(rows, operation, workers, arguments=None, key=month_key, max_rows=5000, timeout=60):
+    """
+    Process rows on remote workers and merge the answers in input order.
+
+    Parameters:
+    rows (sequence): Date strings or datetimes, or (start, end) pairs for
+        calculate_date_difference
+    operation (str): One of OPERATIONS
+    workers (list): (host, port) addresses of running workers
+    arguments (dict): Extra keyword arguments for the operation
+    key (callable): Partition key function, see partition()
+    max_rows (int): Largest partition sent in one request
+    timeout (float): Seconds to wait for a worker before treating it as failed
+
+    Returns:
+    tuple: (results, errors) with errors as sorted (row, code) tuples using
+    global row indices, like the tolerant_batch functions
+
+    Raises:
+    ValueError: If operation is unknown or a worker rejects the arguments
+    WorkerError: If every worker failed before all partitions were done
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown operation: {operation!r}")
+    arguments = arguments or {}
+    tasks = queue.Queue()
+    partitions = partition(rows, key, max_rows)
+    for indices in partitions:
+        tasks.put(indices)
+    merged = []
+    failed = []
+    live = list(workers)
+    while not tasks.empty():
+        if not live:
+            raise WorkerError("All workers failed")
+        threads = [threading.Thread(target=_worker_loop,
+                                    args=(address, operation, arguments, rows, tasks, merged, failed, timeout))
+                   for address in live]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        live = [address for address in live if address not in failed]
+
+    results = [None] * len(rows)
+    errors = []
+    for indices, reply in merged:
+        if "error" in reply:
+            raise ValueError(reply["error"])
+        for index, value in zip(indices, reply["results"]):
+            if value is not None and operation in _DATETIME_RESULTS:
+                value = datetime.datetime.fromisoformat(value)
+            results[index] = value
+        errors.extend((indices[row], code) for row, code in reply["errors"])
+    return results, sorted(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed Date and Time Processor worker")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    worker = subcommands.add_parser("worker", help="run a worker on a local socket")
+    worker.add_argument("--host", default="127.0.0.1")
+    worker.add_argument("--port", type=int, default=9001)
+    worker.add_argument("--max-tasks", type=int, default=None, help="exit after this many tasks")
+    args = parser.parse_args()
+
+    listener = socket.create_server((args.host, args.port))
+    print(listener.getsockname()[1], flush=True)
+    serve_worker(listener, args.max_tasks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Durations - Parsing and applying precompiled time durations
+
+Follow-up rules are configured as text such as "2d5h30m" or ISO-8601 "P2DT5H".
+compile_duration turns such text into an immutable Duration once and keeps it
+in an interned cache, and apply_duration adds a Duration to a whole batch of
+base datetimes in one pass, with the semantics of add_time_duration.
+"""
+
+import datetime
+import re
+from array import array
+from functools import lru_cache
+
+from datetime_kernels import (
+    MAX_EPOCH,
+    MIN_EPOCH,
+    SECONDS_PER_DAY,
+    SECONDS_PER_HOUR,
+    SECONDS_PER_MINUTE,
+    epoch_to_datetime,
+    split_epoch,
+)
+from timestamps import TimestampArray
+
+_COMPACT = re.compile(r"([+-])?(?:(\d+)w\s*)?(?:(\d+)d\s*)?(?:(\d+)h\s*)?(?:(\d+)m\s*)?(?:(\d+)s)?")
+_ISO = re.compile(r"([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?=\d)(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?")
+_ISO_CALENDAR = re.compile(r"[+-]?P(?:\d+[YM])")
+
+_UNIT_SECONDS = (7 * SECONDS_PER_DAY, SECONDS_PER_DAY, SECONDS_PER_HOUR, SECONDS_PER_MINUTE, 1)
+
+
+class Duration:
+    """
+    An immutable, fixed-length duration measured in whole seconds.
+
+    Example:
+    >>> Duration.from_parts(days=2, hours=5)
+    Duration(190800)
+    >>> Duration(190800).timedelta
+    datetime.timedelta(days=2, seconds=18000)
+    """
+
+    __slots__ = ("seconds",)
+
+    def __init__(self, seconds):
+        if not isinstance(seconds, int) or isinstance(seconds, bool):
+            raise TypeError("seconds must be an integer")
+        object.__setattr__(self, "seconds", seconds)
+
+    @classmethod
+    def from_parts(cls, weeks=0, days=0, hours=0, minutes=0, seconds=0):
+        """
+        Build a Duration from integer components, as accepted by add_time_duration.
+
+        Raises:
+        TypeError: If a component is not an int
+        """
+        parts = (weeks, days, hours, minutes, seconds)
+        for value in parts:
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise TypeError("weeks, days, hours, minutes and seconds must be integers")
+        return cls(sum(value * unit for value, unit in zip(parts, _UNIT_SECONDS)))
+
+    @property
+    def timedelta(self):
+        """The duration as a datetime.timedelta."""
+        return datetime.timedelta(seconds=self.seconds)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Duration is immutable")
+
+    def __reduce__(self):
+        return Duration, (self.seconds,)
+
+    def __eq__(self, other):
+        return isinstance(other, Duration) and other.seconds == self.seconds
+
+    def __hash__(self):
+        return hash(self.seconds)
+
+    def __repr__(self):
+        return f"Duration({self.seconds})"
+
+
+@lru_cache(maxsize=4096)
+def compile_duration(text):
+    """
+    Parse a duration expression into an interned Duration.
+
+    Supported forms are compact expressions built from w, d, h, m and s
+    units in that order ("2d5h30m", "1w 2d", "-90m"), optionally with
+    whitespace between the unit groups, and ISO-8601 durations
+    without year or month parts ("P2DT5H", "PT30M", "P1W"). Repeated calls
+    with the same text return the same object.
+
+    Parameters:
+    text (str): Duration expression
+
+    Returns:
+    Duration: The compiled duration
+
+    Raises:
+    TypeError: If text is not a string
+    ValueError: If text is not a supported duration expression
+
+    Example:
+    >>> compile_duration("2d5h30m") is compile_duration("2d5h30m")
+    True
+    >>> compile_duration("P2DT5H") == compile_duration("2d5h")
+    True
+    """
+    if not isinstance(text, str):
+        raise TypeError("Duration expression must be a string")
+    stripped = text.strip()
+    match = _COMPACT.fullmatch(stripped) or _ISO.fullmatch(stripped)
+    if match is None or not any(match.groups()[1:]):
+        if _ISO_CALENDAR.match(stripped):
+            raise ValueError(f"Months and years have no fixed length: {text!r}")
+        raise ValueError(f"Invalid duration expression: {text!r}")
+    sign, *values = match.groups()
+    seconds = sum(int(value) * unit for value, unit in zip(values, _UNIT_SECONDS) if value)
+    return Duration(-seconds if sign == "-" else seconds)
+
+
+def as_duration(duration):
+    """
+    Coerce a Duration, duration expression or timedelta to a Duration.
+
+    Raises:
+    ValueError: If a timedelta is not a whole number of seconds
+    """
+    if isinstance(duration, Duration):
+        return duration
+    if isinstance(duration, datetime.timedelta):
+        if duration.microseconds:
+            raise ValueError(f"Durations are whole seconds, got {duration!r}")
+        return Duration(duration.days * SECONDS_PER_DAY + duration.seconds)
+    return compile_duration(duration)
+
+
+def apply_duration(values, duration):
+    """
+    Add one duration to a batch of base datetimes.
+
+    Parameters:
+    values (array, sequence or single value): An array('q') of epoch seconds,
+        a TimestampArray, or datetimes and/or date strings
+    duration (Duration, str or timedelta): Duration to add
+
+    Returns:
+    array or list or datetime: A new array('q') or TimestampArray for those
+    inputs, a list of datetimes for other sequences, or a datetime for a
+    single value
+
+    Raises:
+    TypeError: If duration or a value has an unsupported type
+    ValueError: If a date string or the duration expression is invalid, or a
+        timedelta duration is not a whole number of seconds
+    OverflowError: If a result falls outside the supported datetime range
+
+    Example:
+    >>> apply_duration(["2025-03-19", "2025-03-19 14:30:00"], "2d5h")
+    [datetime.datetime(2025, 3, 21, 5, 0), datetime.datetime(2025, 3, 21, 19, 30)]
+    """
+    duration = as_duration(duration)
+    shift = duration.seconds
+    if isinstance(values, (str, datetime.datetime)):
+        return _shifted(values, shift)
+    if isinstance(values, TimestampArray):
+        return TimestampArray.from_epochs(apply_duration(values.epochs, duration))
+    if isinstance(values, array):
+        out = array("q", values)
+        for index, seconds in enumerate(out):
+            out[index] = _checked(seconds + shift)
+        return out
+    # Plain datetimes take the direct timedelta addition, which raises
+    # OverflowError itself; everything else goes through epochs.
+    delta = duration.timedelta
+    return [value + delta if type(value) is datetime.datetime else _shifted(value, shift)
+            for value in values]
+
+
+def _shifted(value, shift):
+    seconds, microseconds = split_epoch(value)
+    return epoch_to_datetime(_checked(seconds + shift), microseconds)
+
+
+def _checked(seconds):
+    if not MIN_EPOCH <= seconds <= MAX_EPOCH:
+        raise OverflowError("Result is outside the supported datetime range")
+    return seconds
@@ -0,0 +1,190 @@
+"""
+Persistent Parse Cache - On-disk cache of parsed date strings shared across runs
+
+Nightly jobs see the same historical timestamps over and over. This cache
+stores, for every date string, the epoch seconds produced by parsing it along
+with derived fields (weekday and day number), in a local SQLite database.
+SQLite in WAL mode lets several processes read concurrently while one writes,
+and entries are evicted least-recently-used once max_entries is exceeded or
+when they are older than ttl_seconds. Recency is tracked with a resolution of
+touch_interval seconds so that warm lookups rarely need to write.
+
+Each instance counts its table once when it opens and then keeps the count
+up to date from its own inserts and deletes, so a miss costs one indexed
+DELETE ... LIMIT at most instead of a scan of the table. Inserts made by other
+processes are picked up the next time evict() is called.
+"""
+
+import sqlite3
+import time
+
+from datetime_kernels import (
+    SECONDS_PER_DAY,
+    epoch_to_datetime,
+    parse_to_epoch,
+    weekday_from_days,
+)
+
+_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parsed (
+    key TEXT PRIMARY KEY,
+    epoch INTEGER NOT NULL,
+    weekday INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS parsed_last_used ON parsed (last_used);
+"""
+
+
+def _derive(date_string):
+    epoch = parse_to_epoch(date_string)
+    day = epoch // SECONDS_PER_DAY
+    return epoch, weekday_from_days(day), day
+
+
+class PersistentParseCache:
+    """
+    SQLite-backed cache mapping date strings to (epoch, weekday, day) tuples.
+
+    weekday is 0 for Monday and day is the number of days since 1970-01-01.
+    Open one instance per process or thread; instances pointing at the same
+    path share entries.
+
+    Example:
+    >>> with PersistentParseCache(":memory:") as cache:
+    ...     cache.lookup("2025-03-19 14:30:00")
+    (1742394600, 2, 20166)
+    """
+
+    def __init__(self, path, max_entries=1000000, ttl_seconds=None, touch_interval=3600):
+        if not isinstance(max_entries, int) or max_entries < 1:
+            raise ValueError("max_entries must be a positive integer")
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.touch_interval = touch_interval
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(path, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._count = len(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the underlying database connection."""
+        self._connection.close()
+
+    def lookup(self, date_string):
+        """
+        Return (epoch, weekday, day) for date_string, parsing and storing it on a miss.
+
+        Raises:
+        TypeError: If date_string is not a string
+        ValueError: If date_string is not in a supported format
+        """
+        return self.lookup_many([date_string])[0]
+
+    def lookup_many(self, date_strings):
+        """
+        Look up a batch of date strings with one query per 500 distinct keys.
+
+        Parameters:
+        date_strings (sequence of str): Strings in 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS' format
+
+        Returns:
+        list: (epoch, weekday, day) tuples in input order
+
+        Raises:
+        TypeError: If an element is not a string
+        ValueError: If an element is not in a supported format
+        """
+        keys = list(dict.fromkeys(date_strings))
+        now = time.time()
+        found, stale, expired = self._fetch(keys, now)
+        self.hits += len(found)
+        missing = [key for key in keys if key not in found]
+        self.misses += len(missing)
+        computed = [(key,) + _derive(key) for key in missing]
+        with self._connection:
+            self._touch(stale, now)
+            if computed:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO parsed VALUES (?, ?, ?, ?, ?, ?)",
+                    [row + (now, now) for row in computed])
+                # Expired entries were replaced in place, not added.
+                self._count += len(computed) - expired
+                if self._count > self.max_entries:
+                    self._count -= self._trim(self._count - self.max_entries)
+        for row in computed:
+            found[row[0]] = row[1:]
+        return [found[value] for value in date_strings]
+
+    def to_datetime(self, date_string):
+        """Return the cached value for date_string as a datetime, like convert_string_to_datetime."""
+        return epoch_to_datetime(self.lookup(date_string)[0])
+
+    def evict(self):
+        """
+        Remove expired entries and trim the cache to max_entries.
+
+        This scans the table, counting the entries other processes added;
+        lookups only trim by their own running count.
+
+        Returns:
+        int: Number of entries removed
+        """
+        removed = 0
+        with self._connection:
+            if self.ttl_seconds is not None:
+                removed += self._connection.execute(
+                    "DELETE FROM parsed WHERE created < ?", (time.time() - self.ttl_seconds,)).rowcount
+            excess = len(self) - self.max_entries
+            if excess > 0:
+                removed += self._trim(excess)
+        self._count = len(self)
+        return removed
+
+    def _trim(self, count):
+        return self._connection.execute(
+            "DELETE FROM parsed WHERE key IN "
+            "(SELECT key FROM parsed ORDER BY last_used LIMIT ?)", (count,)).rowcount
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM parsed").fetchone()[0]
+
+    def _fetch(self, keys, now):
+        found = {}
+        stale = []
+        expired = 0
+        oldest = None if self.ttl_seconds is None else now - self.ttl_seconds
+        touch_before = now - self.touch_interval
+        for start in range(0, len(keys), _BATCH):
+            chunk = keys[start:start + _BATCH]
+            query = ("SELECT key, epoch, weekday, day, created, last_used FROM parsed WHERE key IN (%s)"
+                     % ",".join("?" * len(chunk)))
+            for key, epoch, weekday, day, created, last_used in self._connection.execute(query, chunk):
+                if oldest is None or created >= oldest:
+                    found[key] = (epoch, weekday, day)
+                    if last_used < touch_before:
+                        stale.append(key)
+                else:
+                    expired += 1
+        return found, stale, expired
+
+    def _touch(self, keys, now):
+        for start in range(0, len(keys), _BATCH):
+            chunk = keys[start:start + _BATCH]
+            self._connection.execute(
+                "UPDATE parsed SET last_used = ? WHERE key IN (%s)" % ",".join("?" * len(chunk)),
+                [now] + chunk)
@@ -0,0 +1,456 @@
+"""
+Execution Planner - Choosing the scalar, batch or parallel path per call
+
+The functions below have the names of the public functions in skeleton.py
+and accept either one value or a sequence of values. Each call is routed
+to one of three paths:
+
+    scalar    one kernel call per value; always used for a single value
+    batch     the array-backed batch functions (batch_processor, durations,
+              bulk_format) over the whole sequence
+    parallel  the batch functions over chunks in a pool of worker processes
+
+A sequence takes the batch path from thresholds[operation]["batch"] rows and
+the parallel path from thresholds[operation]["parallel"] rows (None means
+never). Every path returns the same results and raises the same exceptions.
+
+Thresholds are measured on the current machine with
+
+    python planner.py calibrate
+
+which writes them to .planner_thresholds.json next to this module (or to
+the path in the DATETIME_PLANNER_FILE environment variable); they are read
+on first use, with built-in defaults when no file exists. stats() reports
+the path chosen last and the calls, rows and seconds spent on each path.
+The parallel path uses one worker process per CPU unless set_workers()
+says otherwise.
+"""
+
+import argparse
+import atexit
+import datetime
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from batch_processor import calculate_date_differences, convert_strings_to_datetimes, convert_timezones, to_epochs
+from bulk_format import format_epochs
+from datetime_kernels import (
+    SECONDS_PER_DAY,
+    SECONDS_PER_HOUR,
+    WEEKDAY_NAMES,
+    days_from_civil,
+    difference_from_seconds,
+    epoch_to_datetime,
+    parse_to_epoch,
+    split_epoch,
+    to_epoch,
+    validate_offset,
+    weekday_from_days,
+)
+from durations import Duration, apply_duration
+from timestamps import TimestampArray
+
+PATHS = ("scalar", "batch", "parallel")
+
+DEFAULT_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Used when no calibration file exists
+DEFAULT_THRESHOLDS = {"batch": 8, "parallel": None}
+
+THRESHOLDS_FILE = os.environ.get("DATETIME_PLANNER_FILE") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".planner_thresholds.json")
+
+# strftime("%Y") does not zero-pad years before 1000, the bulk formatter does
+_YEAR_1000 = days_from_civil(1000, 1, 1) * SECONDS_PER_DAY
+
+
+# Scalar kernels
+
+def _convert_one(date_string):
+    return epoch_to_datetime(parse_to_epoch(date_string))
+
+
+def _check_datetime(dt):
+    if not isinstance(dt, datetime.datetime):
+        raise TypeError("Value must be a datetime object")
+    return dt
+
+
+def _format_one(dt, format_string):
+    return _check_datetime(dt).strftime(format_string)
+
+
+def _difference_one(start_date, end_date):
+    start, start_microseconds = split_epoch(start_date)
+    end, end_microseconds = split_epoch(end_date)
+    return difference_from_seconds(end - start, end_microseconds - start_microseconds)
+
+
+def _add_one(dt, duration):
+    return apply_duration(dt, duration)
+
+
+def _weekday_one(value):
+    return WEEKDAY_NAMES[weekday_from_days(to_epoch(value) // SECONDS_PER_DAY)]
+
+
+def _timezone_one(dt, source_offset, target_offset):
+    validate_offset(source_offset, "source_offset")
+    validate_offset(target_offset, "target_offset")
+    seconds, microseconds = split_epoch(dt)
+    return epoch_to_datetime(seconds + (target_offset - source_offset) * SECONDS_PER_HOUR, microseconds)
+
+
+# Batch kernels
+
+def _format_batch(dts, format_string):
+    if isinstance(format_string, str) and format_string == DEFAULT_FORMAT:
+        if isinstance(dts, TimestampArray):
+            epochs = dts.epochs
+        else:
+            epochs = to_epochs([_check_datetime(dt) for dt in dts])
+        if not epochs or min(epochs) >= _YEAR_1000:
+            return format_epochs(epochs).decode("ascii").split("\n")[:-1]
+    if isinstance(dts, TimestampArray):
+        return [dt.strftime(format_string) for dt in dts]
+    return [_format_one(dt, format_string) for dt in dts]
+
+
+def _add_batch(dts, duration):
+    if isinstance(dts, TimestampArray):
+        return list(apply_duration(dts, duration))
+    return apply_duration(list(dts), duration)
+
+
+def _weekday_batch(values):
+    return [WEEKDAY_NAMES[weekday_from_days(seconds // SECONDS_PER_DAY)] for seconds in to_epochs(values)]
+
+
+# operation -> (scalar kernel, batch kernel); every path returns a list for sequence input
+OPERATIONS = {
+    "convert_string_to_datetime": (_convert_one, convert_strings_to_datetimes),
+    "format_datetime": (_format_one, _format_batch),
+    "calculate_date_difference": (_difference_one, calculate_date_differences),
+    "add_time_duration": (_add_one, _add_batch),
+    "get_day_of_week": (_weekday_one, _weekday_batch),
+    "convert_timezone": (_timezone_one, convert_timezones),
+}
+
+_state = {"thresholds": None, "pool": None, "workers": os.cpu_count() or 1}
+_stats_lock = threading.Lock()
+_stats = {}
+_last = {}
+
+
+def load_thresholds(path=None):
+    """
+    Read calibrated thresholds, falling back to DEFAULT_THRESHOLDS.
+
+    Returns:
+    dict: operation -> {"batch": int, "parallel": int or None}
+    """
+    thresholds = {operation: dict(DEFAULT_THRESHOLDS) for operation in OPERATIONS}
+    try:
+        with open(path or THRESHOLDS_FILE) as source:
+            stored = json.load(source)
+    except (OSError, ValueError):
+        stored = {}
+    for operation, values in stored.get("thresholds", {}).items():
+        if operation in thresholds:
+            thresholds[operation].update(values)
+    _state["thresholds"] = thresholds
+    return thresholds
+
+
+def choose_path(operation, count):
+    """Return the path a sequence of count rows takes for operation."""
+    thresholds = (_state["thresholds"] or load_thresholds())[operation]
+    if thresholds["parallel"] is not None and count >= thresholds["parallel"]:
+        return "parallel"
+    if count >= thresholds["batch"]:
+        return "batch"
+    return "scalar"
+
+
+def _record(operation, path, rows, elapsed):
+    with _stats_lock:
+        entry = _stats.setdefault(operation, {}).setdefault(path, {"calls": 0, "rows": 0, "seconds": 0.0})
+        entry["calls"] += 1
+        entry["rows"] += rows
+        entry["seconds"] += elapsed
+
+
+def stats():
+    """
+    Report the planner's decisions.
+
+    Returns:
+    dict: {"last": operation -> path chosen by the latest call, even if it raised,
+    "paths": operation -> path -> {"calls", "rows", "seconds"},
+    "thresholds": the thresholds in use}
+    """
+    with _stats_lock:
+        return {"last": dict(_last),
+                "paths": {operation: {path: dict(entry) for path, entry in paths.items()}
+                          for operation, paths in _stats.items()},
+                "thresholds": {operation: dict(values)
+                               for operation, values in (_state["thresholds"] or load_thresholds()).items()}}
+
+
+def reset_stats():
+    """Forget all recorded calls."""
+    with _stats_lock:
+        _stats.clear()
+        _last.clear()
+
+
+def _pool():
+    if _state["pool"] is None:
+        _state["pool"] = ProcessPoolExecutor(max_workers=_state["workers"])
+    return _state["pool"]
+
+
+def shutdown():
+    """Stop the worker processes of the parallel path, if any were started."""
+    pool, _state["pool"] = _state["pool"], None
+    if pool is not None:
+        pool.shutdown()
+
+
+atexit.register(shutdown)
+
+
+def set_workers(count=None):
+    """
+    Set how many worker processes the parallel path uses.
+
+    A running pool is shut down, so the next parallel call starts count
+    workers.
+
+    Parameters:
+    count (int): Number of worker processes, or None for one per CPU
+
+    Raises:
+    ValueError: If count is not a positive integer
+    """
+    if count is None:
+        count = os.cpu_count() or 1
+    if not isinstance(count, int) or isinstance(count, bool) or count < 1:
+        raise ValueError("count must be a positive integer")
+    shutdown()
+    _state["workers"] = count
+
+
+def _run_chunk(operation, columns, arguments):
+    return OPERATIONS[operation][1](*columns, *arguments)
+
+
+def _run(operation, columns, arguments, path):
+    scalar, batch = OPERATIONS[operation]
+    if path == "scalar":
+        return [scalar(*row, *arguments) for row in zip(*columns)]
+    if path == "batch":
+        return batch(*columns, *arguments)
+    count = len(columns[0])
+    chunk = -(-count // (_state["workers"] * 4))
+    futures = [_pool().submit(_run_chunk, operation,
+                              [column[start:start + chunk] for column in columns], arguments)
+               for start in range(0, count, chunk)]
+    results = []
+    try:
+        for future in futures:
+            results.extend(future.result())
+    except BrokenProcessPool:
+        shutdown()
+        raise
+    return results
+
+
+def _dispatch(operation, values, arguments):
+    start = time.perf_counter()
+    if isinstance(values[0], (str, datetime.datetime)) or not hasattr(values[0], "__iter__"):
+        _last[operation] = "scalar"
+        result = OPERATIONS[operation][0](*values, *arguments)
+        _record(operation, "scalar", 1, time.perf_counter() - start)
+        return result
+    columns = [value if hasattr(value, "__len__") else list(value) for value in values]
+    rows = len(columns[0])
+    if any(len(column) != rows for column in columns):
+        raise ValueError("start_dates and end_dates must have the same length")
+    path = _last[operation] = choose_path(operation, rows)
+    result = _run(operation, columns, arguments, path)
+    _record(operation, path, rows, time.perf_counter() - start)
+    return result
+
+
+def convert_string_to_datetime(date_string):
+    """
+    Convert one date string, or a sequence of them, to datetimes.
+
+    Example:
+    >>> convert_string_to_datetime("2025-03-19 14:30:00")
+    datetime.datetime(2025, 3, 19, 14, 30)
+    >>> convert_string_to_datetime(["2025-03-19"])
+    [datetime.datetime(2025, 3, 19, 0, 0)]
+    """
+    return _dispatch("convert_string_to_datetime", (date_string,), ())
+
+
+def format_datetime(dt, format_string=DEFAULT_FORMAT):
+    """
+    Format one datetime, or a sequence of them, as strings.
+
+    Example:
+    >>> format_datetime(datetime.datetime(2025, 3, 19, 14, 30), "%d %B %Y")
+    '19 March 2025'
+    """
+    return _dispatch("format_datetime", (dt,), (format_string,))
+
+
+def calculate_date_difference(start_date, end_date):
+    """
+    Calculate the difference between two dates, or pairwise between two sequences.
+
+    Example:
+    >>> calculate_date_difference("2025-03-19 14:30:00", "2025-04-02 09:00:00")
+    {'days': 13, 'hours': 330, 'minutes': 19830, 'total_seconds': 1189800}
+    """
+    return _dispatch("calculate_date_difference", (start_date, end_date), ())
+
+
+def add_time_duration(dt, days=0, hours=0, minutes=0):
+    """
+    Add days, hours and minutes to one datetime, or to each of a sequence.
+
+    Example:
+    >>> add_time_duration("2025-03-19 14:30:00", days=7, hours=2)
+    datetime.datetime(2025, 3, 26, 16, 30)
+    """
+    return _dispatch("add_time_duration", (dt,), (Duration.from_parts(days=days, hours=hours, minutes=minutes),))
+
+
+def get_day_of_week(date_string):
+    """
+    Get the weekday name of one date, or of each of a sequence.
+
+    Example:
+    >>> get_day_of_week(["2025-03-19", "2025-03-22"])
+    ['Wednesday', 'Saturday']
+    """
+    return _dispatch("get_day_of_week", (date_string,), ())
+
+
+def convert_timezone(dt, source_offset, target_offset):
+    """
+    Convert one datetime, or each of a sequence, between timezone offsets.
+
+    Example:
+    >>> convert_timezone("2025-03-19 14:30:00", -5, -8)
+    datetime.datetime(2025, 3, 19, 11, 30)
+    """
+    return _dispatch("convert_timezone", (dt,), (source_offset, target_offset))
+
+
+# Calibration
+
+def _sample_arguments(operation, count, rng):
+    strings = [f"{rng.randrange(1990, 2040)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d} "
+               f"{rng.randrange(24):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}" for _ in range(count)]
+    if operation == "convert_string_to_datetime":
+        return [strings], ()
+    dts = convert_strings_to_datetimes(strings)
+    if operation == "calculate_date_difference":
+        return [dts, dts[::-1]], ()
+    if operation == "format_datetime":
+        return [dts], (DEFAULT_FORMAT,)
+    if operation == "add_time_duration":
+        return [dts], (Duration.from_parts(days=1, hours=2),)
+    if operation == "convert_timezone":
+        return [dts], (-5, 3)
+    return [dts], ()
+
+
+def _time_path(operation, columns, arguments, path, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _run(operation, columns, arguments, path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def calibrate(path=None, max_rows=1000000, seed=0, report=None):
+    """
+    Measure the crossover points of the three paths and store them.
+
+    The batch threshold is the smallest size from 1 to 256 at which the
+    batch path is no slower than the scalar path. The parallel threshold is
+    the smallest size from 16384 to max_rows at which the parallel path beats
+    the batch path, or None when it never does (always on a single CPU).
+
+    Parameters:
+    path (str): File to write, THRESHOLDS_FILE by default
+    max_rows (int): Largest input size tried for the parallel path
+    seed (int): Seed for the generated sample inputs
+    report (file): Where to print measurements, or None
+
+    Returns:
+    dict: operation -> {"batch": int, "parallel": int or None}
+    """
+    rng = random.Random(seed)
+    thresholds = {}
+    for operation in OPERATIONS:
+        batch_min = 257
+        for count in (1, 2, 4, 8, 16, 32, 64, 128, 256):
+            columns, arguments = _sample_arguments(operation, count, rng)
+            scalar_time = _time_path(operation, columns, arguments, "scalar", 200)
+            batch_time = _time_path(operation, columns, arguments, "batch", 200)
+            if batch_time <= scalar_time:
+                batch_min = count
+                break
+        parallel_min = None
+        count = 16384
+        while _state["workers"] > 1 and count <= max_rows:
+            columns, arguments = _sample_arguments(operation, count, rng)
+            batch_time = _time_path(operation, columns, arguments, "batch", 3)
+            parallel_time = _time_path(operation, columns, arguments, "parallel", 3)
+            if parallel_time < batch_time:
+                parallel_min = count
+                break
+            count *= 4
+        thresholds[operation] = {"batch": batch_min, "parallel": parallel_min}
+        if report is not None:
+            parallel = "never" if parallel_min is None else f"from {parallel_min} rows"
+            print(f"{operation:<28} batch from {batch_min:>4} rows, parallel {parallel}", file=report)
+    shutdown()
+    with open(path or THRESHOLDS_FILE, "w") as out:
+        json.dump({"cpus": _state["workers"], "python": sys.version.split()[0], "thresholds": thresholds},
+                  out, indent=2)
+    _state["thresholds"] = None
+    load_thresholds(path)
+    return thresholds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Date and Time Processor execution planner")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    calibration = subcommands.add_parser("calibrate", help="measure and store the path thresholds")
+    calibration.add_argument("--output", default=None, help=f"thresholds file (default {THRESHOLDS_FILE})")
+    calibration.add_argument("--max-rows", type=int, default=1000000)
+    subcommands.add_parser("show", help="print the thresholds in use")
+    args = parser.parse_args()
+
+    if args.command == "calibrate":
+        calibrate(args.output, args.max_rows, report=sys.stdout)
+    else:
+        print(json.dumps(load_thresholds(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Query Server - Long-lived asyncio server exposing the processor over a socket
+
+Clients send newline-delimited JSON requests over TCP or a UNIX socket and get
+one JSON line back per request, in request order, so a client may pipeline as
+many requests as it likes on one connection:
+
+    {"id": 1, "op": "convert_timezone", "value": "2025-03-19 14:30:00",
+     "arguments": {"source_offset": -5, "target_offset": -8}}
+    {"id": 2, "op": "get_day_of_week", "values": ["2025-03-19", "2025-03-20"]}
+    {"id": 3, "op": "stats"}
+
+"value" runs one row and "values" a batch; calculate_date_difference rows are
+[start, end] pairs. Replies look like {"id": 1, "result": ..., "errors": [...]}
+with errors as [row, code] pairs using the tolerant_batch codes, or
+{"id": 1, "error": "message"} for a malformed request.
+
+Single-row requests that arrive during the same event-loop turn (from any
+connection) with the same operation and arguments are coalesced into one
+batch call. "values" batches run in a worker thread, so a large batch does
+not hold up the single-row requests behind it. Every operation records its
+latency in a log2 histogram, which the "stats" operation reports together
+with p50 and p99; error replies are recorded under "<operation>[error]".
+
+    python query_server.py serve --port 9100
+    python query_server.py load --port 9100 --clients 10 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from distributed import OPERATIONS, execute
+
+_BUCKETS = 32
+
+
+class LatencyHistogram:
+    """Log2-bucketed latency histogram in microseconds."""
+
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+        self.total = 0
+
+    def record(self, seconds):
+        micros = max(int(seconds * 1e6), 1)
+        self.counts[min(micros.bit_length() - 1, _BUCKETS - 1)] += 1
+        self.total += 1
+
+    def percentile(self, fraction):
+        """Return the upper bound, in microseconds, of the bucket holding the given fraction."""
+        threshold = fraction * self.total
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= threshold:
+                return 2 ** (bucket + 1)
+        return 0
+
+    def summary(self):
+        return {"count": self.total, "p50_us": self.percentile(0.5), "p99_us": self.percentile(0.99),
+                "buckets": {str(2 ** (bucket + 1)): count for bucket, count in enumerate(self.counts) if count}}
+
+
+class QueryServer:
+    """
+    The request handler; start it with serve_tcp() or serve_unix().
+
+    max_batch bounds the size of a coalesced batch.
+    """
+
+    def __init__(self, max_batch=1024):
+        self.max_batch = max_batch
+        self.histograms = defaultdict(LatencyHistogram)
+        self._pending = {}
+        self._batches = set()
+
+    async def serve_tcp(self, host="127.0.0.1", port=9100):
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def serve_unix(self, path):
+        return await asyncio.start_unix_server(self.handle_connection, path)
+
+    async def handle_connection(self, reader, writer):
+        replies = asyncio.Queue()
+        sender = asyncio.ensure_future(self._send_replies(replies, writer))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                replies.put_nowait(self._dispatch(line, time.perf_counter()))
+        finally:
+            replies.put_nowait(None)
+            await sender
+
+    async def _send_replies(self, replies, writer):
+        # Replies are written in request order even when later requests finish first.
+        try:
+            while True:
+                reply = await replies.get()
+                if reply is None:
+                    break
+                message = await reply
+                if callable(message):
+                    # A stats reply, built now so it counts every earlier request on the connection.
+                    message = message()
+                writer.write(json.dumps(message).encode("utf-8") + b"\n")
+                if replies.empty():
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _dispatch(self, line, received):
+        future = asyncio.get_running_loop().create_future()
+        request = None
+        operation = None
+        try:
+            request = json.loads(line)
+            operation = request.get("op")
+            if operation == "stats":
+                request_id = request.get("id")
+                future.set_result(lambda: {"id": request_id, "result": self.stats()})
+            elif operation not in OPERATIONS:
+                raise ValueError(f"Unknown operation: {operation!r}")
+            elif "values" in request:
+                task = asyncio.ensure_future(self._run_batch(operation, request, received, future))
+                # The loop only holds weak references to tasks.
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+            else:
+                self._enqueue(operation, request, received, future)
+        except Exception as error:
+            # Every request gets a reply, or later pipelined replies would stall behind it.
+            if not future.done():
+                self._fail(future, request.get("id") if isinstance(request, dict) else None,
+                           operation, error, received)
+        return future
+
+    def _fail(self, future, request_id, operation, error, received):
+        future.set_result({"id": request_id, "error": str(error)})
+        name = operation if operation in OPERATIONS else "invalid"
+        self.histograms[name + "[error]"].record(time.perf_counter() - received)
+
+    async def _run_batch(self, operation, request, received, future):
+        try:
+            results, errors = await asyncio.get_running_loop().run_in_executor(
+                None, execute, operation, request["values"], request.get("arguments", {}))
+        except Exception as error:
+            self._fail(future, request.get("id"), operation, error, received)
+            return
+        future.set_result({"id": request.get("id"), "result": results, "errors": errors})
+        self.histograms[operation + "[batch]"].record(time.perf_counter() - received)
+
+    def _enqueue(self, operation, request, received, future):
+        arguments = request.get("arguments", {})
+        value = request["value"]
+        # Reject a bad row here, so it cannot fail the batch it would be coalesced into.
+        if not isinstance(arguments, dict):
+            raise TypeError("arguments must be an object")
+        if operation == "calculate_date_difference" and not (isinstance(value, list) and len(value) == 2):
+            raise ValueError("value must be a [start, end] pair")
+        key = (operation, json.dumps(arguments, sort_keys=True))
+        group = self._pending.get(key)
+        if group is None:
+            group = self._pending[key] = []
+            asyncio.get_running_loop().call_soon(self._flush, key)
+        group.append((request.get("id"), value, received, future))
+        if len(group) >= self.max_batch:
+            self._flush(key)
+
+    def _flush(self, key):
+        group = self._pending.pop(key, None)
+        if not group:
+            return
+        operation, arguments = key
+        self._run(operation, json.loads(arguments), group)
+
+    def _run(self, operation, arguments, group):
+        try:
+            results, errors = execute(operation, [value for _, value, _, _ in group], arguments)
+        except Exception as error:
+            if len(group) == 1:
+                request_id, _, received, future = group[0]
+                self._fail(future, request_id, operation, error, received)
+                return
+            # Something still failed the batch as a whole: run every row on
+            # its own so only the culprit gets the error.
+            for member in group:
+                self._run(operation, arguments, [member])
+            return
+        codes = dict(errors)
+        histogram = self.histograms[operation]
+        now = time.perf_counter()
+        for row, (request_id, _, received, future) in enumerate(group):
+            future.set_result({"id": request_id, "result": results[row],
+                               "errors": [[0, codes[row]]] if row in codes else []})
+            histogram.record(now - received)
+
+    def stats(self):
+        """Return the latency summary for every operation seen so far."""
+        return {operation: histogram.summary() for operation, histogram in sorted(self.histograms.items())}
+
+
+def start_local_server(max_batch=1024):
+    """
+    Launch a server process on 127.0.0.1 and wait until it listens.
+
+    Returns:
+    tuple: (process, (host, port)); terminate the process when done
+    """
+    command = [sys.executable, __file__, "serve", "--port", "0", "--max-batch", str(max_batch)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    return process, ("127.0.0.1", int(process.stdout.readline()))
+
+
+async def _client(host, port, requests, latencies, pipeline):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for start in range(0, len(requests), pipeline):
+            chunk = requests[start:start + pipeline]
+            sent = time.perf_counter()
+            writer.write(b"".join(json.dumps(request).encode("utf-8") + b"\n" for request in chunk))
+            await writer.drain()
+            for _ in chunk:
+                await reader.readline()
+                latencies.append(time.perf_counter() - sent)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, clients, requests_per_client, pipeline=1, seed=0):
+    """
+    Drive a running server with concurrent clients sending single-row requests.
+
+    Returns:
+    dict: requests, seconds, throughput and p50/p99 latency in microseconds
+    """
+    rng = random.Random(seed)
+    operations = [("convert_timezone", {"source_offset": -5, "target_offset": -8}),
+                  ("get_day_of_week", {}), ("add_time_duration", {"days": 2, "hours": 5})]
+    plans = []
+    for client in range(clients):
+        plan = []
+        for number in range(requests_per_client):
+            operation, arguments = rng.choice(operations)
+            plan.append({"id": number, "op": operation, "arguments": arguments,
+                         "value": f"2025-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d} 14:30:00"})
+        plans.append(plan)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, plan, latencies, pipeline) for plan in plans))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {"requests": len(latencies), "seconds": elapsed, "throughput": len(latencies) / elapsed,
+            "p50_us": latencies[len(latencies) // 2] * 1e6,
+            "p99_us": latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)] * 1e6}
+
+
+async def _serve(args):
+    server = QueryServer(max_batch=args.max_batch)
+    if args.unix:
+        listener = await server.serve_unix(args.unix)
+    else:
+        listener = await server.serve_tcp(args.host, args.port)
+    print(args.unix or listener.sockets[0].getsockname()[1], flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Date and Time Processor query server")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    serve = subcommands.add_parser("serve", help="run the server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=9100)
+    serve.add_argument("--unix", help="listen on a UNIX socket path instead of TCP")
+    serve.add_argument("--max-batch", type=int, default=1024)
+    load = subcommands.add_parser("load", help="run the load generator against a server")
+    load.add_argument("--host", default="127.0.0.1")
+    load.add_argument("--port", type=int, default=9100)
+    load.add_argument("--clients", type=int, default=10)
+    load.add_argument("--requests", type=int, default=1000, help="requests per client")
+    load.add_argument("--pipeline", type=int, default=1, help="requests in flight per client")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        try:
+            asyncio.run(_serve(args))
+        except KeyboardInterrupt:
+            pass
+    else:
+        report = asyncio.run(run_load(args.host, args.port, args.clients, args.requests, args.pipeline))
+        print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
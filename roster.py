@@ -0,0 +1,154 @@
+"""
+Shift Roster Planner - Rest-period, overlap and weekly-hours checks for staff shifts
+
+Shifts are stored as (worker, start, end) tuples in epoch seconds. Checking a
+roster sorts all shifts by (worker, start) once and then walks them in a single
+sweep, so a roster of n shifts is checked in O(n log n) instead of comparing
+every pair of a worker's shifts with calculate_date_difference.
+"""
+
+import random
+
+from datetime_kernels import (
+    SECONDS_PER_DAY,
+    SECONDS_PER_HOUR,
+    SECONDS_PER_MINUTE,
+    whole_epoch,
+)
+
+OVERLAP = "overlap"
+REST_PERIOD = "rest_period"
+WEEKLY_HOURS = "weekly_hours"
+
+_WEEK = 7 * SECONDS_PER_DAY
+
+
+def make_shift(worker, start, days=0, hours=0, minutes=0):
+    """
+    Build a shift from a start time and a duration.
+
+    The duration follows add_time_duration semantics: the end of the shift is
+    start + days + hours + minutes.
+
+    Parameters:
+    worker (hashable): Worker identifier
+    start (datetime or str): Shift start
+    days (int): Number of days the shift lasts
+    hours (int): Number of hours the shift lasts
+    minutes (int): Number of minutes the shift lasts
+
+    Returns:
+    tuple: (worker, start_epoch, end_epoch)
+
+    Raises:
+    TypeError: If a duration component is not an int
+    ValueError: If the total duration is negative or start has microseconds
+
+    Example:
+    >>> make_shift("nurse-1", "2025-03-19 08:00:00", hours=12)
+    ('nurse-1', 1742371200, 1742414400)
+    """
+    for value in (days, hours, minutes):
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise TypeError("days, hours and minutes must be integers")
+    length = days * SECONDS_PER_DAY + hours * SECONDS_PER_HOUR + minutes * SECONDS_PER_MINUTE
+    if length < 0:
+        raise ValueError("Shift duration cannot be negative")
+    begin = whole_epoch(start)
+    return (worker, begin, begin + length)
+
+
+def find_violations(shifts, min_rest_hours=11, max_weekly_hours=48):
+    """
+    Find overlap, rest-period and weekly-hours violations in a roster.
+
+    Consecutive shifts of the same worker overlap when the later one starts
+    before the earlier one ends, and break the rest rule when the gap between
+    them is shorter than min_rest_hours. The weekly limit is checked over a
+    rolling window: a shift is flagged when the hours of the worker's shifts
+    starting in the 7 days up to and including its own start exceed
+    max_weekly_hours.
+
+    Parameters:
+    shifts (sequence of tuple): Shifts as returned by make_shift, in any order
+    min_rest_hours (int or float): Minimum rest between consecutive shifts
+    max_weekly_hours (int or float): Maximum hours in any rolling 7-day window
+
+    Returns:
+    list: One dict per violation with keys type, worker, shift (index into
+    shifts) and previous (index of the conflicting earlier shift, or None
+    for weekly-hours violations), ordered by worker and start time
+
+    Example:
+    >>> roster = [make_shift("a", "2025-03-19 08:00:00", hours=12),
+    ...           make_shift("a", "2025-03-20 02:00:00", hours=8)]
+    >>> [v["type"] for v in find_violations(roster)]
+    ['rest_period']
+    """
+    min_rest = min_rest_hours * SECONDS_PER_HOUR
+    max_weekly = max_weekly_hours * SECONDS_PER_HOUR
+    order = sorted(range(len(shifts)), key=lambda i: (shifts[i][0], shifts[i][1]))
+    violations = []
+    current = None
+    latest = None
+    window_start = 0
+    window_total = 0
+    for position, index in enumerate(order):
+        worker, start, end = shifts[index]
+        if position == 0 or worker != current:
+            current = worker
+            latest = None
+            window_start = position
+            window_total = 0
+        else:
+            gap = start - shifts[latest][2]
+            if gap < 0:
+                violations.append({"type": OVERLAP, "worker": worker, "shift": index, "previous": latest})
+            elif gap < min_rest:
+                violations.append({"type": REST_PERIOD, "worker": worker, "shift": index, "previous": latest})
+        window_total += end - start
+        while shifts[order[window_start]][1] <= start - _WEEK:
+            window_total -= shifts[order[window_start]][2] - shifts[order[window_start]][1]
+            window_start += 1
+        if window_total > max_weekly:
+            violations.append({"type": WEEKLY_HOURS, "worker": worker, "shift": index, "previous": None})
+        if latest is None or end > shifts[latest][2]:
+            latest = index
+    return violations
+
+
+def generate_roster(workers, days, shifts_per_week=5, swap_rate=10, seed=0, start="2025-01-06"):
+    """
+    Generate a reproducible synthetic roster.
+
+    Each worker gets roughly shifts_per_week shifts per week of 8 or 12 hours
+    at a usual start time of 06:00, 08:00, 14:00 or 22:00. One shift in
+    swap_rate starts at a different time, which produces a mix of compliant
+    schedules and rest-period, overlap or weekly-hours violations.
+
+    Parameters:
+    workers (int): Number of workers
+    days (int): Number of days to cover
+    shifts_per_week (int): Average shifts per worker per week
+    swap_rate (int): One in swap_rate shifts starts at an unusual time
+    seed (int): Random seed
+    start (datetime or str): First day of the roster
+
+    Returns:
+    list: Shift tuples as returned by make_shift
+    """
+    rng = random.Random(seed)
+    first = whole_epoch(start)
+    probability = shifts_per_week / 7
+    start_hours = (6, 8, 14, 22)
+    lengths = (8 * SECONDS_PER_HOUR, 12 * SECONDS_PER_HOUR)
+    shifts = []
+    for worker in range(workers):
+        usual_hour = rng.choice(start_hours)
+        length = rng.choice(lengths)
+        for day in range(days):
+            if rng.random() < probability:
+                hour = rng.choice(start_hours) if rng.randrange(swap_rate) == 0 else usual_hour
+                begin = first + day * SECONDS_PER_DAY + hour * SECONDS_PER_HOUR
+                shifts.append((worker, begin, begin + length))
+    return shifts
@@ -0,0 +1,174 @@
+"""
+Slot Availability Engine - Finding free appointment slots in clinician calendars
+
+Each clinician has daily working hours, working weekdays and a timezone offset
+(in hours, as used by convert_timezone). Busy intervals are kept as two sorted
+lists of merged, non-overlapping [start, end) ranges in the clinician's local
+epoch seconds, so a query only bisects once and then walks forward through the
+few bookings that fall inside the searched days.
+"""
+
+from bisect import bisect_left, bisect_right
+
+from datetime_kernels import (
+    SECONDS_PER_DAY,
+    SECONDS_PER_HOUR,
+    SECONDS_PER_MINUTE,
+    epoch_to_datetime,
+    split_epoch,
+    to_epoch,
+    validate_offset,
+    weekday_from_days,
+)
+
+
+class _Calendar:
+    __slots__ = ("work_start", "work_end", "working_days", "offset", "starts", "ends")
+
+    def __init__(self, work_start, work_end, working_days, offset):
+        self.work_start = work_start
+        self.work_end = work_end
+        self.working_days = working_days
+        self.offset = offset
+        self.starts = []
+        self.ends = []
+
+
+class SlotEngine:
+    """
+    Index of clinician calendars answering "first N free slots of length D after T".
+
+    Slot starts are aligned to granularity_minutes from local midnight and
+    slots returned by one query never overlap each other.
+
+    Example:
+    >>> engine = SlotEngine()
+    >>> engine.add_clinician("dr-lee", working_hours=(9, 17), offset=-5)
+    >>> engine.add_busy("dr-lee", "2025-03-19 09:00:00", "2025-03-19 10:20:00")
+    >>> engine.find_slots("dr-lee", "2025-03-19 08:00:00", 30, count=2)
+    [datetime.datetime(2025, 3, 19, 10, 30), datetime.datetime(2025, 3, 19, 11, 0)]
+    """
+
+    def __init__(self, granularity_minutes=15, horizon_days=62):
+        if not isinstance(granularity_minutes, int) or granularity_minutes < 1 or 1440 % granularity_minutes:
+            raise ValueError("granularity_minutes must be a positive divisor of 1440")
+        self.granularity = granularity_minutes * SECONDS_PER_MINUTE
+        self.horizon_days = horizon_days
+        self._calendars = {}
+
+    def __len__(self):
+        return len(self._calendars)
+
+    def __contains__(self, clinician):
+        return clinician in self._calendars
+
+    def add_clinician(self, clinician, working_hours=(9, 17), working_days=(0, 1, 2, 3, 4), offset=0):
+        """
+        Register a clinician.
+
+        Parameters:
+        clinician (hashable): Clinician identifier
+        working_hours (tuple): (start_hour, end_hour) in local time, 0 <= start < end <= 24
+        working_days (iterable of int): Working weekdays, Monday=0
+        offset (int): Clinician timezone offset in hours (-12 to +14)
+
+        Raises:
+        ValueError: If the clinician already exists or working_hours is invalid
+        """
+        validate_offset(offset)
+        start_hour, end_hour = working_hours
+        if not 0 <= start_hour < end_hour <= 24:
+            raise ValueError("working_hours must satisfy 0 <= start < end <= 24")
+        if clinician in self._calendars:
+            raise ValueError(f"Clinician {clinician!r} already exists")
+        self._calendars[clinician] = _Calendar(
+            start_hour * SECONDS_PER_HOUR, end_hour * SECONDS_PER_HOUR, frozenset(working_days), offset)
+
+    def add_busy(self, clinician, start, end):
+        """
+        Mark [start, end) as busy in the clinician's local time, merging with existing bookings.
+
+        Raises:
+        KeyError: If the clinician is unknown
+        ValueError: If end is not after start
+        """
+        calendar = self._calendars[clinician]
+        begin = to_epoch(start)
+        finish = _ceil_epoch(end)
+        if finish <= begin:
+            raise ValueError("end must be after start")
+        starts, ends = calendar.starts, calendar.ends
+        # Every interval touching [begin, finish] is merged into one.
+        low = bisect_left(ends, begin)
+        high = bisect_right(starts, finish)
+        if low < high:
+            begin = min(begin, starts[low])
+            finish = max(finish, ends[high - 1])
+        starts[low:high] = [begin]
+        ends[low:high] = [finish]
+
+    def busy_intervals(self, clinician):
+        """Return the clinician's merged busy intervals as (start, end) datetime pairs."""
+        calendar = self._calendars[clinician]
+        return [(epoch_to_datetime(start), epoch_to_datetime(end))
+                for start, end in zip(calendar.starts, calendar.ends)]
+
+    def find_slots(self, clinician, after, duration_minutes, count=1, offset=None):
+        """
+        Find the first free slots of a given length starting at or after a time.
+
+        Parameters:
+        clinician (hashable): Clinician identifier
+        after (datetime or str): Earliest slot start
+        duration_minutes (int): Slot length in minutes
+        count (int): Maximum number of slots to return
+        offset (int or None): Timezone offset of after and of the returned
+            datetimes; None means the clinician's own offset
+
+        Returns:
+        list: Slot start datetimes, at most count of them, within horizon_days
+
+        Raises:
+        KeyError: If the clinician is unknown
+        ValueError: If duration_minutes or count is not positive
+        """
+        if not isinstance(duration_minutes, int) or duration_minutes < 1:
+            raise ValueError("duration_minutes must be a positive integer")
+        if not isinstance(count, int) or isinstance(count, bool) or count < 1:
+            raise ValueError("count must be a positive integer")
+        calendar = self._calendars[clinician]
+        shift = 0
+        if offset is not None:
+            validate_offset(offset)
+            shift = (calendar.offset - offset) * SECONDS_PER_HOUR
+        duration = duration_minutes * SECONDS_PER_MINUTE
+        granularity = self.granularity
+        starts, ends = calendar.starts, calendar.ends
+        cursor = -(-(_ceil_epoch(after) + shift) // granularity) * granularity
+        index = bisect_right(ends, cursor)
+        first_day = cursor // SECONDS_PER_DAY
+        slots = []
+        for day in range(first_day, first_day + self.horizon_days):
+            if weekday_from_days(day) not in calendar.working_days:
+                continue
+            midnight = day * SECONDS_PER_DAY
+            close = midnight + calendar.work_end
+            cursor = max(cursor, midnight + calendar.work_start)
+            cursor = -(-cursor // granularity) * granularity
+            while cursor + duration <= close:
+                while index < len(ends) and ends[index] <= cursor:
+                    index += 1
+                if index < len(starts) and starts[index] < cursor + duration:
+                    cursor = -(-ends[index] // granularity) * granularity
+                    continue
+                slots.append(epoch_to_datetime(cursor - shift))
+                if len(slots) == count:
+                    return slots
+                cursor = -(-(cursor + duration) // granularity) * granularity
+        return slots
+
+
+def _ceil_epoch(value):
+    # Round a sub-second end or lower bound up, so no slot overlaps it.
+    seconds, microseconds = split_epoch(value)
+    return seconds + (microseconds > 0)
@@ -1,7 +1,7 @@
 from test.TestResults import TestResults
 from test.TestCaseResultDto import TestCaseResultDto
+import atexit
 import json
-import requests
 import os
 
 
@@ -10,11 +10,24 @@ class TestUtils:
     # URL = "https://yaksha-prod-sbfn.azurewebsites.net/api/YakshaMFAEnqueue?code=jSTWTxtQ8kZgQ5FC0oLgoSgZG7UoU9Asnmxgp6hLLvYId/GW9ccoLw=="
     URL = "https://compiler.techademy.com/v1/mfa-results/push"
 
+    # YAKSHA_RESULTS_SINK selects where results go: unset for the remote URL,
+    # "memory" to keep them in-process, or any other URL (e.g. the local
+    # stand-in from test/results_sink.py).
+    SINK = os.environ.get("YAKSHA_RESULTS_SINK", "")
+    # Number of results queued before they are submitted; the rest go at exit.
+    # This only defers submission: the endpoint takes one result per request,
+    # so each queued result is still its own POST, sent over one connection.
+    BATCH_SIZE = int(os.environ.get("YAKSHA_BATCH_SIZE", "1"))
+
+    collected = []
+    _pending = []
+    _session = None
+    _session_pid = None
+    _custom_data = None
+
     @classmethod
     def yakshaAssert(self, test_name, result, test_type):
-        ref = open("../custom.ih", "r")
-        customData = ref.read()
-        ref.close()
+        customData = self._read_custom_data()
         test_case_results = dict()
 
         result_status = "Failed"
@@ -33,7 +46,42 @@ class TestUtils:
 
         final_result = json.dumps(test_results)
 
-        response = requests.post(self.URL, final_result, headers={"Content-Type": "application/json"})
-        if response.status_code not in [200, 201]:
-            length = len(customData)
-            print(f'⚠️ Unable to push test cases from {hostName}, please try again![{length}]')
+        if self.SINK == "memory":
+            self.collected.append(final_result)
+            return
+        self._pending.append(final_result)
+        if len(self._pending) >= self.BATCH_SIZE:
+            self.flush()
+
+    @classmethod
+    def flush(self):
+        """Submit every queued result, one POST each, over one reused HTTP connection."""
+        if not self._pending:
+            return
+        if self._session is None or self._session_pid != os.getpid():
+            # A forked worker must not share its parent's socket.
+            import requests
+            TestUtils._session = requests.Session()
+            TestUtils._session_pid = os.getpid()
+        url = self.SINK or self.URL
+        pending = list(self._pending)
+        del self._pending[:]
+        for final_result in pending:
+            response = self._session.post(url, final_result, headers={"Content-Type": "application/json"})
+            if response.status_code not in [200, 201]:
+                hostName = os.environ.get('HOSTNAME')
+                length = len(self._read_custom_data())
+                print(f'⚠️ Unable to push test cases from {hostName}, please try again![{length}]')
+
+    @classmethod
+    def _read_custom_data(self):
+        if TestUtils._custom_data is None:
+            if self.SINK and not os.path.exists("../custom.ih"):
+                TestUtils._custom_data = ""
+            else:
+                with open("../custom.ih", "r") as ref:
+                    TestUtils._custom_data = ref.read()
+        return TestUtils._custom_data
+
+
+atexit.register(TestUtils.flush)
@@ -0,0 +1,75 @@
+"""
+Local stand-in for the Yaksha results endpoint.
+
+Accepts the JSON payloads posted by TestUtils.yakshaAssert and appends them,
+one per line, to an output file so that a full run works offline:
+
+    python -m test.results_sink --port 8765 --out results.jsonl &
+    YAKSHA_RESULTS_SINK=http://127.0.0.1:8765/push python -m unittest
+"""
+
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class ResultsSinkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            json.loads(body)
+            status = 201
+        except ValueError:
+            status = 400
+        else:
+            with self.server.lock:
+                self.server.received.append(body.decode("utf-8"))
+                if self.server.out is not None:
+                    self.server.out.write(body.decode("utf-8") + "\n")
+                    self.server.out.flush()
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_sink(host="127.0.0.1", port=0, out=None):
+    """
+    Start the sink on a background thread.
+
+    Returns the server; its URL is f"http://{host}:{server.server_port}/push"
+    and received payloads are kept in server.received.
+    """
+    server = ThreadingHTTPServer((host, port), ResultsSinkHandler)
+    server.lock = threading.Lock()
+    server.received = []
+    server.out = out
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Yaksha results endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--out", default="results.jsonl")
+    args = parser.parse_args()
+    with open(args.out, "a") as out:
+        server = start_sink(args.host, args.port, out)
+        print(f"Collecting results on http://{args.host}:{server.server_port}/push into {args.out}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Run the test suite across processes and report wall time.
+
+Each test case runs in a worker process from a pool. Unless
+YAKSHA_RESULTS_SINK is already set, a local results sink is started and
+every worker reports to it, so the run needs no network access:
+
+    python -m test.run_parallel --workers 4
+    python -m test.run_parallel --workers 4 --compare    # serial run first
+"""
+
+import argparse
+import io
+import os
+import time
+import unittest
+from multiprocessing import Pool
+
+
+def _test_ids(pattern):
+    suite = unittest.defaultTestLoader.discover("test", pattern=pattern, top_level_dir=".")
+    ids = []
+    stack = [suite]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, unittest.TestSuite):
+            stack.extend(reversed(list(item)))
+        else:
+            ids.append(item.id())
+    return ids
+
+
+def _run_one(test_id):
+    from test.TestUtils import TestUtils
+
+    stream = io.StringIO()
+    result = unittest.TextTestRunner(stream=stream, verbosity=0).run(
+        unittest.defaultTestLoader.loadTestsFromName(test_id))
+    TestUtils.flush()
+    return test_id, result.wasSuccessful(), stream.getvalue()
+
+
+def run(test_ids, workers):
+    """Run test_ids with the given number of worker processes and return (seconds, failures)."""
+    start = time.perf_counter()
+    if workers <= 1:
+        outcomes = [_run_one(test_id) for test_id in test_ids]
+    else:
+        with Pool(workers) as pool:
+            outcomes = pool.map(_run_one, test_ids, chunksize=1)
+    failures = [(test_id, output) for test_id, ok, output in outcomes if not ok]
+    return time.perf_counter() - start, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the test suite in parallel")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--pattern", default="test_*.py")
+    parser.add_argument("--compare", action="store_true", help="also time a serial run")
+    args = parser.parse_args()
+
+    server = None
+    if not os.environ.get("YAKSHA_RESULTS_SINK"):
+        from test.results_sink import start_sink
+
+        server = start_sink()
+        os.environ["YAKSHA_RESULTS_SINK"] = f"http://127.0.0.1:{server.server_port}/push"
+
+    test_ids = _test_ids(args.pattern)
+    runs = ([("serial", 1)] if args.compare else []) + [("parallel", args.workers)]
+    failures = []
+    for name, workers in runs:
+        elapsed, failures = run(test_ids, workers)
+        print(f"{name:<8} {len(test_ids)} tests, {workers} workers: {elapsed:.2f}s wall, {len(failures)} failed")
+    for test_id, output in failures:
+        print(f"\nFAILED {test_id}\n{output}")
+    if server is not None:
+        print(f"{len(server.received)} results received by the local sink")
+        server.shutdown()
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
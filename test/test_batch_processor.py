@@ -0,0 +1,72 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import batch_processor
+from datetime_kernels import civil_from_days, days_from_civil, parse_to_epoch
+
+
+class TestDatetimeKernels(unittest.TestCase):
+    def test_civil_round_trip_matches_datetime(self):
+        for days in range(-719162, 2932897, 997):
+            expected = datetime(1970, 1, 1) + timedelta(days=days)
+            self.assertEqual(civil_from_days(days), (expected.year, expected.month, expected.day))
+            self.assertEqual(days_from_civil(expected.year, expected.month, expected.day), days)
+
+    def test_parse_rejects_invalid_strings(self):
+        for bad in ["2025-02-29", "2025-13-01", "2025/03/19", "2025-03-19 24:00:00", "2025-03-19T14:30:00", "2025- 3-19", ""]:
+            with self.assertRaises(ValueError):
+                parse_to_epoch(bad)
+        with self.assertRaises(TypeError):
+            parse_to_epoch(20250319)
+
+    def test_parse_accepts_unpadded_strptime_forms(self):
+        for loose, canonical in (("2025-3-9", "2025-03-09"), ("2025-03- 9", "2025-03-09"),
+                                 ("2025-3-19 9:5:7", "2025-03-19 09:05:07"),
+                                 ("2025-03-19\t14:30:00", "2025-03-19 14:30:00")):
+            self.assertEqual(parse_to_epoch(loose), parse_to_epoch(canonical))
+        for bad in ["2025-3-32", "2025-2-29 1:2:3", "2025-03-19 1:60:00", "25-3-19", "2025-3-19 ", "19/03/2025"]:
+            with self.assertRaises(ValueError):
+                parse_to_epoch(bad)
+
+
+class TestBatchProcessor(unittest.TestCase):
+    def test_batch_functions_match_scalar_semantics(self):
+        strings = ["2025-03-19", "2025-03-19 14:30:00", "2024-02-29 23:59:59"]
+        expected = [datetime(2025, 3, 19), datetime(2025, 3, 19, 14, 30), datetime(2024, 2, 29, 23, 59, 59)]
+        self.assertEqual(batch_processor.convert_strings_to_datetimes(strings), expected)
+
+        diffs = batch_processor.calculate_date_differences(["2025-03-26", "2025-03-19 09:00:00"],
+                                                           ["2025-03-19", "2025-03-19 14:30:00"])
+        self.assertEqual(diffs[0], {"days": -7, "hours": -168, "minutes": -10080, "total_seconds": -604800})
+        self.assertEqual(diffs[1], {"days": 0, "hours": 5, "minutes": 330, "total_seconds": 19800})
+
+        shifted = batch_processor.convert_timezones([datetime(2025, 12, 31, 22, 0)], -8, 3)
+        self.assertEqual(shifted, [datetime(2026, 1, 1, 9, 0)])
+        with self.assertRaises(ValueError):
+            batch_processor.convert_timezones(strings, -13, 0)
+
+    def test_microseconds_are_carried_through(self):
+        start = datetime(2025, 3, 19, 14, 30, 0, 250000)
+        end = datetime(2025, 3, 19, 14, 30, 2)
+        self.assertEqual(batch_processor.calculate_date_differences([start, end], [end, start]),
+                         [{"days": 0, "hours": 0, "minutes": 0, "total_seconds": 1.75},
+                          {"days": 0, "hours": 0, "minutes": 0, "total_seconds": -1.75}])
+        self.assertEqual(batch_processor.convert_timezones([start], 0, 1), [start + timedelta(hours=1)])
+        self.assertEqual(batch_processor.convert_strings_to_datetimes(["2025-3-19", "2025-03-19 9:05:00"]),
+                         [datetime(2025, 3, 19), datetime(2025, 3, 19, 9, 5)])
+
+    def test_concurrent_use_is_deterministic(self):
+        strings = [f"2025-{month:02d}-{day:02d} 08:00:00" for month in range(1, 13) for day in range(1, 29)] * 50
+        expected = batch_processor.convert_timezones(strings, -5, 9)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: batch_processor.convert_timezones(strings, -5, 9), range(16)))
+        for result in results:
+            self.assertEqual(result, expected)
+        self.assertEqual(batch_processor.run_chunked(batch_processor.convert_strings_to_datetimes,
+                                                     strings, workers=4, chunk_size=333),
+                         batch_processor.convert_strings_to_datetimes(strings))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import io
+import unittest
+from datetime import datetime, timedelta
+
+from bulk_format import BulkWriter, format_epochs, format_epochs_into
+from datetime_kernels import MAX_EPOCH, MIN_EPOCH, datetime_to_epoch
+
+
+class TestBulkFormat(unittest.TestCase):
+    def test_matches_strftime(self):
+        dts = [datetime(1, 1, 1), datetime(999, 12, 31, 23, 59, 59), datetime(2024, 2, 29, 12, 5, 9),
+               datetime(9999, 12, 31, 23, 59, 59)] + [datetime(2025, 3, 19) + timedelta(seconds=s * 7919)
+                                                       for s in range(500)]
+        epochs = [datetime_to_epoch(dt) for dt in dts]
+        expected = "".join(f"{dt.year:04d}-{dt:%m-%d %H:%M:%S}\n" for dt in dts).encode()
+        self.assertEqual(format_epochs(epochs), expected)
+        self.assertEqual(format_epochs(epochs, date_only=True),
+                         "".join(f"{dt.year:04d}-{dt:%m-%d}\n" for dt in dts).encode())
+
+    def test_writer_flushes_in_large_writes(self):
+        out = io.BytesIO()
+        dts = [datetime(2025, 3, 19, 8) + timedelta(minutes=m) for m in range(1000)]
+        with BulkWriter(out, buffer_rows=64) as writer:
+            writer.write_datetimes(dts)
+        self.assertEqual(out.getvalue(), "".join(f"{dt:%Y-%m-%d %H:%M:%S}\n" for dt in dts).encode())
+        self.assertEqual(writer.bytes_written, 20 * len(dts))
+
+    def test_rejects_out_of_range_and_small_buffers(self):
+        with self.assertRaises(OverflowError):
+            format_epochs([MAX_EPOCH + 1])
+        with self.assertRaises(OverflowError):
+            format_epochs([MIN_EPOCH - 1])
+        with self.assertRaises(ValueError):
+            format_epochs_into([0, 0], bytearray(30))
+
+
+if __name__ == '__main__':
+    unittest.main()
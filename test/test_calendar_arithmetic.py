@@ -0,0 +1,39 @@
+import unittest
+from array import array
+from datetime import datetime
+
+import batch_processor
+from calendar_arithmetic import add_months, add_months_batch, add_years, calendar_difference
+from datetime_kernels import to_epoch
+
+
+class TestCalendarArithmetic(unittest.TestCase):
+    def test_end_of_month_clamping(self):
+        self.assertEqual(add_months("2025-01-31", 1), datetime(2025, 2, 28))
+        self.assertEqual(add_months("2024-01-31", 1), datetime(2024, 2, 29))
+        self.assertEqual(add_months(datetime(2025, 3, 31, 14, 30), -1), datetime(2025, 2, 28, 14, 30))
+        self.assertEqual(add_months("2025-11-30", 3), datetime(2026, 2, 28))
+        self.assertEqual(add_years("2024-02-29", 4), datetime(2028, 2, 29))
+        with self.assertRaises(TypeError):
+            add_months("2025-01-31", 1.0)
+        with self.assertRaises(OverflowError):
+            add_years("9999-06-01", 1)
+
+    def test_batch_versions(self):
+        epochs = array("q", [to_epoch("2025-01-31 08:00:00"), to_epoch("2025-05-31")])
+        self.assertEqual(list(add_months_batch(epochs, 1)),
+                         [to_epoch("2025-02-28 08:00:00"), to_epoch("2025-06-30")])
+        self.assertEqual(add_months_batch(["2025-08-31"], 1), [datetime(2025, 9, 30)])
+
+    def test_calendar_breakdown(self):
+        self.assertEqual(calendar_difference("2025-01-31", "2025-02-28")["months"], 1)
+        self.assertEqual(calendar_difference("2025-01-31", "2025-02-27")["months"], 0)
+        diff = calendar_difference("2027-03-19", "2025-03-19 12:00:00")
+        self.assertEqual((diff["years"], diff["months"], diff["days"]), (-1, -23, -729))
+        diffs = batch_processor.calculate_date_differences(["2025-03-19"], ["2026-06-18"], calendar=True)
+        self.assertEqual((diffs[0]["years"], diffs[0]["months"]), (1, 14))
+        self.assertNotIn("months", batch_processor.calculate_date_differences(["2025-03-19"], ["2026-06-18"])[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
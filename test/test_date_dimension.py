@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from array import array
+from datetime import datetime, timedelta
+
+import date_dimension
+from datetime_kernels import WEEKDAY_NAMES, to_epoch
+
+
+class TestDateDimension(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.dimension = date_dimension.build_dimension(1999, 2030, holidays=["2025-03-19"],
+                                                       annual_holidays=[(1, 1), (12, 25)])
+
+    def check_against_datetime(self, dimension):
+        day = datetime(1999, 1, 1)
+        while day.year <= 2030:
+            row = dimension.lookup(day)
+            iso = day.isocalendar()
+            self.assertEqual(row["weekday"], WEEKDAY_NAMES[day.weekday()])
+            self.assertEqual((row["iso_year"], row["iso_week"]), (iso[0], iso[1]))
+            self.assertEqual(row["quarter"], (day.month - 1) // 3 + 1)
+            self.assertEqual(row["day_of_year"], day.timetuple().tm_yday)
+            self.assertEqual(row["weekend"], day.weekday() >= 5)
+            self.assertEqual(row["month_end"], (day + timedelta(days=1)).month != day.month)
+            self.assertEqual(row["holiday"], (day.month, day.day) in ((1, 1), (12, 25))
+                             or day == datetime(2025, 3, 19))
+            day += timedelta(days=1)
+
+    def test_rows_match_datetime(self):
+        self.assertEqual(len(self.dimension), 11688)
+        self.check_against_datetime(self.dimension)
+
+    def test_gather(self):
+        values = ["2025-12-31 23:59:59", "1999-01-01", datetime(2020, 2, 29, 12)]
+        self.assertEqual(list(self.dimension.gather("day_of_year", values)), [365, 1, 60])
+        epochs = array("q", [to_epoch(value) for value in values])
+        self.assertEqual(self.dimension.gather("iso_week", epochs), array("B", [1, 53, 9]))
+        self.assertEqual(self.dimension.gather("weekday", epochs[:1]), array("B", [2]))
+        self.assertEqual(len(self.dimension.gather("flags", [])), 0)
+        for bad in (["1998-12-31"], ["2031-01-01"]):
+            with self.assertRaises(IndexError):
+                self.dimension.gather("quarter", bad)
+        with self.assertRaises(KeyError):
+            self.dimension.gather("month", values)
+        with self.assertRaises(IndexError):
+            self.dimension.lookup("2031-01-01")
+
+    def test_saved_table_is_shared_by_mapping(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "dates.dim")
+        self.dimension.save(path)
+        with date_dimension.open_dimension(path) as opened:
+            self.assertEqual(opened.first_day, self.dimension.first_day)
+            for name in date_dimension.COLUMNS:
+                self.assertEqual(list(opened.columns[name]), list(self.dimension.columns[name]))
+            self.check_against_datetime(opened)
+        script = ("import date_dimension, sys; d = date_dimension.open_dimension(sys.argv[1]); "
+                  "print(d.lookup('2025-03-19')['holiday'], d.lookup('2025-03-19')['weekday']); d.close()")
+        output = subprocess.run([sys.executable, "-c", script, path], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(output.stdout.split(), ["True", "Wednesday"])
+
+        with open(path, "r+b") as out:
+            out.truncate(os.path.getsize(path) - 8)
+        with self.assertRaisesRegex(ValueError, "truncated"):
+            date_dimension.open_dimension(path)
+        with open(path, "wb") as out:
+            out.write(b"not a table")
+        with self.assertRaises(ValueError):
+            date_dimension.open_dimension(path)
+        with self.assertRaises(ValueError):
+            date_dimension.build_dimension(2030, 1999)
+
+    def test_last_supported_year(self):
+        dimension = date_dimension.build_dimension(9999, 9999)
+        row = dimension.lookup("9999-12-31")
+        self.assertEqual((row["month_end"], row["weekday"], row["day_of_year"]), (True, "Friday", 365))
+        self.assertFalse(dimension.lookup("9999-12-30")["month_end"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,484 @@
+"""
+Differential tests: every fast, batch and cached variant against straightforward
+scalar reference implementations of the six processor functions, including
+the planner's scalar, batch and parallel paths, the bulk formatter, the date
+dimension, timezone normalization and TimestampArray inputs.
+
+Hypothesis drives the comparison when it is installed (the property tests are
+reported as skipped otherwise); a fixed set of edge cases (leap days, year
+boundaries, the -12/+14 offset extremes) always runs.
+Time spent inside each variant is recorded and printed per variant at the end
+of the run, so speed regressions show up next to correctness failures.
+"""
+
+import calendar
+import json
+import os
+import tempfile
+import time
+import unittest
+from array import array
+from datetime import datetime, timedelta
+
+import batch_processor
+import planner
+import tolerant_batch
+from bulk_format import format_epochs
+from calendar_arithmetic import add_months, add_months_batch, calendar_difference
+from date_dimension import MONTH_END, WEEKEND, build_dimension
+from durations import Duration, apply_duration
+from parse_cache import PersistentParseCache
+from timestamps import TimestampArray
+from tz_normalize import normalize_epochs, normalize_timezones
+
+try:
+    from hypothesis import given, settings, strategies as st
+except ImportError:
+    given = None
+
+
+# Scalar references, written the obvious way with strptime/strftime/timedelta.
+
+def reference_convert_string_to_datetime(date_string):
+    if not isinstance(date_string, str):
+        raise TypeError("date_string must be a string")
+    for pattern in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(date_string, pattern)
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date string: {date_string!r}")
+
+
+def reference_to_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    return reference_convert_string_to_datetime(value)
+
+
+def reference_format_datetime(dt, format_string="%Y-%m-%d %H:%M:%S"):
+    if not isinstance(dt, datetime) or not isinstance(format_string, str):
+        raise TypeError("dt must be a datetime and format_string a string")
+    return dt.strftime(format_string)
+
+
+def reference_calculate_date_difference(start_date, end_date):
+    start = reference_to_datetime(start_date)
+    delta = reference_to_datetime(end_date) - start
+    sign = -1 if delta < timedelta(0) else 1
+    return {"days": sign * (abs(delta) // timedelta(days=1)),
+            "hours": sign * (abs(delta) // timedelta(hours=1)),
+            "minutes": sign * (abs(delta) // timedelta(minutes=1)),
+            "total_seconds": delta.total_seconds()}
+
+
+def reference_add_time_duration(dt, days=0, hours=0, minutes=0):
+    return reference_to_datetime(dt) + timedelta(days=days, hours=hours, minutes=minutes)
+
+
+def reference_get_day_of_week(date_string):
+    return reference_to_datetime(date_string).strftime("%A")
+
+
+def reference_convert_timezone(dt, source_offset, target_offset):
+    for offset in (source_offset, target_offset):
+        if not isinstance(offset, int) or isinstance(offset, bool):
+            raise TypeError("offsets must be integers")
+        if not -12 <= offset <= 14:
+            raise ValueError("offsets must be between -12 and +14")
+    return reference_to_datetime(dt) + timedelta(hours=target_offset - source_offset)
+
+
+def reference_date_attributes(value):
+    dt = reference_to_datetime(value)
+    iso_year, iso_week, iso_weekday = dt.isocalendar()
+    flags = WEEKEND if iso_weekday > 5 else 0
+    if dt.day == calendar.monthrange(dt.year, dt.month)[1]:
+        flags |= MONTH_END
+    return {"weekday": iso_weekday - 1, "iso_year": iso_year, "iso_week": iso_week,
+            "quarter": (dt.month - 1) // 3 + 1, "day_of_year": dt.timetuple().tm_yday, "flags": flags}
+
+
+def reference_add_months(dt, months):
+    dt = reference_to_datetime(dt)
+    year, month = divmod(dt.year * 12 + dt.month - 1 + months, 12)
+    if not 1 <= year <= 9999:
+        raise OverflowError("year out of range")
+    return dt.replace(year=year, month=month + 1, day=min(dt.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def reference_months_between(start_date, end_date):
+    start, end = reference_to_datetime(start_date), reference_to_datetime(end_date)
+    sign = 1
+    if end < start:
+        start, end, sign = end, start, -1
+    months = 0
+    while True:
+        try:
+            if reference_add_months(start, months + 1) > end:
+                break
+        except OverflowError:
+            break
+        months += 1
+    return sign * months
+
+
+def outcome(func, *args, **kwargs):
+    """Return ("ok", value) or ("error", exception type) for a scalar call."""
+    try:
+        return "ok", func(*args, **kwargs)
+    except (TypeError, ValueError, OverflowError) as error:
+        return "error", type(error)
+
+
+THROUGHPUT = {}
+
+EPOCH = datetime(1970, 1, 1)
+
+# Thresholds that force each planner path, written to files by setUpModule
+PLANNER_PATHS = {"scalar": (10 ** 9, None), "batch": (1, None), "parallel": (1, 1)}
+_fixtures = {}
+
+
+def setUpModule():
+    directory = _fixtures["directory"] = tempfile.TemporaryDirectory()
+    for path, (batch, parallel) in PLANNER_PATHS.items():
+        with open(os.path.join(directory.name, f"{path}.json"), "w") as out:
+            json.dump({"thresholds": {operation: {"batch": batch, "parallel": parallel}
+                                      for operation in planner.OPERATIONS}}, out)
+    planner.set_workers(2)
+    _fixtures["dimension"] = build_dimension(1900, 2100)
+
+
+def timed(variant, rows, func, *args, **kwargs):
+    """Call a variant, recording its elapsed time against the number of rows it processed."""
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        seconds, count = THROUGHPUT.get(variant, (0.0, 0))
+        THROUGHPUT[variant] = (seconds + time.perf_counter() - start, count + rows)
+
+
+# Checks shared by the edge-case and Hypothesis tests.
+
+def check_planner(test, operation, columns, arguments, expected):
+    """
+    Compare a planner function on every path with expected reference outcomes.
+
+    Each row is also run on its own, which always takes the scalar path. A
+    sequence with a failing row must raise one of the rows' exception types.
+    """
+    function = getattr(planner, operation)
+    for value, status in zip(zip(*columns), expected):
+        test.assertEqual(outcome(timed, f"planner.{operation}(one)", 1, function, *value, *arguments), status)
+    failures = {value for status, value in expected if status == "error"}
+    for path in PLANNER_PATHS:
+        planner.load_thresholds(os.path.join(_fixtures["directory"].name, f"{path}.json"))
+        actual = outcome(timed, f"planner.{operation}[{path}]", len(expected), function, *columns, *arguments)
+        if failures:
+            test.assertEqual(actual[0], "error")
+            test.assertIn(actual[1], failures)
+        else:
+            test.assertEqual(actual, ("ok", [value for _, value in expected]))
+
+
+def _tolerant_matches(test, results, errors, expected):
+    codes = dict(errors)
+    for row, (status, value) in enumerate(expected):
+        if status == "ok":
+            test.assertEqual(results[row], value)
+            test.assertNotIn(row, codes)
+        else:
+            test.assertIsNone(results[row])
+            test.assertIn(row, codes)
+
+
+def check_parse(test, values):
+    expected = [outcome(reference_convert_string_to_datetime, value) for value in values]
+    results, errors = timed("tolerant.convert_string_to_datetime", len(values),
+                            tolerant_batch.convert_string_to_datetime, values)
+    _tolerant_matches(test, results, errors, expected)
+    for row, code in errors:
+        test.assertEqual(code, tolerant_batch.E_TYPE if expected[row][1] is TypeError else tolerant_batch.E_DATE)
+    good = [value for value, (status, _) in zip(values, expected) if status == "ok"]
+    test.assertEqual(timed("batch.convert_strings_to_datetimes", len(good),
+                           batch_processor.convert_strings_to_datetimes, good),
+                     [value for status, value in expected if status == "ok"])
+    with PersistentParseCache(":memory:") as cache:
+        epochs = timed("cache.lookup_many", len(good), cache.lookup_many, good)
+        test.assertEqual(timed("cache.lookup_many(warm)", len(good), cache.lookup_many, good), epochs)
+    for value, (epoch, weekday, _) in zip(good, epochs):
+        dt = reference_convert_string_to_datetime(value)
+        test.assertEqual(EPOCH + timedelta(seconds=epoch), dt)
+        test.assertEqual(weekday, dt.weekday())
+    check_planner(test, "convert_string_to_datetime", [values], (), expected)
+
+
+def check_format(test, dts, format_string):
+    expected = [outcome(reference_format_datetime, dt, format_string) for dt in dts]
+    results, errors = timed("tolerant.format_datetime", len(dts),
+                            tolerant_batch.format_datetime, dts, format_string)
+    _tolerant_matches(test, results, errors, expected)
+    check_planner(test, "format_datetime", [dts], (format_string,), expected)
+
+
+def check_difference(test, starts, ends):
+    expected = [outcome(reference_calculate_date_difference, start, end) for start, end in zip(starts, ends)]
+    results, errors = timed("tolerant.calculate_date_difference", len(starts),
+                            tolerant_batch.calculate_date_difference, starts, ends)
+    _tolerant_matches(test, results, errors, expected)
+    pairs = [pair for pair, (status, _) in zip(zip(starts, ends), expected) if status == "ok"]
+    test.assertEqual(timed("batch.calculate_date_differences", len(pairs),
+                           batch_processor.calculate_date_differences,
+                           [start for start, _ in pairs], [end for _, end in pairs]),
+                     [value for status, value in expected if status == "ok"])
+    check_planner(test, "calculate_date_difference", [starts, ends], (), expected)
+
+
+def check_add_duration(test, values, days, hours, minutes):
+    expected = [outcome(reference_add_time_duration, value, days=days, hours=hours, minutes=minutes)
+                for value in values]
+    results, errors = timed("tolerant.add_time_duration", len(values),
+                            tolerant_batch.add_time_duration, values, days=days, hours=hours, minutes=minutes)
+    _tolerant_matches(test, results, errors, expected)
+    good = [value for value, (status, _) in zip(values, expected) if status == "ok"]
+    test.assertEqual(timed("durations.apply_duration", len(good), apply_duration,
+                           good, Duration.from_parts(days=days, hours=hours, minutes=minutes)),
+                     [value for status, value in expected if status == "ok"])
+    check_planner(test, "add_time_duration", [values], (days, hours, minutes), expected)
+
+
+def check_add_months(test, values, months):
+    expected = [outcome(reference_add_months, value, months) for value in values]
+    for value, (status, result) in zip(values, expected):
+        test.assertEqual(outcome(timed, "calendar.add_months", 1, add_months, value, months)[0], status)
+        if status == "ok":
+            test.assertEqual(add_months(value, months), result)
+    good = [value for value, (status, _) in zip(values, expected) if status == "ok"]
+    test.assertEqual(timed("calendar.add_months_batch", len(good), add_months_batch, good, months),
+                     [value for status, value in expected if status == "ok"])
+
+
+def check_calendar_difference(test, start, end):
+    expected = outcome(reference_months_between, start, end)
+    actual = outcome(timed, "calendar.calendar_difference", 1, calendar_difference, start, end)
+    test.assertEqual(actual[0], expected[0])
+    if expected[0] == "ok":
+        test.assertEqual(actual[1]["months"], expected[1])
+        test.assertEqual(actual[1]["years"], int(expected[1] / 12))
+
+
+def check_day_of_week(test, values):
+    expected = [outcome(reference_get_day_of_week, value) for value in values]
+    results, errors = timed("tolerant.get_day_of_week", len(values), tolerant_batch.get_day_of_week, values)
+    _tolerant_matches(test, results, errors, expected)
+    check_planner(test, "get_day_of_week", [values], (), expected)
+
+
+def check_timezone(test, values, source_offset, target_offset):
+    expected = [outcome(reference_convert_timezone, value, source_offset, target_offset) for value in values]
+    results, errors = timed("tolerant.convert_timezone", len(values),
+                            tolerant_batch.convert_timezone, values, source_offset, target_offset)
+    _tolerant_matches(test, results, errors, expected)
+    if outcome(reference_convert_timezone, datetime(2000, 1, 1), source_offset, target_offset)[0] == "error":
+        with test.assertRaises((TypeError, ValueError)):
+            batch_processor.convert_timezones(values, source_offset, target_offset)
+    elif all(status == "ok" for status, _ in expected):
+        test.assertEqual(timed("batch.convert_timezones", len(values),
+                               batch_processor.convert_timezones, values, source_offset, target_offset),
+                         [value for _, value in expected])
+    check_planner(test, "convert_timezone", [values], (source_offset, target_offset), expected)
+
+
+def check_normalize(test, values, source_offset, target_offset):
+    expected = [outcome(reference_convert_timezone, value, source_offset, target_offset) for value in values]
+    if any(status == "error" for status, _ in expected):
+        with test.assertRaises((TypeError, ValueError, OverflowError)):
+            normalize_timezones(values, target_offset, default_offset=source_offset)
+    good = [value for value, (status, _) in zip(values, expected) if status == "ok"]
+    if not good:
+        return
+    converted = [value for status, value in expected if status == "ok"]
+    test.assertEqual(timed("tz_normalize.normalize_timezones", len(good), normalize_timezones,
+                           good, target_offset, default_offset=source_offset), converted)
+    whole = [value for value in good if not isinstance(value, datetime) or not value.microsecond]
+    test.assertEqual(list(timed("tz_normalize.normalize_epochs", len(whole), normalize_epochs,
+                                whole, target_offset, default_offset=source_offset)),
+                     [(value - EPOCH) // timedelta(seconds=1)
+                      for value, original in zip(converted, good) if original in whole])
+
+
+def check_bulk_format(test, dts):
+    # strftime("%Y") does not zero-pad years before 1000; the bulk formatter does
+    dts = [dt for dt in dts if dt.year >= 1000]
+    epochs = array("q", [(dt - EPOCH) // timedelta(seconds=1) for dt in dts])
+    for date_only, format_string in ((False, "%Y-%m-%d %H:%M:%S"), (True, "%Y-%m-%d")):
+        test.assertEqual(timed("bulk_format.format_epochs", len(dts), format_epochs, epochs, date_only=date_only),
+                         "".join(reference_format_datetime(dt, format_string) + "\n" for dt in dts).encode("ascii"))
+
+
+def check_date_dimension(test, values):
+    dimension = _fixtures["dimension"]
+    expected = [outcome(reference_to_datetime, value) for value in values]
+    inside = [value for value, (status, dt) in zip(values, expected) if status == "ok" and 1900 <= dt.year <= 2100]
+    attributes = [reference_date_attributes(value) for value in inside]
+    epochs = array("q", [(reference_to_datetime(value) - EPOCH) // timedelta(seconds=1) for value in inside])
+    for column in attributes[0] if attributes else ():
+        test.assertEqual(list(timed("dimension.gather", len(inside), dimension.gather, column, inside)),
+                         [attribute[column] for attribute in attributes])
+        test.assertEqual(list(timed("dimension.gather(epochs)", len(inside), dimension.gather, column, epochs)),
+                         [attribute[column] for attribute in attributes])
+    for value, (status, dt) in zip(values, expected):
+        if status == "ok" and not 1900 <= dt.year <= 2100:
+            with test.assertRaises(IndexError):
+                dimension.gather("weekday", [value])
+
+
+def check_timestamp_array(test, dts):
+    whole = [dt.replace(microsecond=0) for dt in dts]
+    times = TimestampArray(whole)
+    ends = TimestampArray(whole[::-1])
+    for variant, function, arguments, reference in (
+            ("add_time_duration", tolerant_batch.add_time_duration, (1, -2, 3), reference_add_time_duration),
+            ("convert_timezone", tolerant_batch.convert_timezone, (-12, 14), reference_convert_timezone),
+            ("get_day_of_week", tolerant_batch.get_day_of_week, (), reference_get_day_of_week),
+            ("format_datetime", tolerant_batch.format_datetime, ("%Y-%m-%d %A",), reference_format_datetime)):
+        results, errors = timed(f"tolerant.{variant}(TimestampArray)", len(times), function, times, *arguments)
+        _tolerant_matches(test, results, errors, [outcome(reference, dt, *arguments) for dt in whole])
+    expected = [reference_calculate_date_difference(start, end) for start, end in zip(whole, whole[::-1])]
+    results, errors = tolerant_batch.calculate_date_difference(times, ends)
+    test.assertEqual((results, errors), (expected, []))
+    test.assertEqual(timed("batch.calculate_date_differences(TimestampArray)", len(times),
+                           batch_processor.calculate_date_differences, times, ends), expected)
+    expected = [outcome(reference_add_months, dt, 1) for dt in whole]
+    if all(status == "ok" for status, _ in expected):
+        test.assertEqual(list(timed("calendar.add_months_batch(TimestampArray)", len(times),
+                                    add_months_batch, times, 1)),
+                         [value for _, value in expected])
+
+
+EDGE_STRINGS = [
+    "2024-02-29", "2023-02-29", "2000-02-29", "1900-02-29", "2100-02-28 23:59:59",
+    "2025-12-31 23:59:59", "2026-01-01 00:00:00", "0001-01-01", "9999-12-31 23:59:59",
+    "2025-3-19", "2025-03-19T14:30:00", "2025-03-19 14:30", " 2025-03-19", "2025-03-19 24:00:00",
+    "", None, 20250319, datetime(2025, 3, 19),
+]
+EDGE_DATETIMES = [datetime(2024, 2, 29, 12), datetime(2025, 12, 31, 23, 30), datetime(1, 1, 1),
+                  datetime(9999, 12, 31, 23, 59, 59), datetime(2025, 3, 19, 14, 30, 0, 999)]
+
+
+class TestDifferentialEdgeCases(unittest.TestCase):
+    def test_parse_edge_cases(self):
+        check_parse(self, EDGE_STRINGS)
+
+    def test_other_functions_on_edge_cases(self):
+        values = EDGE_STRINGS + EDGE_DATETIMES
+        check_format(self, values, "%Y-%m-%d %A")
+        check_format(self, EDGE_DATETIMES, None)
+        check_difference(self, values, list(reversed(values)))
+        check_day_of_week(self, values)
+        for days, hours, minutes in ((0, 0, 0), (1, -25, 61), (366, 0, 0), (-1, 0, 0)):
+            check_add_duration(self, values, days, hours, minutes)
+        for months in (0, 1, -1, 13, -25, 120000):
+            check_add_months(self, values, months)
+        for start, end in (("2024-01-31", "2024-02-29"), ("2024-02-29", "2025-02-28"),
+                           ("2025-03-31 12:00:00", "2025-02-28 12:00:00"), ("2025-12-31", "2026-01-01")):
+            check_calendar_difference(self, start, end)
+        for source, target in ((-12, 14), (14, -12), (-5, -8), (0, 0), (-13, 0), (0, 15), (0.5, 0)):
+            check_timezone(self, values, source, target)
+            check_timezone(self, EDGE_DATETIMES[:2], source, target)
+            check_normalize(self, values, source, target)
+            check_normalize(self, EDGE_DATETIMES[:2], source, target)
+        check_bulk_format(self, EDGE_DATETIMES)
+        check_date_dimension(self, values)
+        check_timestamp_array(self, EDGE_DATETIMES)
+        check_timestamp_array(self, EDGE_DATETIMES[:2])
+
+
+def tearDownModule():
+    planner.set_workers()
+    planner.load_thresholds()
+    _fixtures.pop("directory").cleanup()
+    if not THROUGHPUT:
+        return
+    print("\nvariant throughput (rows/s):")
+    for variant, (seconds, rows) in sorted(THROUGHPUT.items()):
+        print(f"  {variant:<40} {rows / seconds if seconds else 0:14,.0f}  ({rows} rows)")
+
+
+if given is not None:
+    datetimes = st.datetimes(min_value=datetime(1, 1, 2), max_value=datetime(9999, 12, 30))
+    canonical = datetimes.map(lambda dt: dt.replace(microsecond=0)).flatmap(
+        lambda dt: st.sampled_from([dt.isoformat(sep=" "), dt.date().isoformat()]))
+    mangled = st.text(alphabet="0123456789-: T/", min_size=8, max_size=20)
+    dates = st.one_of(canonical, datetimes, mangled, st.none(), st.integers())
+    offsets = st.one_of(st.integers(min_value=-14, max_value=16), st.sampled_from([-12, 14, 0.0, None]))
+    small_ints = st.integers(min_value=-1000, max_value=1000)
+
+    class TestDifferentialProperties(unittest.TestCase):
+        @settings(max_examples=200, deadline=None)
+        @given(st.lists(dates, max_size=40))
+        def test_parse(self, values):
+            check_parse(self, values)
+
+        @settings(max_examples=100, deadline=None)
+        @given(st.lists(dates, max_size=40), st.sampled_from(["%Y-%m-%d %H:%M:%S", "%A %j", "%B %d, %Y at %I:%M %p"]))
+        def test_format(self, values, format_string):
+            check_format(self, values, format_string)
+
+        @settings(max_examples=200, deadline=None)
+        @given(st.lists(st.tuples(dates, dates), max_size=40))
+        def test_difference(self, pairs):
+            check_difference(self, [start for start, _ in pairs], [end for _, end in pairs])
+
+        @settings(max_examples=200, deadline=None)
+        @given(st.lists(dates, max_size=40), small_ints, small_ints, small_ints)
+        def test_add_duration(self, values, days, hours, minutes):
+            check_add_duration(self, values, days, hours, minutes)
+
+        @settings(max_examples=200, deadline=None)
+        @given(st.lists(dates, max_size=20), st.integers(min_value=-1300, max_value=1300))
+        def test_add_months(self, values, months):
+            check_add_months(self, values, months)
+
+        @settings(max_examples=200, deadline=None)
+        @given(st.datetimes(min_value=datetime(1900, 1, 1), max_value=datetime(9000, 1, 1)), st.integers(min_value=-400, max_value=400),
+               st.integers(min_value=-40, max_value=40))
+        def test_calendar_difference(self, start, months, days):
+            check_calendar_difference(self, start, start + timedelta(days=months * 30 + days))
+
+        @settings(max_examples=100, deadline=None)
+        @given(st.lists(dates, max_size=40))
+        def test_day_of_week(self, values):
+            check_day_of_week(self, values)
+
+        @settings(max_examples=200, deadline=None)
+        @given(st.lists(dates, max_size=40), offsets, offsets)
+        def test_timezone(self, values, source_offset, target_offset):
+            check_timezone(self, values, source_offset, target_offset)
+            check_normalize(self, values, source_offset, target_offset)
+
+        @settings(max_examples=100, deadline=None)
+        @given(st.lists(datetimes, max_size=40))
+        def test_bulk_format(self, dts):
+            check_bulk_format(self, dts)
+
+        @settings(max_examples=100, deadline=None)
+        @given(st.lists(dates, max_size=40))
+        def test_date_dimension(self, values):
+            check_date_dimension(self, values)
+
+        @settings(max_examples=100, deadline=None)
+        @given(st.lists(datetimes, max_size=40))
+        def test_timestamp_array(self, dts):
+            check_timestamp_array(self, dts)
+
+else:
+    class TestDifferentialProperties(unittest.TestCase):
+        def test_properties(self):
+            self.skipTest("hypothesis not installed")
+
+
+if __name__ == '__main__':
+    unittest.main()
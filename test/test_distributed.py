@@ -0,0 +1,99 @@
+import json
+import socket
+import unittest
+from datetime import datetime
+
+import distributed
+import tolerant_batch
+
+
+class TestDistributed(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.workers = distributed.start_local_workers(3)
+        cls.addresses = [address for _, address in cls.workers]
+
+    @classmethod
+    def tearDownClass(cls):
+        for process, _ in cls.workers:
+            process.terminate()
+            process.wait()
+
+    def setUp(self):
+        self.rows = [f"2025-{month:02d}-{day:02d} 0{day % 10}:30:00" for month in range(1, 13) for day in range(1, 29)]
+        self.rows[5] = "2025-02-30"
+        self.rows[40] = datetime(2025, 2, 12, 9, 15)
+
+    def test_matches_local_batch_functions(self):
+        for operation, arguments in (("convert_timezone", {"source_offset": -5, "target_offset": 9}),
+                                     ("add_time_duration", {"days": 1, "minutes": 30}),
+                                     ("get_day_of_week", {}),
+                                     ("format_datetime", {"format_string": "%d %B %Y"})):
+            expected = distributed.execute(operation, [distributed._wire(row) for row in self.rows], arguments)
+            results, errors = distributed.run_distributed(self.rows, operation, self.addresses, arguments, max_rows=17)
+            self.assertEqual(errors, expected[1])
+            if operation in ("format_datetime", "get_day_of_week"):
+                self.assertEqual(results, expected[0])
+        results, errors = distributed.run_distributed(self.rows, "convert_timezone", self.addresses,
+                                                      {"source_offset": -5, "target_offset": -8})
+        self.assertEqual((results, errors), tolerant_batch.convert_timezone(self.rows, -5, -8))
+        pairs = list(zip(self.rows, reversed(self.rows)))
+        self.assertEqual(distributed.run_distributed(pairs, "calculate_date_difference", self.addresses),
+                         tolerant_batch.calculate_date_difference(self.rows, list(reversed(self.rows))))
+
+    def test_failed_workers_are_replaced(self):
+        crashing = distributed.start_local_workers(2, max_tasks=2)
+        try:
+            addresses = [address for _, address in crashing] + [("127.0.0.1", 1)] + self.addresses[:1]
+            results, errors = distributed.run_distributed(self.rows, "get_day_of_week", addresses, max_rows=10)
+            self.assertEqual((results, errors), tolerant_batch.get_day_of_week(self.rows))
+            with self.assertRaises(distributed.WorkerError):
+                distributed.run_distributed(self.rows, "get_day_of_week", [("127.0.0.1", 1)])
+        finally:
+            for process, _ in crashing:
+                process.terminate()
+                process.wait()
+
+    def test_partitions_are_deterministic(self):
+        self.assertEqual(distributed.partition(["2025-02-01", "2025-01-05", "2025-02-03", "2025-01-09"], max_rows=1),
+                         [[1], [3], [0], [2]])
+        with self.assertRaises(ValueError):
+            distributed.run_distributed(self.rows, "convert_timezone", self.addresses,
+                                        {"source_offset": -5, "target": 1})
+
+        self.assertEqual(distributed.month_key([datetime(2025, 2, 12, 9, 15), "2025-03-01"]), "2025-02")
+        self.assertEqual(distributed.month_key(datetime(987, 6, 5)), "0987-06")
+
+    def test_sub_second_datetimes_keep_their_microseconds(self):
+        rows = [datetime(2025, 3, 19, 8, 0, 0, 500000), "2025-03-19 08:00:00", datetime(1, 1, 1, 0, 0, 0, 1)]
+        for operation, arguments in (("add_time_duration", {"hours": 1}),
+                                     ("convert_timezone", {"source_offset": 0, "target_offset": 14})):
+            self.assertEqual(distributed.run_distributed(rows, operation, self.addresses, arguments),
+                             getattr(tolerant_batch, operation)(rows, **arguments))
+        self.assertEqual(distributed.run_distributed(rows, "add_time_duration", self.addresses, {"hours": 1})[0][0],
+                         datetime(2025, 3, 19, 9, 0, 0, 500000))
+        self.assertEqual(distributed.run_distributed(rows, "format_datetime", self.addresses,
+                                                     {"format_string": "%H:%M:%S.%f"})[0],
+                         ["08:00:00.500000", "08:00:00.000000", "00:00:00.000001"])
+        pairs = [[rows[0], rows[1]]]
+        self.assertEqual(distributed.run_distributed(pairs, "calculate_date_difference", self.addresses)[0][0]
+                         ["total_seconds"], -0.5)
+        self.assertEqual(distributed.execute("get_day_of_week", [{"datetime": "2025-03-19 08:00:00+01:00"}], {}),
+                         ([None], [(0, tolerant_batch.E_TYPE)]))
+
+    def test_bad_tasks_are_answered_without_killing_the_worker(self):
+        with self.assertRaisesRegex(ValueError, "row 1"):
+            distributed.execute("calculate_date_difference", [["2025-01-01", "2025-01-02"], ["2025-01-01"]], {})
+        tasks = [b"not json", b"[]", b'{"operation": "calculate_date_difference", "rows": [["2025-01-01"]]}',
+                 b'{"operation": "get_day_of_week", "rows": 5}',
+                 b'{"operation": "get_day_of_week", "rows": ["2025-03-19"]}']
+        with socket.create_connection(self.addresses[0]) as connection, connection.makefile("rwb") as stream:
+            stream.write(b"\n".join(tasks) + b"\n")
+            stream.flush()
+            replies = [json.loads(stream.readline()) for _ in tasks]
+        self.assertTrue(all("error" in reply for reply in replies[:-1]))
+        self.assertEqual(replies[-1], {"results": ["Wednesday"], "errors": []})
+
+
+if __name__ == '__main__':
+    unittest.main()
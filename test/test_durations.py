@@ -0,0 +1,45 @@
+import pickle
+import unittest
+from array import array
+from datetime import datetime, timedelta
+
+from durations import Duration, apply_duration, as_duration, compile_duration
+
+
+class TestDurations(unittest.TestCase):
+    def test_compact_and_iso_expressions(self):
+        self.assertEqual(compile_duration("2d5h30m").timedelta, timedelta(days=2, hours=5, minutes=30))
+        self.assertEqual(compile_duration("1w 2d").timedelta, timedelta(days=9))
+        self.assertEqual(compile_duration(" 2d  5h\t30m ").seconds, compile_duration("2d5h30m").seconds)
+        self.assertEqual(compile_duration("-90m").seconds, -5400)
+        self.assertEqual(compile_duration("P2DT5H"), compile_duration("2d5h"))
+        self.assertEqual(compile_duration("PT45S").seconds, 45)
+        self.assertIs(compile_duration("P1W"), compile_duration("P1W"))
+        for bad in ["", "P", "PT", "P1DT", "2h5d", "5x", "P1M", "1 2d", "2d 3 0m"]:
+            with self.assertRaises(ValueError):
+                compile_duration(bad)
+        with self.assertRaises(TypeError):
+            compile_duration(5)
+        with self.assertRaises(AttributeError):
+            compile_duration("1d").seconds = 0
+        self.assertEqual(pickle.loads(pickle.dumps(compile_duration("1d"))), Duration(86400))
+        self.assertEqual(as_duration(timedelta(seconds=-90)), Duration(-90))
+        for fractional in (timedelta(milliseconds=1500), timedelta(seconds=-1.5)):
+            with self.assertRaises(ValueError):
+                as_duration(fractional)
+
+    def test_apply_duration_to_batches(self):
+        bases = [datetime(2025, 3, 19), "2025-12-31 23:00:00"]
+        self.assertEqual(apply_duration(bases, "2h"), [datetime(2025, 3, 19, 2), datetime(2026, 1, 1, 1)])
+        self.assertEqual(apply_duration("2025-03-19", timedelta(days=2, hours=5)), datetime(2025, 3, 21, 5))
+        self.assertEqual(list(apply_duration(array("q", [0, 60]), Duration.from_parts(minutes=1))), [60, 120])
+        with self.assertRaises(OverflowError):
+            apply_duration([datetime(9999, 12, 31)], "1d")
+        precise = datetime(2025, 3, 19, 8, 0, 0, 123456)
+        self.assertEqual(apply_duration([precise, precise.isoformat(sep=" ")[:19]], "1h"),
+                         [datetime(2025, 3, 19, 9, 0, 0, 123456), datetime(2025, 3, 19, 9)])
+        self.assertEqual(apply_duration(precise, "1h"), datetime(2025, 3, 19, 9, 0, 0, 123456))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from parse_cache import PersistentParseCache
+
+
+class TestPersistentParseCache(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(handle)
+
+    def tearDown(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def test_entries_survive_across_instances(self):
+        with PersistentParseCache(self.path) as cache:
+            self.assertEqual(cache.lookup("2025-03-19"), (1742342400, 2, 20166))
+            self.assertEqual(cache.misses, 1)
+        with PersistentParseCache(self.path) as cache:
+            self.assertEqual(cache.to_datetime("2025-03-19"), datetime(2025, 3, 19))
+            self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_lru_eviction_keeps_recent_entries(self):
+        with PersistentParseCache(self.path, max_entries=2, touch_interval=0) as cache:
+            cache.lookup("2025-03-19")
+            cache.lookup("2025-03-20")
+            cache.lookup("2025-03-19")
+            cache.lookup("2025-03-21")
+            self.assertEqual(len(cache), 2)
+            cache.lookup("2025-03-19")
+            self.assertEqual(cache.misses, 3)
+
+    def test_misses_do_not_count_the_table(self):
+        with PersistentParseCache(self.path, max_entries=50) as cache:
+            cache.lookup_many([f"2025-01-{day:02d}" for day in range(1, 32)])
+            statements = []
+            cache._connection.set_trace_callback(statements.append)
+            for day in range(1, 29):
+                cache.lookup(f"2025-02-{day:02d}")
+            cache._connection.set_trace_callback(None)
+            self.assertFalse([statement for statement in statements if "COUNT" in statement])
+            self.assertEqual(len(cache), 50)
+            with PersistentParseCache(self.path, max_entries=40) as other:
+                self.assertEqual(other.evict(), 10)
+                other.lookup("2025-04-01")
+                self.assertEqual(len(other), 40)
+
+    def test_ttl_expires_entries_and_invalid_input_raises(self):
+        with PersistentParseCache(self.path, ttl_seconds=-1) as cache:
+            cache.lookup("2025-03-19")
+            cache.lookup("2025-03-19")
+            self.assertEqual(cache.hits, 0)
+            with self.assertRaises(ValueError):
+                cache.lookup_many(["2025-03-19", "19/03/2025"])
+            with self.assertRaises(TypeError):
+                cache.lookup(20250319)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+import planner
+from timestamps import TimestampArray
+
+
+class TestPlanner(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.strings = [f"{year:04d}-{month:02d}-{day:02d} {hour:02d}:15:30"
+                       for year in (999, 1970, 2024, 2025) for month in (1, 2, 12) for day in (1, 28)
+                       for hour in (0, 23)]
+        cls.dts = [datetime.fromisoformat(value) for value in cls.strings]
+
+    @classmethod
+    def tearDownClass(cls):
+        planner.set_workers()
+        planner.load_thresholds()
+        cls.directory.cleanup()
+
+    def use_thresholds(self, batch, parallel):
+        path = os.path.join(self.directory.name, f"thresholds-{batch}-{parallel}.json")
+        with open(path, "w") as out:
+            json.dump({"thresholds": {operation: {"batch": batch, "parallel": parallel}
+                                      for operation in planner.OPERATIONS}}, out)
+        planner.load_thresholds(path)
+
+    def run_everywhere(self, function, *args):
+        """Run a call on the scalar, batch and parallel paths and check that they agree."""
+        planner.set_workers(2)
+        outcomes = []
+        for batch, parallel in ((10 ** 9, None), (1, None), (1, 1)):
+            self.use_thresholds(batch, parallel)
+            try:
+                outcomes.append(function(*args))
+            except (TypeError, ValueError, OverflowError) as error:
+                outcomes.append(type(error))
+        self.assertEqual(planner.stats()["last"][function.__name__], "parallel")
+        self.assertEqual(outcomes[0], outcomes[1])
+        self.assertEqual(outcomes[0], outcomes[2])
+        return outcomes[0]
+
+    def test_paths_agree(self):
+        self.assertEqual(self.run_everywhere(planner.convert_string_to_datetime, self.strings), self.dts)
+        self.assertEqual(self.run_everywhere(planner.format_datetime, self.dts)[0], "999-01-01 00:15:30")
+        self.assertEqual(self.run_everywhere(planner.format_datetime, self.dts[-5:])[-1], "2025-12-28 23:15:30")
+        self.run_everywhere(planner.format_datetime, TimestampArray(self.dts), "%d %B %Y %A")
+        self.run_everywhere(planner.calculate_date_difference, self.strings, self.dts[::-1])
+        self.run_everywhere(planner.add_time_duration, TimestampArray(self.dts), 1, 2, 3)
+        self.assertEqual(planner.add_time_duration(iter(self.strings), -1),
+                         self.run_everywhere(planner.add_time_duration, self.strings, -1))
+        self.run_everywhere(planner.get_day_of_week, self.strings)
+        self.run_everywhere(planner.convert_timezone, self.dts, -5, 14)
+
+    def test_errors_agree(self):
+        self.assertIs(self.run_everywhere(planner.convert_string_to_datetime, ["2025-01-01", "2025-02-30"]),
+                      ValueError)
+        self.assertIs(self.run_everywhere(planner.format_datetime, ["2025-01-01"]), TypeError)
+        self.assertIs(self.run_everywhere(planner.convert_timezone, self.dts, -5, 15), ValueError)
+        with self.assertRaises(TypeError):
+            planner.add_time_duration(self.dts, 1.5)
+        with self.assertRaises(ValueError):
+            planner.calculate_date_difference(self.dts, self.dts[1:])
+        with self.assertRaises(TypeError):
+            planner.get_day_of_week(20250101)
+
+    def test_scalars_and_stats(self):
+        self.use_thresholds(4, None)
+        planner.reset_stats()
+        self.assertEqual(planner.convert_timezone(self.dts[0], 0, 1), datetime(999, 1, 1, 1, 15, 30))
+        self.assertEqual(planner.stats()["last"]["convert_timezone"], "scalar")
+        names = [dt.strftime("%A") for dt in self.dts]
+        self.assertEqual(planner.get_day_of_week(self.strings[:3]), names[:3])
+        self.assertEqual(planner.get_day_of_week(self.strings[:4]), names[:4])
+        report = planner.stats()
+        self.assertEqual(report["last"]["get_day_of_week"], "batch")
+        self.assertEqual(report["paths"]["get_day_of_week"]["scalar"]["rows"], 3)
+        self.assertEqual(report["paths"]["get_day_of_week"]["batch"]["calls"], 1)
+        self.assertEqual(report["thresholds"]["get_day_of_week"], {"batch": 4, "parallel": None})
+        self.assertEqual(planner.calculate_date_difference([], []), [])
+
+    def test_calibrate(self):
+        path = os.path.join(self.directory.name, "calibrated.json")
+        planner.set_workers(1)
+        thresholds = planner.calibrate(path)
+        with open(path) as source:
+            self.assertEqual(json.load(source)["thresholds"], thresholds)
+        self.assertEqual(set(thresholds), set(planner.OPERATIONS))
+        for values in thresholds.values():
+            self.assertIsNone(values["parallel"])
+            self.assertGreaterEqual(values["batch"], 1)
+        self.assertEqual(planner.stats()["thresholds"], thresholds)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import distributed
+import query_server
+
+
+class TestQueryServer(unittest.TestCase):
+    def setUp(self):
+        self.server = query_server.QueryServer(max_batch=4)
+        self.rows = ["2025-03-19 14:30:00", "2025-02-30", "2025-12-31 23:59:59", "bad", "2024-02-29"]
+
+    async def _exchange(self, requests, unix=False):
+        # Writes every request before reading, so the replies are pipelined;
+        # bytes requests are sent as they are.
+        if unix:
+            directory = tempfile.TemporaryDirectory()
+            self.addCleanup(directory.cleanup)
+            path = os.path.join(directory.name, "server.sock")
+            listener = await self.server.serve_unix(path)
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            listener = await self.server.serve_tcp(port=0)
+            reader, writer = await asyncio.open_connection(*listener.sockets[0].getsockname()[:2])
+        async with listener:
+            writer.write(b"".join((request if isinstance(request, bytes) else json.dumps(request).encode("utf-8"))
+                                  + b"\n" for request in requests))
+            await writer.drain()
+            replies = [json.loads(await reader.readline()) for _ in requests]
+            writer.close()
+        return replies
+
+    def exchange(self, requests, unix=False):
+        return asyncio.run(self._exchange(requests, unix))
+
+    def test_single_rows_match_batch_functions(self):
+        for operation, arguments in (("convert_timezone", {"source_offset": -5, "target_offset": 9}),
+                                     ("add_time_duration", {"days": 1, "minutes": 30}),
+                                     ("get_day_of_week", {}),
+                                     ("format_datetime", {"format_string": "%d %B %Y"}),
+                                     ("convert_string_to_datetime", {})):
+            results, errors = distributed.execute(operation, self.rows, arguments)
+            failed = dict(errors)
+            replies = self.exchange([{"id": index, "op": operation, "value": row, "arguments": arguments}
+                                     for index, row in enumerate(self.rows)])
+            self.assertEqual([reply["id"] for reply in replies], list(range(len(self.rows))))
+            self.assertEqual([reply["result"] for reply in replies], results)
+            self.assertEqual([reply["errors"] for reply in replies],
+                             [[[0, failed[row]]] if row in failed else [] for row in range(len(self.rows))])
+
+    def test_batches_and_mixed_pipelines(self):
+        pairs = [[self.rows[0], self.rows[2]], [self.rows[1], self.rows[4]]]
+        replies = self.exchange([
+            {"id": "a", "op": "get_day_of_week", "values": self.rows},
+            {"id": "b", "op": "calculate_date_difference", "value": pairs[0]},
+            {"id": "c", "op": "calculate_date_difference", "values": pairs, "arguments": {"calendar": True}},
+            {"id": "d", "op": "stats"},
+        ], unix=True)
+        results, errors = distributed.execute("get_day_of_week", self.rows, {})
+        self.assertEqual(replies[0], {"id": "a", "result": results, "errors": [list(error) for error in errors]})
+        self.assertEqual(replies[1]["result"], distributed.execute("calculate_date_difference", pairs[:1], {})[0][0])
+        self.assertEqual(replies[2]["errors"], [[1, 2]])
+        self.assertIn("get_day_of_week[batch]", replies[3]["result"])
+
+    def test_malformed_requests_get_errors(self):
+        replies = self.exchange([
+            {"id": 1, "op": "nope", "value": "2025-01-01"},
+            {"id": 2, "op": "convert_timezone", "value": "2025-01-01", "arguments": {"offset": 1}},
+            {"id": 3, "op": "get_day_of_week"},
+            {"id": 4, "op": "get_day_of_week", "value": "2025-01-01"},
+        ])
+        self.assertEqual([sorted(reply) for reply in replies[:3]], [["error", "id"]] * 3)
+        self.assertEqual(replies[3], {"id": 4, "result": "Wednesday", "errors": []})
+
+    def test_bad_rows_do_not_fail_their_batch(self):
+        pair = ["2025-01-01", "2025-01-02 12:00:00"]
+        replies = self.exchange([
+            {"id": 1, "op": "calculate_date_difference", "value": 5},
+            {"id": 2, "op": "calculate_date_difference", "value": []},
+            {"id": 3, "op": "calculate_date_difference", "value": pair},
+            b"{not json",
+            {"id": 5, "op": "calculate_date_difference", "value": pair, "arguments": []},
+            {"id": 6, "op": "calculate_date_difference", "value": pair},
+        ])
+        self.assertEqual([sorted(reply) for reply in replies], [["error", "id"]] * 2 + [["errors", "id", "result"]]
+                         + [["error", "id"]] * 2 + [["errors", "id", "result"]])
+        self.assertIsNone(replies[3]["id"])
+        self.assertEqual(replies[2]["result"], replies[5]["result"])
+
+        def fail_batches(operation, rows, arguments):
+            if len(rows) > 1:
+                raise RuntimeError("batch failed")
+            return distributed.execute(operation, rows, arguments)
+        with mock.patch.object(query_server, "execute", side_effect=fail_batches) as execute:
+            replies = self.exchange([{"id": day, "op": "get_day_of_week", "value": f"2025-03-{day:02d}"}
+                                     for day in (17, 18, 19)])
+        self.assertEqual([reply["result"] for reply in replies], ["Monday", "Tuesday", "Wednesday"])
+        self.assertEqual(execute.call_count, 4)
+
+    def test_batches_do_not_block_single_rows(self):
+        single_done = threading.Event()
+
+        def slow_batches(operation, rows, arguments):
+            # A batch that ran on the event loop would wait out the timeout here.
+            if len(rows) > 1:
+                self.assertTrue(single_done.wait(5))
+            else:
+                single_done.set()
+            return distributed.execute(operation, rows, arguments)
+
+        async def run():
+            listener = await self.server.serve_tcp(port=0)
+            address = listener.sockets[0].getsockname()[:2]
+            async with listener:
+                batch_reader, batch_writer = await asyncio.open_connection(*address)
+                batch_writer.write(json.dumps({"id": 1, "op": "get_day_of_week", "values": self.rows}).encode() + b"\n")
+                await batch_writer.drain()
+                await asyncio.sleep(0.05)
+                reader, writer = await asyncio.open_connection(*address)
+                writer.write(json.dumps({"id": 2, "op": "get_day_of_week", "value": self.rows[0]}).encode() + b"\n")
+                await writer.drain()
+                replies = [json.loads(await reader.readline()), json.loads(await batch_reader.readline())]
+                writer.close()
+                batch_writer.close()
+            return replies
+        with mock.patch.object(query_server, "execute", side_effect=slow_batches):
+            replies = asyncio.run(run())
+        self.assertEqual(replies[0], {"id": 2, "result": "Wednesday", "errors": []})
+        self.assertEqual(replies[1]["result"], distributed.execute("get_day_of_week", self.rows, {})[0])
+
+    def test_error_replies_are_recorded(self):
+        self.exchange([
+            {"id": 1, "op": "nope", "value": "2025-01-01"},
+            {"id": 2, "op": "convert_timezone", "values": ["2025-01-01"], "arguments": {"offset": 1}},
+            {"id": 3, "op": "get_day_of_week"},
+            b"{not json",
+        ])
+        stats = self.server.stats()
+        self.assertEqual(stats["invalid[error]"]["count"], 2)
+        self.assertEqual(stats["convert_timezone[error]"]["count"], 1)
+        self.assertEqual(stats["get_day_of_week[error]"]["count"], 1)
+
+    def test_concurrent_requests_are_coalesced(self):
+        async def run():
+            listener = await self.server.serve_tcp(port=0)
+            async with listener:
+                report = await query_server.run_load(*listener.sockets[0].getsockname()[:2],
+                                                     clients=8, requests_per_client=25, pipeline=5)
+            return report
+        with mock.patch.object(query_server, "execute", wraps=distributed.execute) as execute:
+            report = asyncio.run(run())
+        self.assertEqual(report["requests"], 200)
+        self.assertLess(execute.call_count, 200)
+        stats = self.server.stats()
+        self.assertEqual(sum(summary["count"] for summary in stats.values()), 200)
+        for summary in stats.values():
+            self.assertLessEqual(summary["p50_us"], summary["p99_us"])
+
+    def test_histogram_percentiles(self):
+        histogram = query_server.LatencyHistogram()
+        for micros in [3] * 98 + [1000, 5000]:
+            histogram.record(micros / 1e6)
+        self.assertEqual(histogram.percentile(0.5), 4)
+        self.assertEqual(histogram.percentile(0.99), 1024)
+        self.assertEqual(histogram.summary()["buckets"], {"4": 98, "1024": 1, "8192": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+import roster
+from datetime_kernels import SECONDS_PER_DAY, SECONDS_PER_HOUR
+
+
+def brute_force_violations(shifts, min_rest_hours=11, max_weekly_hours=48):
+    """Pairwise reference: compare every shift with every other shift of the same worker."""
+    found = set()
+    for i, (worker, start, end) in enumerate(shifts):
+        earlier = [j for j, other in enumerate(shifts)
+                   if j != i and other[0] == worker and (other[1], j) < (start, i)]
+        if earlier:
+            latest_end = max(shifts[j][2] for j in earlier)
+            if start < latest_end:
+                found.add((roster.OVERLAP, i))
+            elif start - latest_end < min_rest_hours * SECONDS_PER_HOUR:
+                found.add((roster.REST_PERIOD, i))
+        window = sum(other[2] - other[1] for j, other in enumerate(shifts)
+                     if other[0] == worker and start - 7 * SECONDS_PER_DAY < other[1] <= start
+                     and (other[1], j) <= (start, i))
+        if window > max_weekly_hours * SECONDS_PER_HOUR:
+            found.add((roster.WEEKLY_HOURS, i))
+    return found
+
+
+class TestRoster(unittest.TestCase):
+    def test_make_shift_uses_duration_semantics(self):
+        self.assertEqual(roster.make_shift("a", "1970-01-01", days=1, hours=2, minutes=3),
+                         ("a", 0, SECONDS_PER_DAY + 2 * SECONDS_PER_HOUR + 180))
+        with self.assertRaises(TypeError):
+            roster.make_shift("a", "1970-01-01", hours="8")
+        with self.assertRaises(ValueError):
+            roster.make_shift("a", "1970-01-01", hours=-1)
+
+    def test_detects_each_violation_type(self):
+        shifts = [
+            roster.make_shift("a", "2025-03-17 08:00:00", hours=12),
+            roster.make_shift("a", "2025-03-17 18:00:00", hours=4),
+            roster.make_shift("b", "2025-03-17 22:00:00", hours=8),
+            roster.make_shift("b", "2025-03-18 14:00:00", hours=8),
+        ]
+        shifts += [roster.make_shift("c", f"2025-03-{day} 08:00:00", hours=12) for day in range(17, 22)]
+        found = {(v["type"], v["worker"]) for v in roster.find_violations(shifts)}
+        self.assertEqual(found, {(roster.OVERLAP, "a"), (roster.REST_PERIOD, "b"), (roster.WEEKLY_HOURS, "c")})
+
+    def test_matches_brute_force_on_synthetic_rosters(self):
+        for seed in range(5):
+            shifts = roster.generate_roster(workers=6, days=30, shifts_per_week=6, swap_rate=2, seed=seed)
+            fast = {(v["type"], v["shift"]) for v in roster.find_violations(shifts)}
+            self.assertEqual(fast, brute_force_violations(shifts))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from slot_engine import SlotEngine
+
+
+def brute_force_slots(busy, after, duration_minutes, count, working_hours=(9, 17),
+                      working_days=(0, 1, 2, 3, 4), granularity_minutes=15, horizon_days=62):
+    """Reference: test every aligned candidate minute by minute against every booking."""
+    step = timedelta(minutes=granularity_minutes)
+    duration = timedelta(minutes=duration_minutes)
+    midnight = datetime(after.year, after.month, after.day)
+    candidate = midnight
+    while candidate < after:
+        candidate += step
+    slots = []
+    while candidate < midnight + timedelta(days=horizon_days) and len(slots) < count:
+        day_start = datetime(candidate.year, candidate.month, candidate.day)
+        open_ok = (candidate.weekday() in working_days
+                   and candidate >= day_start + timedelta(hours=working_hours[0])
+                   and candidate + duration <= day_start + timedelta(hours=working_hours[1]))
+        free = all(candidate + duration <= start or candidate >= end for start, end in busy)
+        if open_ok and free:
+            slots.append(candidate)
+            candidate += duration
+            while (candidate - midnight) % step:
+                candidate += timedelta(minutes=1)
+        else:
+            candidate += step
+    return slots
+
+
+class TestSlotEngine(unittest.TestCase):
+    def test_busy_intervals_are_merged(self):
+        engine = SlotEngine()
+        engine.add_clinician("a")
+        engine.add_busy("a", "2025-03-19 10:00:00", "2025-03-19 11:00:00")
+        engine.add_busy("a", "2025-03-19 12:00:00", "2025-03-19 13:00:00")
+        engine.add_busy("a", "2025-03-19 10:30:00", "2025-03-19 12:00:00")
+        self.assertEqual(engine.busy_intervals("a"),
+                         [(datetime(2025, 3, 19, 10), datetime(2025, 3, 19, 13))])
+        with self.assertRaises(ValueError):
+            engine.add_busy("a", "2025-03-19 10:00:00", "2025-03-19 10:00:00")
+        with self.assertRaises(KeyError):
+            engine.find_slots("missing", "2025-03-19", 30)
+        for count in (0, -1, 1.5, True):
+            with self.assertRaises(ValueError):
+                engine.find_slots("a", "2025-03-19", 30, count=count)
+
+    def test_sub_second_bounds_are_rounded_outward(self):
+        engine = SlotEngine()
+        engine.add_clinician("a")
+        engine.add_busy("a", "2025-03-19 09:00:00", datetime(2025, 3, 19, 9, 59, 59, 500000))
+        self.assertEqual(engine.find_slots("a", datetime(2025, 3, 19, 9, 0, 0, 1), 15, count=1),
+                         [datetime(2025, 3, 19, 10)])
+        self.assertEqual(engine.find_slots("a", datetime(2025, 3, 19, 10, 0, 0, 1), 15, count=1),
+                         [datetime(2025, 3, 19, 10, 15)])
+
+    def test_query_offset_is_converted_like_convert_timezone(self):
+        engine = SlotEngine()
+        engine.add_clinician("pacific", offset=-8)
+        # 14:00 Eastern is 11:00 Pacific; the slot is reported back in Eastern time.
+        self.assertEqual(engine.find_slots("pacific", "2025-03-19 14:00:00", 60, offset=-5),
+                         [datetime(2025, 3, 19, 14, 0)])
+        self.assertEqual(engine.find_slots("pacific", "2025-03-19 06:00:00", 60, offset=-5),
+                         [datetime(2025, 3, 19, 12, 0)])
+
+    def test_matches_brute_force_reference(self):
+        rng = random.Random(7)
+        for trial in range(40):
+            engine = SlotEngine()
+            engine.add_clinician(trial)
+            busy = []
+            for _ in range(rng.randrange(0, 25)):
+                start = datetime(2025, 3, 17) + timedelta(minutes=rng.randrange(0, 10 * 1440, 5))
+                end = start + timedelta(minutes=rng.randrange(5, 300, 5))
+                busy.append((start, end))
+                engine.add_busy(trial, start, end)
+            after = datetime(2025, 3, 17) + timedelta(minutes=rng.randrange(0, 5 * 1440))
+            duration = rng.choice([10, 15, 20, 30, 45, 60, 90])
+            count = rng.randrange(1, 12)
+            self.assertEqual(engine.find_slots(trial, after, duration, count=count),
+                             brute_force_slots(busy, after, duration, count))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import io
+import unittest
+from array import array
+from datetime import datetime
+
+import batch_processor
+import tolerant_batch
+from bulk_format import BulkWriter
+from calendar_arithmetic import add_months_batch
+from durations import apply_duration
+from timestamps import TimestampArray
+
+
+class TestTimestampArray(unittest.TestCase):
+    def setUp(self):
+        self.strings = ["2025-03-19 14:30:00", "2024-02-29", "1999-12-31 23:59:59", "2025-01-01 08:00:00"]
+        self.dts = batch_processor.convert_strings_to_datetimes(self.strings)
+        self.times = TimestampArray(self.strings)
+
+    def test_sequence_behaviour(self):
+        self.assertEqual(list(self.times), self.dts)
+        self.assertEqual(TimestampArray.from_strings(self.strings), self.times)
+        self.assertEqual(TimestampArray(self.dts), self.times)
+        self.assertEqual(self.times[-1], self.dts[-1])
+        self.assertEqual(list(self.times[1:3]), self.dts[1:3])
+        self.assertEqual(list(reversed(self.times)), self.dts[::-1])
+        self.assertIn(self.dts[2], self.times)
+        self.assertNotIn("2000-01-01", self.times)
+        self.assertNotIn(42, self.times)
+        self.assertEqual(self.times.index("2024-02-29"), 1)
+        self.assertEqual(self.times.count(self.dts[0]), 1)
+
+        with self.assertRaises(ValueError):
+            self.times.append(datetime(2030, 1, 1, 12, 0, 0, 999))
+        self.assertEqual(self.times.count(datetime(2030, 1, 1, 12, 0, 0, 999)), 0)
+        self.times.append(datetime(2030, 1, 1, 12))
+        self.times.extend(["2001-01-01"])
+        self.times.insert(0, "2002-02-02")
+        self.times[1] = "2003-03-03"
+        self.times[2:4] = TimestampArray(["2004-04-04"])
+        del self.times[-1]
+        self.assertEqual([dt.isoformat(sep=" ") for dt in self.times],
+                         ["2002-02-02 00:00:00", "2003-03-03 00:00:00", "2004-04-04 00:00:00",
+                          "2025-01-01 08:00:00", "2030-01-01 12:00:00"])
+        self.times.sort(reverse=True)
+        self.assertEqual(self.times[0], datetime(2030, 1, 1, 12))
+        self.times.sort()
+        self.assertEqual(list(self.times), sorted(self.times))
+        self.assertEqual(self.times.nbytes, 40)
+        self.assertIn("2002-02-02 00:00:00", repr(self.times))
+
+    def test_invalid_values(self):
+        with self.assertRaises(ValueError):
+            TimestampArray(["2025-02-30"])
+        with self.assertRaises(TypeError):
+            self.times.append(20250101)
+        with self.assertRaises(OverflowError):
+            TimestampArray.from_epochs([10 ** 12])
+        epochs = array("q", [0])
+        self.assertIs(TimestampArray.from_epochs(epochs).epochs, epochs)
+
+    def test_existing_functions_accept_it(self):
+        self.assertEqual(batch_processor.convert_timezones(self.times, -5, 3),
+                         batch_processor.convert_timezones(self.dts, -5, 3))
+        self.assertEqual(batch_processor.calculate_date_differences(self.times, self.times[::-1]),
+                         batch_processor.calculate_date_differences(self.dts, self.dts[::-1]))
+        for function, arguments in ((tolerant_batch.get_day_of_week, ()),
+                                    (tolerant_batch.convert_timezone, (-5, 3)),
+                                    (tolerant_batch.add_time_duration, (1, 2, 3)),
+                                    (tolerant_batch.format_datetime, ())):
+            self.assertEqual(function(self.times, *arguments), function(self.dts, *arguments))
+        shifted = apply_duration(self.times, "2d5h")
+        self.assertIsInstance(shifted, TimestampArray)
+        self.assertEqual(list(shifted), apply_duration(self.dts, "2d5h"))
+        months = add_months_batch(self.times, 13)
+        self.assertIsInstance(months, TimestampArray)
+        self.assertEqual(list(months), add_months_batch(self.dts, 13))
+        packed, plain = io.BytesIO(), io.BytesIO()
+        with BulkWriter(packed) as writer:
+            writer.write_datetimes(self.times)
+        with BulkWriter(plain) as writer:
+            writer.write_datetimes(self.dts)
+        self.assertEqual(packed.getvalue(), plain.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from unittest import mock
+from datetime import datetime, timedelta
+
+import tolerant_batch as tb
+
+
+class TestTolerantBatch(unittest.TestCase):
+    def test_bad_rows_are_reported_not_raised(self):
+        values = ["2025-03-19 14:30:00", "2025-03-32", 42, datetime(2025, 12, 31, 23, 0)]
+        results, errors = tb.convert_timezone(values, -5, 3)
+        self.assertEqual(results, [datetime(2025, 3, 19, 22, 30), None, None, datetime(2026, 1, 1, 7, 0)])
+        self.assertEqual(errors, [(1, tb.E_DATE), (2, tb.E_TYPE)])
+        self.assertEqual(tb.describe_errors(errors[1:]), ["row 2: expected a datetime or date string"])
+
+    def test_invalid_batch_arguments_mark_every_row(self):
+        self.assertEqual(tb.convert_timezone(["2025-03-19"] * 2, -13, 0),
+                         ([None, None], [(0, tb.E_OFFSET_RANGE), (1, tb.E_OFFSET_RANGE)]))
+        self.assertEqual(tb.convert_timezone(["2025-03-19"], "-5", 0)[1], [(0, tb.E_OFFSET_TYPE)])
+        self.assertEqual(tb.add_time_duration(["2025-03-19"], days=1.5)[1], [(0, tb.E_DURATION_TYPE)])
+        self.assertEqual(tb.format_datetime([datetime(2025, 3, 19)], None)[1], [(0, tb.E_FORMAT_TYPE)])
+        self.assertEqual(tb.format_datetime([datetime(2025, 3, 19)] * 2, "%Y \ud800"),
+                         ([None, None], [(0, tb.E_FORMAT), (1, tb.E_FORMAT)]))
+        self.assertEqual(tb.add_time_duration((value for value in ["2025-03-19"] * 2), days="1"),
+                         ([None, None], [(0, tb.E_DURATION_TYPE), (1, tb.E_DURATION_TYPE)]))
+        self.assertEqual(tb.convert_timezone(iter(["2025-03-19"]), 0, 15), ([None], [(0, tb.E_OFFSET_RANGE)]))
+
+    def test_bad_rows_never_reach_strptime(self):
+        feed = ["19/03/2025", "2025-3-19", "2025-02-30", "2025-03-19T14:30:00", "", "2025-03-19 14:30:00"] * 200
+        with mock.patch("_strptime._strptime", side_effect=AssertionError("strptime called")) as strptime:
+            results, errors = tb.convert_string_to_datetime(feed)
+            tb.get_day_of_week(feed)
+        self.assertEqual(strptime.call_count, 0)
+        self.assertEqual(results[1], datetime(2025, 3, 19))
+        self.assertEqual(len(errors), 800)
+
+    def test_remaining_functions(self):
+        self.assertEqual(tb.format_datetime([datetime(2025, 3, 19, 14, 30), "2025-03-19"], "%B %d, %Y"),
+                         (["March 19, 2025", None], [(1, tb.E_TYPE)]))
+        diffs, errors = tb.calculate_date_difference(["2025-03-19", "bad", "2025-03-19"], ["2025-03-26", "bad"])
+        self.assertEqual(diffs[0], {"days": 7, "hours": 168, "minutes": 10080, "total_seconds": 604800})
+        self.assertEqual(diffs[1:], [None, None])
+        self.assertEqual(errors, [(1, tb.E_DATE), (2, tb.E_LENGTH)])
+        self.assertEqual(tb.add_time_duration([datetime(2025, 3, 19), datetime(9999, 12, 31)], days=2, hours=5),
+                         ([datetime(2025, 3, 21, 5, 0), None], [(1, tb.E_RANGE)]))
+        self.assertEqual(tb.get_day_of_week(["2025-03-19", datetime(2025, 3, 23)]), (["Wednesday", "Sunday"], []))
+
+    def test_microseconds_are_carried_through(self):
+        base = datetime(2025, 3, 19, 23, 59, 59, 999999)
+        self.assertEqual(tb.add_time_duration([base], minutes=1), ([base + timedelta(minutes=1)], []))
+        self.assertEqual(tb.convert_timezone([base], 0, 14), ([base + timedelta(hours=14)], []))
+        diffs, errors = tb.calculate_date_difference([base], ["2025-03-20"], calendar=True)
+        self.assertEqual(diffs[0]["total_seconds"], 0.000001)
+        self.assertEqual((diffs[0]["days"], diffs[0]["months"]), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
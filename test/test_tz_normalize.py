@@ -0,0 +1,81 @@
+import random
+import unittest
+from datetime import datetime
+
+import tolerant_batch
+import tz_normalize
+from batch_processor import convert_timezones
+
+
+class TestTimezoneNormalization(unittest.TestCase):
+    def test_split_offset(self):
+        cases = {
+            "2025-03-19 14:30:00-05:00": ("2025-03-19 14:30:00", -5),
+            "2025-03-19 14:30:00 +0900": ("2025-03-19 14:30:00", 9),
+            "2025-03-19 14:30:00Z": ("2025-03-19 14:30:00", 0),
+            "2025-03-19 14:30:00 GMT-3": ("2025-03-19 14:30:00", -3),
+            "2025-03-19 UTC": ("2025-03-19", 0),
+            "2025-03-19+14": ("2025-03-19", 14),
+            "2025-03-19-05": ("2025-03-19", -5),
+            "2025-03-19": ("2025-03-19", None),
+            "2025-03-19 14:30:00": ("2025-03-19 14:30:00", None),
+            "2025-03-19 14:30:00 EST": ("2025-03-19 14:30:00 EST", None),
+        }
+        for value, expected in cases.items():
+            self.assertEqual(tz_normalize.split_offset(value), expected, value)
+        with self.assertRaises(ValueError):
+            tz_normalize.split_offset("2025-03-19 14:30:00+05:30")
+
+    def test_matches_per_row_conversion(self):
+        rng = random.Random(7)
+        site_offsets = {"nyc": -5, "lon": 0, "tyo": 9, "akl": 13}
+        values, sites, expected = [], [], []
+        for _ in range(2000):
+            site = rng.choice(sorted(site_offsets) + ["unknown"])
+            base = f"2025-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d} {rng.randrange(24):02d}:15:00"
+            source = site_offsets.get(site, -8)
+            if rng.random() < 0.3:
+                source = rng.randrange(-12, 15)
+                value = f"{base}{'+' if source >= 0 else '-'}{abs(source):02d}:00"
+            else:
+                value = rng.choice([base, datetime.fromisoformat(base)])
+            values.append(value)
+            sites.append(site)
+            expected.append(convert_timezones([base], source, 2)[0])
+        self.assertEqual(tz_normalize.normalize_timezones(values, 2, sites, site_offsets, default_offset=-8), expected)
+        targets = [rng.randrange(-12, 15) for _ in values]
+        shifted = tz_normalize.normalize_epochs(values, targets, sites, site_offsets, default_offset=-8)
+        for value, seconds, target, site in zip(values, shifted, targets, sites):
+            base, source = tz_normalize.split_offset(value) if isinstance(value, str) else (value, None)
+            if source is None:
+                source = site_offsets.get(site, -8)
+            self.assertEqual(tz_normalize.epoch_to_datetime(seconds),
+                             tolerant_batch.convert_timezone([base], source, target)[0][0])
+
+    def test_errors(self):
+        with self.assertRaisesRegex(ValueError, "row 1"):
+            tz_normalize.normalize_epochs(["2025-01-01Z", "2025-01-01"], 0, ["a", "b"], {"a": 1})
+        with self.assertRaises(ValueError):
+            tz_normalize.normalize_epochs(["2025-01-01"], 0, ["a", "b"], {"a": 1})
+        with self.assertRaises(ValueError):
+            tz_normalize.normalize_epochs(["2025-01-01"], 15, default_offset=0)
+        with self.assertRaises(ValueError):
+            tz_normalize.normalize_epochs(["2025-01-01"], [0, 1], default_offset=0)
+        with self.assertRaises(ValueError):
+            tz_normalize.normalize_epochs(["2025-02-30+01"], 0)
+        with self.assertRaises(TypeError):
+            tz_normalize.normalize_epochs([20250101], 0, default_offset=0)
+        self.assertEqual(len(tz_normalize.normalize_epochs([], 0)), 0)
+        with self.assertRaisesRegex(ValueError, "row 0"):
+            tz_normalize.normalize_epochs([datetime(2025, 1, 1, 0, 0, 0, 5)], 0, default_offset=0)
+        with self.assertRaisesRegex(OverflowError, "row 2"):
+            tz_normalize.normalize_epochs(["9999-12-31", "0001-01-01 12:00:00", "9999-12-31 23:00:00-05"], 0,
+                                          default_offset=0)
+        with self.assertRaisesRegex(OverflowError, "row 1"):
+            tz_normalize.normalize_timezones(["2025-01-01", "0001-01-01 01:00:00"], -12, default_offset=0)
+        self.assertEqual(tz_normalize.normalize_timezones([datetime(2025, 1, 1, 0, 0, 0, 5)], 1, default_offset=0),
+                         [datetime(2025, 1, 1, 1, 0, 0, 5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
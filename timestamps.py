@@ -0,0 +1,152 @@
+"""
+Timestamps - A compact container for large collections of datetimes
+
+A list of datetime objects costs around 50 bytes per element (the datetime
+object plus an 8-byte list pointer). TimestampArray keeps the same values as
+whole epoch seconds in one packed array('q') - 8 bytes each - and only builds
+datetime objects when elements are read, so tens of millions of results fit
+in a fraction of the memory.
+
+TimestampArray is a mutable sequence of naive datetimes and can be passed
+anywhere a list of datetimes is accepted. The batch functions in
+batch_processor, tolerant_batch, durations, calendar_arithmetic and
+bulk_format recognise it and read its epochs directly instead of
+materializing datetimes. Only whole seconds are stored: datetimes with
+microseconds are rejected with ValueError rather than truncated.
+"""
+
+import heapq
+from array import array
+from collections.abc import MutableSequence
+from itertools import islice
+
+from datetime_kernels import MAX_EPOCH, MIN_EPOCH, epoch_to_datetime, parse_to_epoch, whole_epoch
+
+# Values sorted per run by TimestampArray.sort() before the runs are merged
+_SORT_RUN = 1 << 16
+
+
+class TimestampArray(MutableSequence):
+    """
+    A mutable sequence of datetimes stored as packed epoch seconds.
+
+    Parameters:
+    values (iterable): Whole-second datetimes and/or 'YYYY-MM-DD [HH:MM:SS]' strings
+
+    Raises:
+    ValueError: If a date string is invalid or a datetime has microseconds
+
+    Example:
+    >>> times = TimestampArray(["2025-03-19 14:30:00", "2025-01-02"])
+    >>> times.append("2025-02-01 08:00:00")
+    >>> times.sort()
+    >>> times[0], len(times), times.epochs.itemsize
+    (datetime.datetime(2025, 1, 2, 0, 0), 3, 8)
+    >>> times[1:].epochs
+    array('q', [1738396800, 1742394600])
+    """
+
+    __slots__ = ("epochs",)
+
+    def __init__(self, values=()):
+        self.epochs = array("q", [whole_epoch(value) for value in values])
+
+    @classmethod
+    def from_epochs(cls, epochs):
+        """Build a TimestampArray from epoch seconds; an array('q') is used without copying."""
+        if not (isinstance(epochs, array) and epochs.typecode == "q"):
+            epochs = array("q", epochs)
+            if epochs and (min(epochs) < MIN_EPOCH or max(epochs) > MAX_EPOCH):
+                raise OverflowError("Value is outside the supported datetime range")
+        instance = cls.__new__(cls)
+        instance.epochs = epochs
+        return instance
+
+    @classmethod
+    def from_strings(cls, date_strings):
+        """Parse date strings straight into a TimestampArray without building datetimes."""
+        return cls.from_epochs(array("q", [parse_to_epoch(value) for value in date_strings]))
+
+    @property
+    def nbytes(self):
+        """Size of the packed epoch buffer in bytes."""
+        return len(self.epochs) * self.epochs.itemsize
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TimestampArray.from_epochs(self.epochs[index])
+        return epoch_to_datetime(self.epochs[index])
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.epochs[index] = _as_epochs(value)
+        else:
+            self.epochs[index] = whole_epoch(value)
+
+    def __delitem__(self, index):
+        del self.epochs[index]
+
+    def __iter__(self):
+        return map(epoch_to_datetime, self.epochs)
+
+    def __reversed__(self):
+        return map(epoch_to_datetime, reversed(self.epochs))
+
+    def __contains__(self, value):
+        try:
+            return whole_epoch(value) in self.epochs
+        except (TypeError, ValueError):
+            return False
+
+    def __eq__(self, other):
+        if isinstance(other, TimestampArray):
+            return self.epochs == other.epochs
+        return NotImplemented
+
+    def __repr__(self):
+        shown = ", ".join(repr(dt.isoformat(sep=" ")) for dt in islice(self, 6))
+        return f"TimestampArray([{shown}{', ...' if len(self) > 6 else ''}])"
+
+    def index(self, value, start=0, stop=None):
+        return self.epochs.index(whole_epoch(value), start, len(self) if stop is None else stop)
+
+    def count(self, value):
+        try:
+            return self.epochs.count(whole_epoch(value))
+        except ValueError:
+            return 0
+
+    def insert(self, index, value):
+        self.epochs.insert(index, whole_epoch(value))
+
+    def append(self, value):
+        self.epochs.append(whole_epoch(value))
+
+    def extend(self, values):
+        self.epochs.extend(_as_epochs(values))
+
+    def sort(self, reverse=False):
+        """
+        Sort in place, chronologically (or newest first with reverse=True).
+
+        Runs of _SORT_RUN values are sorted one at a time and then merged, so
+        at most one run is held as Python ints; the merge needs one packed
+        copy of the buffer (8 bytes per value) instead of a list of all values.
+        """
+        epochs = self.epochs
+        runs = range(0, len(epochs), _SORT_RUN)
+        for start in runs:
+            epochs[start:start + _SORT_RUN] = array("q", sorted(epochs[start:start + _SORT_RUN], reverse=reverse))
+        if len(runs) > 1:
+            with memoryview(epochs) as view:
+                merged = array("q", heapq.merge(*(view[start:start + _SORT_RUN] for start in runs), reverse=reverse))
+            epochs[:] = merged
+
+
+def _as_epochs(values):
+    if isinstance(values, TimestampArray):
+        return values.epochs
+    return array("q", [whole_epoch(value) for value in values])
@@ -0,0 +1,254 @@
+"""
+Tolerant Batch Processor - Error-collecting batch variants of the six processor functions
+
+The functions in skeleton.py validate their input and raise on the first bad
+value. For bulk feeds that means one exception (and one try/except) per bad
+row. Every function here has the same name and arguments as its skeleton.py
+counterpart but takes sequences, never raises for bad data, and returns a
+(results, errors) pair:
+
+- results holds one value per row, with None for rows that failed
+- errors is a list of (row, code) tuples; MESSAGES maps each code to a
+  message template and describe_errors renders them
+
+Scalar arguments that apply to the whole batch (offsets, durations, format
+strings) are validated once; if they are invalid every row gets the error.
+"""
+
+import datetime
+
+from calendar_arithmetic import calendar_breakdown
+from datetime_kernels import (
+    MAX_EPOCH,
+    MAX_OFFSET,
+    MIN_EPOCH,
+    MIN_OFFSET,
+    SECONDS_PER_DAY,
+    SECONDS_PER_HOUR,
+    SECONDS_PER_MINUTE,
+    WEEKDAY_NAMES,
+    datetime_to_epoch,
+    difference_from_seconds,
+    epoch_to_datetime,
+    try_parse_epoch,
+    weekday_from_days,
+)
+from timestamps import TimestampArray
+
+E_TYPE = 1
+E_DATE = 2
+E_OFFSET_TYPE = 3
+E_OFFSET_RANGE = 4
+E_DURATION_TYPE = 5
+E_FORMAT_TYPE = 6
+E_LENGTH = 7
+E_RANGE = 8
+E_FORMAT = 9
+
+MESSAGES = {
+    E_TYPE: "row {row}: expected a datetime or date string",
+    E_DATE: "row {row}: date string is not a valid 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS' date",
+    E_OFFSET_TYPE: "row {row}: timezone offset must be an integer",
+    E_OFFSET_RANGE: f"row {{row}}: timezone offset must be between {MIN_OFFSET} and +{MAX_OFFSET}",
+    E_DURATION_TYPE: "row {row}: days, hours and minutes must be integers",
+    E_FORMAT_TYPE: "row {row}: format_string must be a string",
+    E_LENGTH: "row {row}: start_date and end_date sequences differ in length",
+    E_RANGE: "row {row}: result is outside the supported datetime range",
+    E_FORMAT: "row {row}: format_string cannot be rendered",
+}
+
+
+def describe_errors(errors):
+    """
+    Render (row, code) error tuples as readable messages.
+
+    Example:
+    >>> describe_errors([(3, E_DATE)])
+    ["row 3: date string is not a valid 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS' date"]
+    """
+    return [MESSAGES[code].format(row=row) for row, code in errors]
+
+# Datetime used to check a format string once per batch
+_PROBE = datetime.datetime(2000, 1, 1)
+
+
+def _epochs(values, errors, micros=None):
+    """
+    Convert values to epoch seconds, recording errors and returning None for bad rows.
+
+    When micros is a list, the microseconds of each row are appended to it.
+    """
+    if isinstance(values, TimestampArray):
+        if micros is not None:
+            micros.extend([0] * len(values))
+        return values.epochs.tolist()
+    out = []
+    append = out.append
+    for row, value in enumerate(values):
+        if isinstance(value, str):
+            seconds = try_parse_epoch(value)
+            if seconds is None:
+                errors.append((row, E_DATE))
+            append(seconds)
+        elif isinstance(value, datetime.datetime):
+            append(datetime_to_epoch(value))
+            if micros is not None:
+                micros.append(value.microsecond)
+                continue
+        else:
+            errors.append((row, E_TYPE))
+            append(None)
+        if micros is not None:
+            micros.append(0)
+    return out
+
+
+def _all_rows(values, code):
+    count = len(values) if hasattr(values, "__len__") else sum(1 for _ in values)
+    return [None] * count, [(row, code) for row in range(count)]
+
+
+def _offset_code(offset):
+    if not isinstance(offset, int) or isinstance(offset, bool):
+        return E_OFFSET_TYPE
+    if not MIN_OFFSET <= offset <= MAX_OFFSET:
+        return E_OFFSET_RANGE
+    return 0
+
+
+def _shifted(epochs, shift, errors, micros):
+    out = []
+    for row, seconds in enumerate(epochs):
+        if seconds is None:
+            out.append(None)
+            continue
+        seconds += shift
+        if MIN_EPOCH <= seconds <= MAX_EPOCH:
+            out.append(epoch_to_datetime(seconds, micros[row]))
+        else:
+            errors.append((row, E_RANGE))
+            out.append(None)
+    return out
+
+
+def convert_string_to_datetime(date_strings):
+    """
+    Convert date strings to datetime objects, collecting errors per row.
+
+    Example:
+    >>> convert_string_to_datetime(["2025-03-19", "2025-02-30", None])
+    ([datetime.datetime(2025, 3, 19, 0, 0), None, None], [(1, 2), (2, 1)])
+    """
+    errors = []
+    out = []
+    for row, value in enumerate(date_strings):
+        seconds = try_parse_epoch(value)
+        if seconds is None:
+            errors.append((row, E_DATE if isinstance(value, str) else E_TYPE))
+            out.append(None)
+        else:
+            out.append(epoch_to_datetime(seconds))
+    return out, errors
+
+
+def format_datetime(dts, format_string="%Y-%m-%d %H:%M:%S"):
+    """Format datetime objects with format_string, collecting errors per row."""
+    if not isinstance(format_string, str):
+        return _all_rows(dts, E_FORMAT_TYPE)
+    try:
+        _PROBE.strftime(format_string)
+    except ValueError:
+        # Includes UnicodeEncodeError for unencodable format strings
+        return _all_rows(dts, E_FORMAT)
+    errors = []
+    out = []
+    for row, dt in enumerate(dts):
+        if isinstance(dt, datetime.datetime):
+            try:
+                out.append(dt.strftime(format_string))
+            except ValueError:
+                errors.append((row, E_FORMAT))
+                out.append(None)
+        else:
+            errors.append((row, E_TYPE))
+            out.append(None)
+    return out, errors
+
+
+def calculate_date_difference(start_dates, end_dates, calendar=False):
+    """
+    Calculate pairwise date differences, collecting errors per row.
+
+    Rows present in only one of the sequences are reported with E_LENGTH.
+    An error on either side of a pair is reported once for that row. With
+    calendar=True each result also has whole calendar years and months.
+    """
+    errors = []
+    start_micros = []
+    end_micros = []
+    starts = _epochs(start_dates, errors, start_micros)
+    ends = _epochs(end_dates, errors, end_micros)
+    count = max(len(starts), len(ends))
+    out = []
+    for row in range(count):
+        start = starts[row] if row < len(starts) else None
+        end = ends[row] if row < len(ends) else None
+        if start is None or end is None:
+            if row >= len(starts) or row >= len(ends):
+                errors.append((row, E_LENGTH))
+            out.append(None)
+        else:
+            result = difference_from_seconds(end - start, end_micros[row] - start_micros[row])
+            if calendar:
+                result.update(calendar_breakdown(start, end, start_micros[row], end_micros[row]))
+            out.append(result)
+    # The same row can fail on both sides; keep the start-side error.
+    first = {}
+    for row, code in errors:
+        first.setdefault(row, code)
+    return out, sorted(first.items())
+
+
+def add_time_duration(values, days=0, hours=0, minutes=0):
+    """Add a fixed duration to each datetime, collecting errors per row."""
+    for value in (days, hours, minutes):
+        if not isinstance(value, int) or isinstance(value, bool):
+            return _all_rows(values, E_DURATION_TYPE)
+    errors = []
+    micros = []
+    epochs = _epochs(values, errors, micros)
+    shift = days * SECONDS_PER_DAY + hours * SECONDS_PER_HOUR + minutes * SECONDS_PER_MINUTE
+    return _shifted(epochs, shift, errors, micros), errors
+
+
+def get_day_of_week(values):
+    """
+    Get weekday names for dates, collecting errors per row.
+
+    Example:
+    >>> get_day_of_week(["2025-03-19", 20250319])
+    (['Wednesday', None], [(1, 1)])
+    """
+    errors = []
+    out = [None if seconds is None else WEEKDAY_NAMES[weekday_from_days(seconds // SECONDS_PER_DAY)]
+           for seconds in _epochs(values, errors)]
+    return out, errors
+
+
+def convert_timezone(values, source_offset, target_offset):
+    """
+    Convert datetimes between timezone offsets, collecting errors per row.
+
+    Example:
+    >>> convert_timezone(["2025-03-19 14:30:00"], -5, -8)
+    ([datetime.datetime(2025, 3, 19, 11, 30)], [])
+    >>> convert_timezone(["2025-03-19 14:30:00"], -5, 15)
+    ([None], [(0, 4)])
+    """
+    code = _offset_code(source_offset) or _offset_code(target_offset)
+    if code:
+        return _all_rows(values, code)
+    errors = []
+    micros = []
+    epochs = _epochs(values, errors, micros)
+    return _shifted(epochs, (target_offset - source_offset) * SECONDS_PER_HOUR, errors, micros), errors
@@ -0,0 +1,201 @@
+"""
+Timezone Normalization - Bringing mixed-offset feeds to one offset in bulk
+
+Feeds from several clinics mix timezone offsets, while convert_timezone needs
+the caller to know the source offset of every row. normalize_epochs() infers
+the source offset of each row, from a suffix embedded in the date string
+("2025-03-19 14:30:00-05:00", "2025-03-19 14:30:00 UTC+9", "...Z") or else
+from the row's site through a site -> offset mapping, or else from a default.
+
+shift_grouped() then groups the rows by their (source, target) offset pair.
+Each group's offsets are validated once, the group is shifted in one pass
+with shift_epochs_into, and the shifted values are scattered back so the
+output keeps the input order. A million rows from a dozen sites cost a dozen
+bulk shifts instead of a million convert_timezone calls.
+"""
+
+import re
+from array import array
+from collections import defaultdict
+from operator import itemgetter
+
+from batch_processor import shift_epochs_into
+from datetime_kernels import MAX_EPOCH, MIN_EPOCH, epoch_to_datetime, split_epoch
+
+_SUFFIX = re.compile(r" ?(?:(Z|UTC|GMT)|(?:UTC|GMT)?([+-])(\d{1,2})(?::?(\d{2}))?)")
+
+
+def split_offset(value):
+    """
+    Split an embedded timezone suffix off a date string.
+
+    Recognised suffixes follow the date or the time, optionally after one
+    space: "Z", "UTC", "GMT", "+05", "-05:00", "+0900", "UTC+9", "GMT-3".
+
+    Parameters:
+    value (str): Date string, with or without a suffix
+
+    Returns:
+    tuple: (date_string, offset) with offset in hours, or None without a suffix
+
+    Raises:
+    ValueError: If the suffix has a non-zero minutes part
+
+    Example:
+    >>> split_offset("2025-03-19 14:30:00-05:00")
+    ('2025-03-19 14:30:00', -5)
+    >>> split_offset("2025-03-19 UTC+9")
+    ('2025-03-19', 9)
+    >>> split_offset("2025-03-19 14:30:00")
+    ('2025-03-19 14:30:00', None)
+    """
+    for length in (19, 10):
+        if len(value) > length:
+            match = _SUFFIX.fullmatch(value, length)
+            if match is not None:
+                utc, sign, hours, minutes = match.groups()
+                if utc:
+                    return value[:length], 0
+                if minutes and minutes != "00":
+                    raise ValueError(f"Only whole-hour offsets are supported: {value!r}")
+                return value[:length], -int(hours) if sign == "-" else int(hours)
+    return value, None
+
+
+def infer_offsets(values, sites=None, site_offsets=None, default_offset=None, microseconds=None):
+    """
+    Parse values to epoch seconds and infer each row's source offset.
+
+    An embedded suffix wins over the site mapping, which wins over
+    default_offset.
+
+    Parameters:
+    values (sequence): Date strings, optionally with offset suffixes, or datetimes
+    sites (sequence): Site identifier per row, or None
+    site_offsets (dict): Site identifier -> offset in hours
+    default_offset (int): Offset for rows with neither suffix nor known site
+    microseconds (list): If given, each row's microseconds are appended to it;
+        otherwise datetimes with microseconds are rejected
+
+    Returns:
+    tuple: (array('q') of local epoch seconds, list of source offsets)
+
+    Raises:
+    ValueError: If a row's offset cannot be inferred, a date string is
+        malformed, a datetime has microseconds that are not collected, or
+        sites differs in length from values
+    TypeError: If a value is neither a string nor a datetime
+    """
+    if sites is not None and len(sites) != len(values):
+        raise ValueError("sites and values must have the same length")
+    site_offsets = site_offsets or {}
+    epochs = array("q", bytes(8 * len(values)))
+    sources = [None] * len(values)
+    for row, value in enumerate(values):
+        offset = None
+        if isinstance(value, str):
+            value, offset = split_offset(value)
+        if offset is None and sites is not None:
+            offset = site_offsets.get(sites[row])
+        if offset is None:
+            offset = default_offset
+        if offset is None:
+            site = "" if sites is None else f" (site {sites[row]!r})"
+            raise ValueError(f"row {row}: cannot infer the timezone offset{site}")
+        seconds, micro = split_epoch(value)
+        if microseconds is not None:
+            microseconds.append(micro)
+        elif micro:
+            raise ValueError(f"row {row}: epoch seconds cannot hold microseconds: {value!r}")
+        epochs[row] = seconds
+        sources[row] = offset
+    return epochs, sources
+
+
+def normalize_epochs(values, target_offset, sites=None, site_offsets=None, default_offset=None):
+    """
+    Convert mixed-offset values to epoch seconds in one target offset.
+
+    Parameters:
+    values (sequence): Date strings, optionally with offset suffixes, or datetimes
+    target_offset (int or sequence): Target offset in hours, or one per row
+    sites, site_offsets, default_offset: How source offsets are inferred, see
+        infer_offsets()
+
+    Returns:
+    array: array('q') of epoch seconds in the target offset, in input order;
+    wrap it with TimestampArray.from_epochs() to keep it compact
+
+    Raises:
+    ValueError: If an offset cannot be inferred or is outside -12..+14, or
+        a datetime has microseconds (use normalize_timezones() for those)
+    TypeError: If an offset is not an int
+    OverflowError: If a converted value is outside the supported datetime range
+    """
+    return _normalize(values, target_offset, sites, site_offsets, default_offset, None)
+
+
+def _normalize(values, target_offset, sites, site_offsets, default_offset, microseconds):
+    epochs, sources = infer_offsets(values, sites, site_offsets, default_offset, microseconds)
+    if isinstance(target_offset, int):
+        targets = [target_offset] * len(sources)
+    elif len(target_offset) != len(sources):
+        raise ValueError("target_offset must be an int or have one entry per row")
+    else:
+        targets = target_offset
+    return shift_grouped(epochs, sources, targets)
+
+
+def shift_grouped(epochs, sources, targets):
+    """
+    Shift epoch seconds by per-row offset pairs, one bulk shift per distinct pair.
+
+    Parameters:
+    epochs (array): array('q') of epoch seconds
+    sources (sequence of int): Source offset per row
+    targets (sequence of int): Target offset per row
+
+    Returns:
+    array: New array('q') of shifted epoch seconds, in input order
+
+    Raises:
+    OverflowError: If a shifted value falls outside the supported datetime
+        range; the message names the first such row
+
+    Example:
+    >>> list(shift_grouped(array("q", [0, 0, 3600]), [-5, 0, -5], [0, 0, 0]))
+    [18000, 0, 21600]
+    """
+    groups = defaultdict(list)
+    for row, pair in enumerate(zip(sources, targets)):
+        groups[pair].append(row)
+    out = array("q", bytes(8 * len(epochs)))
+    for (source, target), rows in groups.items():
+        block = array("q", [epochs[rows[0]]] if len(rows) == 1 else itemgetter(*rows)(epochs))
+        shift_epochs_into(block, source, target, block)
+        if min(block) < MIN_EPOCH or max(block) > MAX_EPOCH:
+            row = next(row for row, seconds in zip(rows, block) if not MIN_EPOCH <= seconds <= MAX_EPOCH)
+            raise OverflowError(f"row {row}: result is outside the supported datetime range")
+        for row, seconds in zip(rows, block):
+            out[row] = seconds
+    return out
+
+
+def normalize_timezones(values, target_offset, sites=None, site_offsets=None, default_offset=None):
+    """
+    Convert mixed-offset values to datetimes in one target offset.
+
+    Same parameters as normalize_epochs().
+
+    Returns:
+    list: Naive datetimes in the target offset, in input order; microseconds
+    of datetime inputs are kept
+
+    Example:
+    >>> normalize_timezones(["2025-03-19 14:30:00-05:00", "2025-03-19 14:30:00"], 0,
+    ...                     sites=["nyc", "tokyo"], site_offsets={"tokyo": 9})
+    [datetime.datetime(2025, 3, 19, 19, 30), datetime.datetime(2025, 3, 19, 5, 30)]
+    """
+    microseconds = []
+    epochs = _normalize(values, target_offset, sites, site_offsets, default_offset, microseconds)
+    return list(map(epoch_to_datetime, epochs, microseconds))